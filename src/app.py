@@ -1,22 +1,22 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import asyncio
+import logging
 import os
 from datetime import datetime
 from dotenv import load_dotenv
 
-from open_deep_research.multi_agent import graph
 from pdf_generator import generate_complete_pdf
-from inputs import input_prompt
+from inputs import estados, input_prompt
 from plot import create_specialty_growth_chart, create_specialties_comparison_chart
 from plot_specialists import create_specialist_visualization
 
+logger = logging.getLogger(__name__)
+
 st.set_page_config(
     page_title="Open Deep Research", page_icon=":guardsman:", layout="wide"
 )
 load_dotenv()
-agent = graph
 input_prompt = input_prompt
 
 # Initialize session state variables
@@ -24,6 +24,9 @@ if "result" not in st.session_state:
     st.session_state.result = None
 if "report_generated" not in st.session_state:
     st.session_state.report_generated = False
+if "job_id" not in st.session_state:
+    # The job id is also kept in the URL so a page reload finds the running report again
+    st.session_state.job_id = st.query_params.get("job")
 if "report_info" not in st.session_state:
     st.session_state.report_info = {
         "especialidade": "",
@@ -33,51 +36,39 @@ if "report_info" not in st.session_state:
     }
 
 
-async def run_graph(initial_input):
-    """Runs the graph asynchronously and prints the result."""
-    # You might need to pass a config here if your graph expects it
-    # e.g., config = {"configurable": {"search_api": "tavily", "supervisor_model": "your_model", "researcher_model": "your_model"}}
-    result = await graph.ainvoke(initial_input)
+def get_jobs():
+    """Return the process-wide job manager; reports run on its workers, not in this script thread."""
+    # Imported here so the page renders before langchain and the search SDKs are loaded
+    from open_deep_research.jobs import get_job_manager
+
+    return get_job_manager()
+
 
-    return result
+def report_config(especialidade, local):
+    """Graph config for a report; specialty and state key the reusable section store."""
+    return {"configurable": {"specialty": especialidade, "residency_state": local}}
 
 
 residents_number_path = "data/residents_1_n.csv"
 residents_growth_path = "data/residency_growth_cleaned.csv"
 specialty_data_path = "data/specialty_data.csv"
 
+
+
+@st.cache_data
+def load_dataframes():
+    """Load the bundled CSV files once per server process instead of on every rerun."""
+    return (
+        pd.read_csv(residents_number_path),
+        pd.read_csv(residents_growth_path),
+        pd.read_csv(specialty_data_path),
+    )
+
+
 # Load the CSV files into DataFrames
-residents_number_df = pd.read_csv(residents_number_path)
-residents_growth_df = pd.read_csv(residents_growth_path)
-specialty_data_df = pd.read_csv(specialty_data_path)
+residents_number_df, residents_growth_df, specialty_data_df = load_dataframes()
 
 specialties = sorted(residents_number_df["Especialidade"].unique().tolist())
-estados = [
-    "Paraná",
-    "São Paulo",
-    "Rio de Janeiro",
-    "Minas Gerais",
-    "Bahia",
-    "Rio Grande do Sul",
-    "Santa Catarina",
-    "Ceará",
-    "Pernambuco",
-    "Pará",
-    "Maranhão",
-    "Goiás",
-    "Espírito Santo",
-    "Alagoas",
-    "Sergipe",
-    "Paraíba",
-    "Rio Grande do Norte",
-    "Tocantins",
-    "Amapá",
-    "Rondônia",
-    "Acre",
-    "Mato Grosso do Sul",
-    "Mato Grosso",
-    "Distrito Federal",
-]
 
 st.title("🎓 MedCampus")
 st.subheader("Esteja preparado, esteja na frente.")
@@ -152,49 +143,66 @@ with st.form(key="input_form"):
             "growth": growth_value,
         }
 
-        # Create a loading spinner with messages
-        with st.spinner("Iniciando a geração do relatório..."):
-
-            # Create a placeholder for progress messages
-            progress_placeholder = st.empty()
-
-            # Define loading messages to show while report is being generated
-            loading_messages = [
-                "Analisando dados sobre a especialidade...",
-                "Avaliando cenário de residência médica...",
-                "Processando informações sobre vagas e concorrência...",
-                "Construindo recomendações personalizadas...",
-                "Formatando relatório final...",
-                "Quase pronto...",
-            ]
-
-            # Show each message for a moment to simulate progress
-            import time
-
-            # Show loading messages with a more reasonable delay
-            for i, message in enumerate(loading_messages):
-                # If it's the last message, keep it showing longer while the model works
-                if i == len(loading_messages) - 1:
-                    progress_placeholder.info(message)
-                else:
-                    progress_placeholder.info(message)
-                    time.sleep(2)  # Show each message for 2 seconds
-
-            # Run the agent asynchronously
-            st.session_state.result = asyncio.run(run_graph(initial_input))
-            st.session_state.report_generated = True
+        # The report runs on a background worker; this session polls it by job id
+        try:
+            st.session_state.job_id = get_jobs().submit(
+                initial_input,
+                config=report_config(especialidade, local),
+                metadata=st.session_state.report_info,
+            )
+        except ValueError as e:
+            logger.warning("Error submitting report: %s", e)
+            st.error("Configuração inválida. Não foi possível iniciar o relatório.")
+        else:
+            st.query_params["job"] = st.session_state.job_id
+            st.session_state.result = None
+            st.session_state.report_generated = False
+
+
+@st.fragment(run_every=2)
+def show_job_progress():
+    """Poll the report job, showing each body section as soon as it is written."""
+    job = get_jobs().status(st.session_state.job_id)
+    if job is None:
+        st.session_state.job_id = None
+        st.query_params.pop("job", None)
+        return
+
+    if job["status"] == "done":
+        st.session_state.result = job["result"]
+        st.session_state.report_info = job["metadata"] or st.session_state.report_info
+        st.session_state.report_generated = True
+        st.rerun()
+    elif job["status"] == "failed":
+        # Completed sections are checkpointed; the run can be resumed from them
+        st.error(
+            "Ocorreu um erro durante a geração do relatório. "
+            "Você pode retomá-lo sem refazer as seções já concluídas."
+        )
+        if st.button("Retomar relatório"):
+            get_jobs().retry(st.session_state.job_id)
+            st.rerun()
+    else:
+        if job["status"] == "queued":
+            st.info("Relatório na fila. A geração começará em instantes...")
+        elif job["sections"]:
+            st.info(f"{len(job['sections'])} seção(ões) pronta(s). Continuando a pesquisa...")
+        else:
+            st.info("Pesquisando as seções do relatório...")
+        for section in job["sections"]:
+            st.markdown(section["content"])
 
-            # Clear the progress messages when done
-            progress_placeholder.empty()
 
-            # Show success message
-            st.success("Relatório gerado com sucesso!")
+if st.session_state.job_id and not st.session_state.report_generated:
+    show_job_progress()
 
 
 # Function to reset session state
 def reset_report():
     st.session_state.result = None
     st.session_state.report_generated = False
+    st.session_state.job_id = None
+    st.query_params.pop("job", None)
     st.session_state.report_info = {
         "especialidade": "",
         "local": "",
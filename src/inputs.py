@@ -10,3 +10,30 @@ Por favor, inclua informações relevantes sobre construção de carreira em {es
 - O guia deve ser escrito em português e deve ser claro e conciso, com informações práticas e úteis para os estudantes de medicina.
 - O guia deve ser construido a fim de amenizar as preocupações e dúvidas do estudante em relação à sua carreira médica: {preocupacoes}.
 """
+
+estados = [
+    "Paraná",
+    "São Paulo",
+    "Rio de Janeiro",
+    "Minas Gerais",
+    "Bahia",
+    "Rio Grande do Sul",
+    "Santa Catarina",
+    "Ceará",
+    "Pernambuco",
+    "Pará",
+    "Maranhão",
+    "Goiás",
+    "Espírito Santo",
+    "Alagoas",
+    "Sergipe",
+    "Paraíba",
+    "Rio Grande do Norte",
+    "Tocantins",
+    "Amapá",
+    "Rondônia",
+    "Acre",
+    "Mato Grosso do Sul",
+    "Mato Grosso",
+    "Distrito Federal",
+]
@@ -1,40 +1,239 @@
-from open_deep_research.multi_agent import graph
+"""Batch generation of the report catalog.
+
+Generates one report per specialty × state combination with a pool of async workers
+sharing the process-wide model clients, LLM cache, section store, page cache and
+section scheduler. Progress is durable: finished reports are skipped on the next run,
+and a report interrupted mid-way is resumed from its checkpoint.
+
+Usage:
+    python main.py --workers 4 --output-dir reports
+    python main.py --specialties Cardiologia Pediatria --states "Paraná" --no-pdf
+"""
+
+import argparse
 import asyncio
-from dotenv import load_dotenv
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import unicodedata
+from datetime import datetime
+
 import pandas as pd
+from dotenv import load_dotenv
+
+from inputs import estados, input_prompt
 
 load_dotenv()
 
-agent = graph
+# Resolved from this file, like residency_data.DATA_DIR, so the command works from any directory
+DATA_DIR = os.environ.get(
+    "ODR_DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+)
+residents_number_path = os.path.join(DATA_DIR, "residents_1_n.csv")
+
+logger = logging.getLogger(__name__)
+
+
+def slugify(text):
+    """Return an ASCII, filesystem-safe version of ``text``."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def load_specialties(path=residents_number_path):
+    """Return the specialties listed in the residents CSV."""
+    return sorted(pd.read_csv(path)["Especialidade"].dropna().unique().tolist())
+
+
+class StartLimiter:
+    """Spaces report starts at least ``interval`` seconds apart across all workers."""
+
+    def __init__(self, interval):
+        """Allow one report start every ``interval`` seconds."""
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self):
+        """Wait until the next report may start, then reserve the following slot."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = loop.time() + self.interval
+
+
+async def generate_report(specialty, state, args):
+    """Generate (or resume) the report for one combination and write its artifacts.
+
+    Returns:
+        dict: Manifest entry for the report.
+    """
+    from open_deep_research.runs import resume_report, run_status, stream_report
+
+    slug = f"{slugify(specialty)}__{slugify(state)}"
+    thread_id = f"batch-{slug}"
+    config = {
+        "configurable": {
+            "thread_id": thread_id,
+            "specialty": specialty,
+            "residency_state": state,
+            "llm_cache": True,
+            "section_cache": True,
+        }
+    }
+
+    status = await run_status(thread_id)
+    if status["exists"] and not status["complete"]:
+        events = resume_report(thread_id, config)
+    else:
+        initial_input = {
+            "messages": [
+                {
+                    "role": "user",
+                    "content": input_prompt.format(
+                        especialidades=specialty,
+                        estado=state,
+                        faculdade=args.faculdade,
+                        ciclo=args.ciclo,
+                        preocupacoes=args.preocupacoes,
+                    ),
+                }
+            ]
+        }
+        if status["complete"]:
+            # Artifacts were lost but the run finished; start it again under a fresh thread
+            config["configurable"]["thread_id"] = f"{thread_id}-{int(time.time())}"
+        events = stream_report(initial_input, config)
+
+    result, metrics = {}, {}
+    async for event in events:
+        if event["type"] == "done":
+            result, metrics = event["result"], event["metrics"]
+
+    final_report = result.get("final_report")
+    if not final_report:
+        raise RuntimeError("the run finished without a final report")
+
+    markdown_path = os.path.join(args.output_dir, f"{slug}.md")
+    # Write then rename: the markdown file marks the combination as done
+    with open(markdown_path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(final_report)
+    os.replace(markdown_path + ".tmp", markdown_path)
+
+    pdf_path = None
+    if not args.no_pdf:
+        from pdf_generator import generate_complete_pdf
+
+        generated = await asyncio.to_thread(
+            generate_complete_pdf,
+            markdown_content=final_report,
+            title=f"Relatório sobre {specialty} em {state}",
+            subtitle=f"Análise da Residência Médica em {specialty}",
+            metadata={
+                "Especialidade": specialty,
+                "Região": state,
+                "Data de Geração": datetime.now().strftime("%d/%m/%Y %H:%M"),
+                "Fonte de Dados": "MedCampus - Sistema de Análise de Residência Médica",
+            },
+        )
+        pdf_path = os.path.join(args.output_dir, f"{slug}.pdf")
+        shutil.move(generated, pdf_path)
+
+    return {
+        "specialty": specialty,
+        "state": state,
+        "status": "done",
+        "markdown": markdown_path,
+        "pdf": pdf_path,
+        "wall_seconds": round(metrics.get("wall_seconds", 0.0), 1),
+    }
+
+
+async def worker(queue, limiter, args, manifest):
+    """Generate the queued combinations one at a time and record each in the manifest."""
+    while True:
+        specialty, state = await queue.get()
+        try:
+            await limiter.wait()
+            logger.info("Generating %s / %s...", specialty, state)
+            entry = await generate_report(specialty, state, args)
+            logger.info("Done %s / %s in %ss", specialty, state, entry["wall_seconds"])
+        except Exception as e:
+            logger.exception("Error generating %s / %s", specialty, state)
+            entry = {"specialty": specialty, "state": state, "status": "failed", "error": str(e)}
+        finally:
+            queue.task_done()
+        manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        manifest.flush()
+
 
-input_prompt = """
-Gere um guia de planejamento de carreira médica e preparação para residência. O guia deve cobrir as seguintes especialidades: Cardiologia, Cirurgia do Aparelho Digestivo.
+async def run_batch(args):
+    """Queue every pending combination and process it with ``args.workers`` workers."""
+    os.makedirs(args.output_dir, exist_ok=True)
+    specialties = args.specialties or load_specialties()
+    states = args.states or estados
 
-Por favor, inclua informações relevantes sobre bem como análise comparativa caso haja duas ou mais especialidades:
-- Quantidade de vagas e concorrência para residência médica nas especialidades indicadas.
-- Instituições de referência e programas de destaque para a residência médica.
-- Perspectivas de mercado de trabalho para médicos especialistas nas áreas escolhidas, incluindo remuneração média.
-- Requisitos para a aprovação na residência, como provas, entrevistas e currículo, considerando o ano de realização da prova 2027.
-- Com foco na região de Curitiba, Paraná e considerando o contexto para estudantes da FEMPAR.
+    pending = [
+        (specialty, state)
+        for specialty in specialties
+        for state in states
+        if not os.path.exists(
+            os.path.join(args.output_dir, f"{slugify(specialty)}__{slugify(state)}.md")
+        )
+    ]
+    if args.limit:
+        pending = pending[: args.limit]
+    total = len(specialties) * len(states)
+    logger.info("%d of %d reports already generated; %d queued", total - len(pending), total, len(pending))
 
- """
+    queue = asyncio.Queue()
+    for combination in pending:
+        queue.put_nowait(combination)
 
-initial_input = {"messages": [{"role": "user", "content": input_prompt}]}
+    limiter = StartLimiter(args.start_interval)
+    with open(os.path.join(args.output_dir, "manifest.jsonl"), "a", encoding="utf-8") as manifest:
+        workers = [
+            asyncio.create_task(worker(queue, limiter, args, manifest))
+            for _ in range(max(1, args.workers))
+        ]
+        await queue.join()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
 
+    if pending:
+        from open_deep_research.multi_agent import wait_for_section_stores
 
-async def run_graph():
-    """Runs the graph asynchronously and prints the result."""
-    # You might need to pass a config here if your graph expects it
-    # e.g., config = {"configurable": {"search_api": "tavily", "supervisor_model": "your_model", "researcher_model": "your_model"}}
-    # result = await graph.ainvoke(initial_input, config=config)
-    # result = await graph.ainvoke(initial_input)
+        # Sections are added to the section store in the background; don't drop the last ones
+        await wait_for_section_stores()
 
-    # print(result)
 
-    data_path = "data/combined_table_cleaned.csv"
-    df = pd.read_csv(data_path)
-    print(df.head())
+def parse_args(argv=None):
+    """Parse the command line; ``argv`` defaults to ``sys.argv[1:]``."""
+    parser = argparse.ArgumentParser(description="Generate the MedCampus report catalog.")
+    parser.add_argument("--specialties", nargs="*", help="Specialties to generate (default: all in the residents CSV)")
+    parser.add_argument("--states", nargs="*", help="States to generate (default: all)")
+    parser.add_argument("--workers", type=int, default=4, help="Reports generated concurrently")
+    parser.add_argument("--start-interval", type=float, default=5.0, help="Minimum seconds between report starts")
+    parser.add_argument("--output-dir", default="reports", help="Directory for markdown and PDF artifacts")
+    parser.add_argument("--limit", type=int, help="Generate at most this many reports")
+    parser.add_argument("--no-pdf", action="store_true", help="Only write markdown")
+    parser.add_argument("--faculdade", default="não informada", help="Faculdade used in the prompt")
+    parser.add_argument("--ciclo", default="não informado", help="Ciclo used in the prompt")
+    parser.add_argument(
+        "--preocupacoes",
+        default="dúvidas gerais sobre a escolha da especialidade e a preparação para a residência",
+        help="Preocupações used in the prompt",
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    asyncio.run(run_graph())
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(run_batch(parse_args()))
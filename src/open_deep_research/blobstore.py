@@ -0,0 +1,197 @@
+"""Content-addressed, compressed blob store for raw source content.
+
+Blobs are keyed by the SHA-256 of their uncompressed bytes, so identical page bodies
+fetched through different URLs are stored once. Each blob is written as a
+zstd-compressed file under ``<root>/<first two hex chars>/<digest>``, and the
+least recently used blobs are evicted once the store grows past ``max_bytes``.
+"""
+
+import hashlib
+import os
+import threading
+import zlib
+from typing import Dict, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard ships with the project dependencies
+    zstandard = None
+
+CACHE_DIR = os.environ.get("ODR_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "open_deep_research"))
+BLOB_STORE_MAX_BYTES = int(os.environ.get("BLOB_STORE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Compression is recorded in the file suffix so stores written without zstandard stay readable
+ZSTD_SUFFIX = ".zst"
+ZLIB_SUFFIX = ".zz"
+
+
+def content_digest(data: Union[bytes, str]) -> str:
+    """Return the SHA-256 hex digest used as a blob key."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """On-disk store of compressed blobs with size-bounded LRU eviction.
+
+    Args:
+        root: Directory holding the blobs.
+        max_bytes: Upper bound on the compressed size of the store.
+        level: Compression level.
+    """
+
+    def __init__(self, root: str, max_bytes: int = BLOB_STORE_MAX_BYTES, level: int = 3):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.level = level
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = self._scan_size()
+        self.counters = {
+            "puts": 0,
+            "dedup_hits": 0,  # put() of content already stored
+            "gets": 0,
+            "misses": 0,
+            "evictions": 0,
+            "raw_bytes_in": 0,  # Uncompressed bytes written
+            "stored_bytes_in": 0,  # Compressed bytes written
+        }
+
+    def _scan_size(self) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    pass
+        return total
+
+    def _path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.root, digest[:2], digest + suffix)
+
+    def _find(self, digest: str) -> Optional[str]:
+        for suffix in (ZSTD_SUFFIX, ZLIB_SUFFIX):
+            path = self._path(digest, suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _compress(self, data: bytes) -> tuple:
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=self.level).compress(data), ZSTD_SUFFIX
+        return zlib.compress(data, self.level), ZLIB_SUFFIX
+
+    @staticmethod
+    def _decompress(blob: bytes, path: str) -> bytes:
+        if path.endswith(ZSTD_SUFFIX):
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return zlib.decompress(blob)
+
+    def put(self, data: Union[bytes, str]) -> str:
+        """Store ``data`` (once) and return its digest."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = content_digest(data)
+        self.counters["puts"] += 1
+
+        existing = self._find(digest)
+        if existing is not None:
+            self.counters["dedup_hits"] += 1
+            os.utime(existing)  # Mark as recently used
+            return digest
+
+        compressed, suffix = self._compress(data)
+        path = self._path(digest, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent readers never see a partial blob
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._size += len(compressed)
+            self.counters["raw_bytes_in"] += len(data)
+            self.counters["stored_bytes_in"] += len(compressed)
+        if self._size > self.max_bytes:
+            self.evict()
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """Return the uncompressed bytes for ``digest``, or None if absent or evicted."""
+        self.counters["gets"] += 1
+        path = self._find(digest)
+        if path is None:
+            self.counters["misses"] += 1
+            return None
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            os.utime(path)
+        except OSError:
+            # Evicted between lookup and read
+            self.counters["misses"] += 1
+            return None
+        return self._decompress(blob, path)
+
+    def get_text(self, digest: str) -> Optional[str]:
+        """Return the blob decoded as UTF-8, or None if absent."""
+        data = self.get(digest)
+        return None if data is None else data.decode("utf-8", errors="replace")
+
+    def evict(self, target_ratio: float = 0.9) -> int:
+        """Delete least recently used blobs until the store is under ``target_ratio * max_bytes``.
+
+        Returns:
+            int: Number of blobs removed.
+        """
+        with self._lock:
+            entries = []
+            for dirpath, _, filenames in os.walk(self.root):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+
+            removed = 0
+            size = sum(size for _, size, _ in entries)
+            target = self.max_bytes * target_ratio
+            for _, blob_size, path in entries:
+                if size <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                size -= blob_size
+                removed += 1
+            self._size = size
+            self.counters["evictions"] += removed
+            return removed
+
+    def stats(self) -> Dict[str, float]:
+        """Return counters plus current size and compression ratio."""
+        raw, stored = self.counters["raw_bytes_in"], self.counters["stored_bytes_in"]
+        return {
+            **self.counters,
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "compression_ratio": raw / stored if stored else 0.0,
+        }
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store under ``ODR_CACHE_DIR``."""
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(os.path.join(CACHE_DIR, "blobs"))
+    return _blob_store
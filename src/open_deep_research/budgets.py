@@ -0,0 +1,83 @@
+"""Research budgets for sections and reports.
+
+The research loop runs until the model stops calling tools. Budgets bound it: every
+section and every report has a wall-clock deadline, a maximum number of search tool
+calls and a maximum number of prompt tokens. Section search and token counts live in
+``SectionState`` and are checkpointed with the section's history. Report usage is shared
+by all sections of a report and is kept in process memory, keyed by report id, together
+with the wall clocks of the report and of its sections.
+
+Budgets bound one run. The supervisor resets a report's usage whenever new user input
+starts a run on its thread, however the graph is invoked (``stream_report``, the
+LangGraph server, a direct ``ainvoke``), and ``stream_report`` also resets it when it
+resumes a run, so a resumed report gets fresh deadlines and report counters instead of
+the clock of the attempt that failed. Once a budget is exhausted, the research agent is
+forced to write its section with what it has gathered.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+# Report usage entries kept in memory (oldest reports are forgotten first)
+MAX_TRACKED_REPORTS = 1024
+
+
+@dataclass
+class ReportUsage:
+    """Resources consumed by all sections of one report in the current run."""
+
+    started_at: float = field(default_factory=time.time)
+    tool_calls: int = 0
+    prompt_tokens: int = 0
+    section_started_at: Dict[str, float] = field(default_factory=dict)
+
+    def section_clock(self, section: str) -> float:
+        """Return when ``section``'s research started in the current run."""
+        return self.section_started_at.setdefault(section, time.time())
+
+
+_reports: "OrderedDict[str, ReportUsage]" = OrderedDict()
+
+
+def report_usage(report_id: str) -> ReportUsage:
+    """Return the usage of ``report_id``; its clock starts with its first section."""
+    usage = _reports.get(report_id)
+    if usage is None:
+        usage = _reports[report_id] = ReportUsage()
+        while len(_reports) > MAX_TRACKED_REPORTS:
+            _reports.popitem(last=False)
+    return usage
+
+
+def reset_report_usage(report_id: str) -> None:
+    """Forget the usage of ``report_id``; the next section starts a new run's budgets."""
+    _reports.pop(report_id, None)
+
+
+def budget_exceeded(
+    *,
+    started_at: float,
+    tool_calls: int,
+    prompt_tokens: int,
+    deadline_seconds: float,
+    max_tool_calls: int,
+    max_prompt_tokens: int,
+) -> Optional[str]:
+    """Return why a budget is exhausted, or None if there is budget left.
+
+    Limits that are zero or unset are not enforced.
+    """
+    deadline_seconds, max_tool_calls, max_prompt_tokens = (
+        float(deadline_seconds or 0),
+        int(max_tool_calls or 0),
+        int(max_prompt_tokens or 0),
+    )
+    if deadline_seconds and time.time() - started_at >= deadline_seconds:
+        return f"prazo de {deadline_seconds:.0f}s"
+    if max_tool_calls and tool_calls >= max_tool_calls:
+        return f"limite de {max_tool_calls} buscas"
+    if max_prompt_tokens and prompt_tokens >= max_prompt_tokens:
+        return f"limite de {max_prompt_tokens} tokens"
+    return None
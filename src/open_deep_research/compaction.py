@@ -0,0 +1,108 @@
+"""Compaction of research agent message histories.
+
+Every researcher turn resends the whole conversation, and search tool outputs carry up
+to 30000 characters of page content per source. Once the model has seen a tool output
+(it is followed by a later AI message), its full page contents are no longer needed
+verbatim: the compaction stage rewrites such outputs, oldest first, into notes holding
+each source's title, URL, summary and a short excerpt until the history fits under a
+token ceiling. The newest tool outputs, which the model has not read yet, are never
+touched.
+"""
+
+import re
+from typing import Any, List, Sequence
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+# Marker prepended to compacted tool outputs so they are not compacted twice
+COMPACTED_MARKER = "[Compacted search results: full page contents were removed after use]"
+
+# Rough characters-per-token ratio used for budgeting; good enough for a ceiling
+CHARS_PER_TOKEN = 4
+
+_SOURCE_HEADER = re.compile(r"^--- SOURCE \d+: .* ---$", re.MULTILINE)
+
+
+def estimate_tokens(messages: Sequence[Any]) -> int:
+    """Return a rough token count for ``messages`` (characters / 4)."""
+    chars = 0
+    for message in messages:
+        content = message.get("content", "") if isinstance(message, dict) else message.content
+        chars += len(content) if isinstance(content, str) else len(str(content))
+    return chars // CHARS_PER_TOKEN
+
+
+def compact_tool_output(text: str, excerpt_chars: int = 500) -> str:
+    """Reduce a formatted search output to per-source notes.
+
+    Keeps the ``--- SOURCE`` header, ``URL:`` line and ``SUMMARY:`` block of every
+    source and replaces its ``FULL CONTENT:`` with the first ``excerpt_chars`` characters.
+
+    Args:
+        text: Output of one of the search tools.
+        excerpt_chars: Characters of page content kept per source.
+
+    Returns:
+        str: The compacted output.
+    """
+    starts = [m.start() for m in _SOURCE_HEADER.finditer(text)]
+    if not starts:
+        excerpt = text[:excerpt_chars]
+        return f"{COMPACTED_MARKER}\n\n{excerpt}" + ("..." if len(text) > excerpt_chars else "")
+
+    notes = [COMPACTED_MARKER]
+    for start, end in zip(starts, starts[1:] + [len(text)]):
+        block = text[start:end].strip().rstrip("-").strip()
+        head, _, full_content = block.partition("FULL CONTENT:")
+        full_content = full_content.strip()
+        note = head.strip()
+        if full_content:
+            excerpt = full_content[:excerpt_chars]
+            if len(full_content) > excerpt_chars:
+                excerpt += "..."
+            note += f"\n\nEXCERPT:\n{excerpt}"
+        notes.append(note)
+    return "\n\n".join(notes)
+
+
+def compact_messages(messages: Sequence[Any], max_tokens: int, excerpt_chars: int = 500) -> List[ToolMessage]:
+    """Return replacements for consumed tool messages needed to fit under ``max_tokens``.
+
+    Args:
+        messages: The agent's message history (``BaseMessage`` objects with ids).
+        max_tokens: Token ceiling for the history.
+        excerpt_chars: Characters of page content kept per source.
+
+    Returns:
+        list[ToolMessage]: Compacted copies carrying the original message ids, so that
+        returning them through ``add_messages`` replaces the originals in place. Empty
+        when the history already fits.
+    """
+    total = estimate_tokens(messages)
+    if total <= max_tokens:
+        return []
+
+    # Only tool outputs followed by a later AI message have been consumed by the model
+    last_ai = max((i for i, m in enumerate(messages) if isinstance(m, AIMessage)), default=-1)
+
+    replacements = []
+    for message in messages[:last_ai]:
+        if total <= max_tokens:
+            break
+        if not isinstance(message, ToolMessage) or not isinstance(message.content, str):
+            continue
+        if message.content.startswith(COMPACTED_MARKER):
+            continue
+        compacted = compact_tool_output(message.content, excerpt_chars)
+        if len(compacted) >= len(message.content):
+            continue
+        total -= (len(message.content) - len(compacted)) // CHARS_PER_TOKEN
+        replacements.append(
+            ToolMessage(
+                content=compacted,
+                name=message.name,
+                tool_call_id=message.tool_call_id,
+                id=message.id,
+            )
+        )
+    return replacements
@@ -1,11 +1,12 @@
+import json
 import os
+import typing
 from enum import Enum
 from dataclasses import dataclass, fields
 from typing import Any, Optional, Dict
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.runnables import RunnableConfig
-from dataclasses import dataclass
 
 DEFAULT_REPORT_STRUCTURE = """Use this structure to create a report on the user-provided topic:
 
@@ -45,6 +46,7 @@ class Configuration:
     # Graph-specific configuration
     number_of_queries: int = 2  # Number of search queries to generate per iteration
     max_search_depth: int = 2  # Maximum number of reflection + search iterations
+    skip_human_feedback: bool = False  # Approve the report plan without interrupting (batch runs)
     planner_provider: str = "anthropic"  # Defaults to Anthropic as provider
     planner_model: str = (
         "claude-3-7-sonnet-latest"  # Defaults to claude-3-7-sonnet-latest
@@ -55,8 +57,6 @@ class Configuration:
         "claude-3-5-sonnet-latest"  # Defaults to claude-3-5-sonnet-latest
     )
     writer_model_kwargs: Optional[Dict[str, Any]] = None  # kwargs for writer_model
-    search_api: SearchAPI = SearchAPI.TAVILY  # Default to PERPLEXITY
-    search_api_config: Optional[Dict[str, Any]] = None
 
     # Multi-agent specific configuration
     supervisor_model: str = (
@@ -65,18 +65,154 @@ class Configuration:
     researcher_model: str = (
         "openai:gpt-4.1-mini"  # Model for research agents in multi-agent setup
     )
+    llm_cache: bool = False  # Replay identical supervisor/researcher calls from a local SQLite cache
+    llm_cache_path: Optional[str] = None  # Defaults to <ODR_CACHE_DIR>/llm_cache.sqlite
+    max_concurrent_tool_calls: int = 4  # Tool calls from one agent turn executed in parallel
+    research_context_max_tokens: int = 24000  # Ceiling before consumed search outputs are compacted
+    specialty: Optional[str] = None  # Specialty the report is about, used as the section cache key
+    residency_state: Optional[str] = None  # State where the student wants residency, part of the section cache key
+    section_cache: bool = False  # Reuse standard sections researched for the same specialty and state
+    section_cache_ttl: int = 7 * 24 * 3600  # Seconds a stored section may be reused
+    speculative_prefetch: bool = True  # Start the standard sections' searches during supervisor planning
+    section_deadline_seconds: int = 300  # Wall-clock budget of one section's research
+    section_max_tool_calls: int = 2  # Search calls allowed per section (the 2-search rule of RESEARCH_INSTRUCTIONS)
+    section_max_prompt_tokens: int = 200000  # Prompt tokens allowed per section
+    report_deadline_seconds: int = 900  # Wall-clock budget of a report's section research
+    report_max_tool_calls: int = 30  # Search calls allowed across a report's sections
+    report_max_prompt_tokens: int = 1000000  # Prompt tokens allowed across a report's sections
 
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
     ) -> "Configuration":
-        """Create a Configuration instance from a RunnableConfig."""
+        """Create a Configuration instance from a RunnableConfig.
+
+        Environment overrides (``FIELD_NAME`` variables) are read once, when the module
+        is imported or ``refresh_environment`` is called. Values are converted to the
+        field types (enums, ints, bools, JSON dicts) and a ValueError is raised for
+        values that cannot be, so misconfiguration fails before any model or search
+        call. Only unset (None) values fall back to the defaults; ``0`` and ``False``
+        are kept.
+
+        Parsed instances are cached per fingerprint of the configurable values for the
+        configuration fields, so the repeated calls made by every node and tools factory
+        in the agent loops are a dictionary lookup. The returned instance is shared and
+        must not be mutated.
+        """
         configurable = (
             config["configurable"] if config and "configurable" in config else {}
         )
-        values: dict[str, Any] = {
-            f.name: os.environ.get(f.name.upper(), configurable.get(f.name))
-            for f in fields(cls)
-            if f.init
-        }
-        return cls(**{k: v for k, v in values.items() if v})
+        names = _field_names(cls)
+        key = (cls, _fingerprint({name: configurable[name] for name in names if name in configurable}))
+        resolved = _resolved_configs.get(key)
+        if resolved is None:
+            types = _field_types(cls)
+            values: dict[str, Any] = {}
+            for name in names:
+                value = _environment.get(name.upper())
+                if value is None:
+                    value = configurable.get(name)
+                if value is not None:
+                    values[name] = _coerce(name, value, types[name])
+            if len(_resolved_configs) >= MAX_CACHED_CONFIGS:
+                _resolved_configs.clear()
+            resolved = _resolved_configs[key] = cls(**values)
+        return resolved
+
+
+# Parsed configurations, keyed by class and configurable fingerprint
+MAX_CACHED_CONFIGS = 256
+_resolved_configs: Dict[tuple, Configuration] = {}
+_field_names_by_class: Dict[type, tuple] = {}
+_field_types_by_class: Dict[type, Dict[str, Any]] = {}
+
+_TRUE_STRINGS = ("1", "true", "yes", "on")
+_FALSE_STRINGS = ("0", "false", "no", "off")
+
+
+def _snapshot_environment() -> Dict[str, str]:
+    """Return the non-empty environment overrides of the Configuration fields."""
+    snapshot = {}
+    for f in fields(Configuration):
+        value = os.environ.get(f.name.upper())
+        if value is not None and value.strip():
+            snapshot[f.name.upper()] = value
+    return snapshot
+
+
+_environment: Dict[str, str] = _snapshot_environment()
+
+
+def refresh_environment() -> None:
+    """Re-read the environment overrides and drop the cached configurations.
+
+    Needed only when the environment variables change after import (e.g. in tests).
+    """
+    global _environment
+    _environment = _snapshot_environment()
+    _resolved_configs.clear()
+
+
+def _field_names(cls: type) -> tuple:
+    names = _field_names_by_class.get(cls)
+    if names is None:
+        names = _field_names_by_class[cls] = tuple(f.name for f in fields(cls) if f.init)
+    return names
+
+
+def _field_types(cls: type) -> Dict[str, Any]:
+    types = _field_types_by_class.get(cls)
+    if types is None:
+        hints = typing.get_type_hints(cls)
+        types = _field_types_by_class[cls] = {name: hints.get(name, Any) for name in _field_names(cls)}
+    return types
+
+
+def _coerce(name: str, value: Any, annotation: Any) -> Any:
+    """Convert ``value`` to the type of field ``name``, raising ValueError if it cannot be."""
+    if typing.get_origin(annotation) is typing.Union:
+        # Optional[X]: None was already handled by the caller
+        annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+    target = typing.get_origin(annotation) or annotation
+
+    try:
+        if target is bool:
+            if isinstance(value, bool):
+                return value
+            text = str(value).strip().lower()
+            if text in _TRUE_STRINGS:
+                return True
+            if text in _FALSE_STRINGS:
+                return False
+            raise ValueError(f"expected a boolean ({'/'.join(_TRUE_STRINGS)} or {'/'.join(_FALSE_STRINGS)})")
+        if target is int:
+            if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+                raise ValueError("expected an integer")
+            return int(value)
+        if target is float:
+            return float(value)
+        if isinstance(target, type) and issubclass(target, Enum):
+            if isinstance(value, target):
+                return value
+            try:
+                return target(str(value).strip().lower())
+            except ValueError:
+                raise ValueError(f"expected one of {', '.join(member.value for member in target)}") from None
+        if target is dict:
+            if isinstance(value, str):
+                value = json.loads(value)
+            if not isinstance(value, dict):
+                raise ValueError("expected a dict or a JSON object")
+            return value
+        if target is str:
+            if not isinstance(value, str):
+                raise ValueError("expected a string")
+            return value
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid value for configuration field '{name}': {value!r} ({e})") from None
+    return value
+
+
+def _fingerprint(values: Dict[str, Any]) -> str:
+    """Return a stable, hashable fingerprint of configuration values (dicts included)."""
+    return json.dumps(values, sort_keys=True, default=str)
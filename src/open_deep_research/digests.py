@@ -0,0 +1,58 @@
+"""Compact digests of completed report sections.
+
+Writing the introduction and conclusion does not require the full text of every body
+section. A digest keeps what those parts refer to: the section title, its subheadings,
+its opening sentence, the sentences carrying numbers, and how many sources it cites.
+Digests are computed once, when a section completes. The finalization prompts use the
+digests, and the full sections are only spliced into the final report.
+"""
+
+import re
+
+MAX_KEY_FACTS = 6
+MAX_FACT_CHARS = 220
+
+_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*$", re.MULTILINE)
+_URL = re.compile(r"https?://[^\s)\]>\"']+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_NUMBER = re.compile(r"\d")
+
+
+def _body_lines(content: str):
+    for line in content.splitlines():
+        line = line.strip().lstrip("-*>").strip()
+        if line and not line.startswith("#") and not _URL.fullmatch(line):
+            yield line
+
+
+def section_digest(section) -> str:
+    """Return the digest of a completed ``Section``.
+
+    Args:
+        section: A section with ``name`` and ``content``.
+
+    Returns:
+        str: Markdown digest with subheadings, opening sentence, key figures and source count.
+    """
+    content = section.content or ""
+    headings = _HEADING.findall(content)
+    title = headings[0] if headings else section.name
+
+    sentences = [s.strip() for line in _body_lines(content) for s in _SENTENCE_END.split(line) if s.strip()]
+    key_facts = []
+    for sentence in sentences:
+        if _NUMBER.search(_URL.sub("", sentence)) and sentence not in key_facts:
+            key_facts.append(sentence[:MAX_FACT_CHARS] + ("..." if len(sentence) > MAX_FACT_CHARS else ""))
+        if len(key_facts) >= MAX_KEY_FACTS:
+            break
+
+    lines = [f"### {title}"]
+    if len(headings) > 1:
+        lines.append("Tópicos: " + "; ".join(headings[1:]))
+    if sentences:
+        lines.append("Resumo: " + sentences[0][:MAX_FACT_CHARS])
+    if key_facts:
+        lines.append("Números-chave:")
+        lines.extend(f"- {fact}" for fact in key_facts)
+    lines.append(f"Fontes citadas: {len(set(_URL.findall(content)))}")
+    return "\n".join(lines)
@@ -0,0 +1,406 @@
+"""Shared HTTP plumbing for the search and page-fetch layer.
+
+All outbound page and scraping requests go through one pooled ``httpx.AsyncClient``
+per event loop, so connections (and TLS sessions) are reused across queries,
+sections and graph invocations. CPU-bound HTML parsing runs on a persistent
+thread pool instead of a pool created and torn down on every search call.
+
+Page fetches are queued through a ``DomainScheduler`` that caps concurrent requests
+per host and spaces consecutive requests to the same host, across every research
+section running on the loop.
+
+Cacheable page fetches are stored in a ``PageCache`` together with their ``ETag`` /
+``Last-Modified`` validators. Within the freshness window the cached body is served
+without touching the network; after it, a conditional GET is issued and a
+``304 Not Modified`` reuses the cached body. Page bodies themselves live in the
+compressed, content-addressed ``BlobStore``; the cache index only keeps digests.
+Cache reads and writes (SQLite commits, hashing, compression, eviction) run in a
+worker thread so they never block the event loop shared by every section.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import random
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from open_deep_research.blobstore import CACHE_DIR, BlobStore, get_blob_store
+from open_deep_research.instrumentation import record_fetch
+
+HTTP_TIMEOUT = 30.0
+MAX_CONNECTIONS = 50
+MAX_KEEPALIVE_CONNECTIONS = 20
+PARSE_WORKERS = 4
+
+# Politeness defaults, overridable from the environment
+PER_HOST_CONCURRENCY = int(os.environ.get("FETCH_PER_HOST_CONCURRENCY", "2"))
+PER_HOST_MIN_INTERVAL = float(os.environ.get("FETCH_PER_HOST_MIN_INTERVAL", "1.0"))
+MAX_CONCURRENT_FETCHES = int(os.environ.get("FETCH_MAX_CONCURRENCY", "16"))
+
+# Page cache settings
+PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+PAGE_CACHE_TTL = float(os.environ.get("PAGE_CACHE_TTL", str(24 * 3600)))  # Seconds a page is served without revalidation
+
+# httpx clients and asyncio primitives are bound to the loop they were first used on,
+# and the app starts a fresh loop per asyncio.run(), so keep one instance per live loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, DomainScheduler]" = weakref.WeakKeyDictionary()
+_parse_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def get_http_client():
+    """Return the pooled async HTTP client for the running event loop.
+
+    Returns:
+        httpx.AsyncClient: A client that follows redirects and keeps connections alive.
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def aclose_http_client() -> None:
+    """Close the pooled client of the running event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def get_parse_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the process-wide thread pool used for HTML parsing."""
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=PARSE_WORKERS, thread_name_prefix="odr-parse"
+        )
+    return _parse_executor
+
+
+async def run_in_parse_executor(fn: Callable, *args, **kwargs):
+    """Run a CPU-bound parsing function off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), partial(fn, *args, **kwargs))
+
+
+def make_soup(markup: str, parse_only=None):
+    """Parse HTML with lxml when available, falling back to the stdlib parser.
+
+    Args:
+        markup: The HTML document.
+        parse_only: Optional ``SoupStrainer`` restricting which elements are built.
+
+    Returns:
+        BeautifulSoup: The parsed document.
+    """
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    try:
+        return BeautifulSoup(markup, "lxml", parse_only=parse_only)
+    except FeatureNotFound:
+        return BeautifulSoup(markup, "html.parser", parse_only=parse_only)
+
+
+def html_to_text(html: str) -> str:
+    """Extract the visible text of an HTML document."""
+    return make_soup(html).get_text()
+
+
+def random_user_agent() -> str:
+    """Generates a random user agent string."""
+    lynx_version = f"Lynx/{random.randint(2, 3)}.{random.randint(8, 9)}.{random.randint(0, 2)}"
+    libwww_version = f"libwww-FM/{random.randint(2, 3)}.{random.randint(13, 15)}"
+    ssl_mm_version = f"SSL-MM/{random.randint(1, 2)}.{random.randint(3, 5)}"
+    openssl_version = f"OpenSSL/{random.randint(1, 3)}.{random.randint(0, 4)}.{random.randint(0, 9)}"
+    return f"{lynx_version} {libwww_version} {ssl_mm_version} {openssl_version}"
+
+
+@dataclass
+class _HostState:
+    semaphore: asyncio.Semaphore
+    next_slot: float = 0.0  # Loop time at which the next request to this host may start
+    requests: int = 0
+    waited: float = 0.0  # Total seconds spent waiting for spacing
+
+
+@dataclass
+class DomainScheduler:
+    """Per-host concurrency limits and minimum spacing for outbound fetches.
+
+    Requests to the same host are started at most ``min_interval`` seconds apart
+    and at most ``per_host_concurrency`` at a time, while requests to different
+    hosts proceed in parallel up to ``max_concurrency``.
+    """
+
+    per_host_concurrency: int = PER_HOST_CONCURRENCY
+    min_interval: float = PER_HOST_MIN_INTERVAL
+    max_concurrency: int = MAX_CONCURRENT_FETCHES
+    # Host-specific (concurrency, min_interval) overrides, e.g. {"www.google.com": (1, 2.0)}
+    overrides: Dict[str, tuple] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._hosts: Dict[str, _HostState] = {}
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        self._queued = 0
+        self._active = 0
+
+    def _host_state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            concurrency, _ = self.overrides.get(host, (self.per_host_concurrency, self.min_interval))
+            state = self._hosts[host] = _HostState(semaphore=asyncio.Semaphore(concurrency))
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Wait until a request to ``url``'s host is allowed, then hold the slot."""
+        host = (urlsplit(url).hostname or "").lower()
+        state = self._host_state(host)
+        _, interval = self.overrides.get(host, (self.per_host_concurrency, self.min_interval))
+        loop = asyncio.get_running_loop()
+
+        self._queued += 1
+        dequeued = False
+        try:
+            async with state.semaphore:
+                # Reserve the next start time before sleeping so queued requests space out in FIFO order
+                now = loop.time()
+                start_at = max(now, state.next_slot)
+                state.next_slot = start_at + interval
+                if start_at > now:
+                    state.waited += start_at - now
+                    await asyncio.sleep(start_at - now)
+                async with self._global:
+                    self._queued -= 1
+                    dequeued = True
+                    self._active += 1
+                    state.requests += 1
+                    try:
+                        yield
+                    finally:
+                        self._active -= 1
+        finally:
+            if not dequeued:
+                self._queued -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request counts and spacing wait per host, plus current queue depth."""
+        return {
+            "queued": self._queued,
+            "active": self._active,
+            "hosts": {
+                host: {"requests": state.requests, "waited_seconds": round(state.waited, 3)}
+                for host, state in self._hosts.items()
+            },
+        }
+
+
+def get_domain_scheduler() -> DomainScheduler:
+    """Return the fetch scheduler shared by every search on the running event loop."""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = DomainScheduler(
+            # Google blocks aggressive scrapers quickly; keep its result pages strictly serial
+            overrides={"www.google.com": (1, 2.0)},
+        )
+    return scheduler
+
+
+class PageCache:
+    """SQLite index of fetched pages and their revalidation headers.
+
+    Bodies are kept in a ``BlobStore`` keyed by content digest, so a page body shared
+    by several URLs (mirrors, redirects, tracking parameters) is stored once.
+
+    Args:
+        path: SQLite database file.
+        ttl: Seconds a stored page is served without contacting the origin.
+        blob_store: Store for the page bodies.
+    """
+
+    def __init__(self, path: str, ttl: float = PAGE_CACHE_TTL, blob_store: Optional[BlobStore] = None):
+        self.path = path
+        self.ttl = ttl
+        self.blob_store = blob_store or get_blob_store()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS page_index (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                body_digest TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+        self.counters = {
+            "fresh_hits": 0,  # Served from cache without a request
+            "revalidated": 0,  # 304 Not Modified, cached body reused
+            "misses": 0,  # No usable entry or the page changed: full download
+            "stored": 0,
+            "bytes_served_fresh": 0,
+            "bytes_saved_revalidation": 0,  # Body bytes not re-downloaded thanks to a 304
+            "bytes_downloaded": 0,
+        }
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for ``url``, if any (and its body is still stored)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_type, body_digest, fetched_at FROM page_index WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, content_type, body_digest, fetched_at = row
+        body = self.blob_store.get(body_digest)
+        if body is None:
+            # Body was evicted from the blob store: drop the dangling index entry
+            with self._lock:
+                self._conn.execute("DELETE FROM page_index WHERE url = ?", (url,))
+                self._conn.commit()
+            return None
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": content_type,
+            "body": body,
+            "fetched_at": fetched_at,
+        }
+
+    def put(self, url: str, response) -> None:
+        """Store a 200 response body with its validators."""
+        body_digest = self.blob_store.put(response.content)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_index VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    response.headers.get("Content-Type", ""),
+                    body_digest,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+        self.counters["stored"] += 1
+
+    def touch(self, url: str, response) -> None:
+        """Restart the freshness window after a 304, keeping any refreshed validators."""
+        with self._lock:
+            self._conn.execute(
+                """UPDATE page_index SET fetched_at = ?,
+                    etag = COALESCE(?, etag),
+                    last_modified = COALESCE(?, last_modified)
+                WHERE url = ?""",
+                (time.time(), response.headers.get("ETag"), response.headers.get("Last-Modified"), url),
+            )
+            self._conn.commit()
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether ``entry`` can be served without revalidation."""
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/revalidation counters and bytes saved."""
+        lookups = self.counters["fresh_hits"] + self.counters["revalidated"] + self.counters["misses"]
+        hits = self.counters["fresh_hits"] + self.counters["revalidated"]
+        return {**self.counters, "hit_rate": hits / lookups if lookups else 0.0}
+
+
+_page_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """Return the process-wide page cache, or None when disabled via PAGE_CACHE_ENABLED."""
+    global _page_cache
+    if PAGE_CACHE_ENABLED and _page_cache is None:
+        _page_cache = PageCache(os.path.join(CACHE_DIR, "pages.sqlite"))
+    return _page_cache
+
+
+def _cached_response(url: str, entry: Dict[str, Any]):
+    """Build an ``httpx.Response`` from a cache entry so callers need no special casing."""
+    import httpx
+
+    return httpx.Response(
+        200,
+        headers={"Content-Type": entry["content_type"] or "", "X-Cache": "HIT"},
+        content=entry["body"],
+        request=httpx.Request("GET", url),
+    )
+
+
+async def fetch_page(url: str, cache: bool = False, **kwargs):
+    """GET ``url`` with the pooled client, honouring the per-host politeness limits.
+
+    Args:
+        url: The URL to fetch.
+        cache: Serve and store the page through the page cache, revalidating
+            expired entries with a conditional GET.
+        **kwargs: Passed through to ``httpx.AsyncClient.get`` (headers, params, timeout).
+
+    Returns:
+        httpx.Response: The response (or one rebuilt from the cache); status is not checked.
+    """
+    page_cache = get_page_cache() if cache else None
+    entry = await asyncio.to_thread(page_cache.get, url) if page_cache else None
+
+    if entry is not None and page_cache.is_fresh(entry):
+        page_cache.counters["fresh_hits"] += 1
+        page_cache.counters["bytes_served_fresh"] += len(entry["body"])
+        record_fetch(0, cache_hit=True)
+        return _cached_response(url, entry)
+
+    if entry is not None and (entry["etag"] or entry["last_modified"]):
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        kwargs["headers"] = headers
+
+    async with get_domain_scheduler().slot(url):
+        response = await get_http_client().get(url, **kwargs)
+
+    if page_cache is None:
+        record_fetch(len(response.content), cache_hit=False)
+        return response
+
+    if response.status_code == 304 and entry is not None:
+        record_fetch(0, cache_hit=True)
+        page_cache.counters["revalidated"] += 1
+        page_cache.counters["bytes_saved_revalidation"] += len(entry["body"])
+        await asyncio.to_thread(page_cache.touch, url, response)
+        return _cached_response(url, entry)
+
+    page_cache.counters["misses"] += 1
+    page_cache.counters["bytes_downloaded"] += len(response.content)
+    record_fetch(len(response.content), cache_hit=False)
+    if response.status_code == 200 and "no-store" not in response.headers.get("Cache-Control", ""):
+        await asyncio.to_thread(page_cache.put, url, response)
+    return response
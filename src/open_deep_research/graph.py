@@ -0,0 +1,410 @@
+"""Plan-then-research workflow graph.
+
+A cheaper and more predictable alternative to the multi-agent graph: a planner writes
+the report plan from one round of searches and, after human approval, one batched
+call generates the search queries of every section. Each section that needs research
+then runs its own search/write/grade pipeline in parallel (``Send``), bounded by
+``max_search_depth``. The sections without research (introduction, conclusion) are
+written last, from digests of the researched sections.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Literal
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, Send, interrupt
+
+from open_deep_research.configuration import Configuration
+from open_deep_research.digests import section_digest
+from open_deep_research.models import get_chat_model
+from open_deep_research.prompts import (
+    FINAL_SECTION_WRITER_INSTRUCTIONS,
+    QUERY_WRITER_INSTRUCTIONS,
+    REPORT_PLANNER_INSTRUCTIONS,
+    REPORT_PLANNER_QUERY_WRITER_INSTRUCTIONS,
+    SECTION_GRADER_INSTRUCTIONS,
+    SECTION_QUERIES_INSTRUCTIONS,
+    SECTION_WRITER_INPUTS,
+    SECTION_WRITER_INSTRUCTIONS,
+)
+from open_deep_research.state import (
+    BatchedQueries,
+    Feedback,
+    Queries,
+    ReportState,
+    ReportStateInput,
+    ReportStateOutput,
+    SectionOutputState,
+    Sections,
+    SectionState,
+)
+from open_deep_research.utils import (
+    get_config_value,
+    get_search_params,
+    select_and_execute_search,
+)
+
+logger = logging.getLogger(__name__)
+
+
+## Models
+def _model(model: str, provider: str, model_kwargs):
+    kwargs = {"model_provider": provider}
+    if model_kwargs:
+        kwargs["model_kwargs"] = model_kwargs
+    return get_chat_model(model, **kwargs)
+
+
+def planner_model(configurable: Configuration):
+    """Return the shared planner model (plans, batched queries, grading)."""
+    return _model(
+        get_config_value(configurable.planner_model),
+        get_config_value(configurable.planner_provider),
+        configurable.planner_model_kwargs,
+    )
+
+
+def writer_model(configurable: Configuration):
+    """Return the shared writer model (planning queries, section text)."""
+    return _model(
+        get_config_value(configurable.writer_model),
+        get_config_value(configurable.writer_provider),
+        configurable.writer_model_kwargs,
+    )
+
+
+async def run_search(configurable: Configuration, search_queries) -> str:
+    """Run ``search_queries`` with the configured search API and return the formatted sources."""
+    search_api = get_config_value(configurable.search_api)
+    params_to_pass = get_search_params(search_api, configurable.search_api_config)
+    query_list = [query.search_query for query in search_queries]
+    return await select_and_execute_search(search_api, query_list, params_to_pass)
+
+
+## Planning
+async def generate_report_plan(state: ReportState, config: RunnableConfig):
+    """Search once for context and plan the report sections."""
+    topic = state["topic"]
+    feedback = state.get("feedback_on_report_plan", None)
+
+    configurable = Configuration.from_runnable_config(config)
+    report_structure = configurable.report_structure
+    if isinstance(report_structure, dict):
+        report_structure = str(report_structure)
+
+    structured_llm = writer_model(configurable).with_structured_output(Queries)
+    system_instructions_query = REPORT_PLANNER_QUERY_WRITER_INSTRUCTIONS.format(
+        topic=topic,
+        report_organization=report_structure,
+        number_of_queries=configurable.number_of_queries,
+    )
+    results = await structured_llm.ainvoke(
+        [
+            SystemMessage(content=system_instructions_query),
+            HumanMessage(content="Gere consultas de busca que ajudem a planejar as seções do relatório."),
+        ]
+    )
+    source_str = await run_search(configurable, results.queries)
+
+    system_instructions_sections = REPORT_PLANNER_INSTRUCTIONS.format(
+        topic=topic,
+        report_organization=report_structure,
+        context=source_str,
+        feedback=feedback,
+    )
+    structured_llm = planner_model(configurable).with_structured_output(Sections)
+    report_sections = await structured_llm.ainvoke(
+        [
+            SystemMessage(content=system_instructions_sections),
+            HumanMessage(
+                content="Gere as seções do relatório. A resposta deve conter o campo 'sections' com a lista de "
+                "seções, cada uma com os campos name, description, research e content."
+            ),
+        ]
+    )
+    return {"sections": report_sections.sections}
+
+
+def human_feedback(
+    state: ReportState, config: RunnableConfig
+) -> Command[Literal["generate_report_plan", "generate_section_queries"]]:
+    """Get feedback on the report plan; approving it (``True``) starts the research."""
+    configurable = Configuration.from_runnable_config(config)
+    if configurable.skip_human_feedback:
+        return Command(goto="generate_section_queries")
+
+    sections_str = "\n\n".join(
+        f"Seção: {section.name}\nDescrição: {section.description}\nExige pesquisa: {section.research}\n"
+        for section in state["sections"]
+    )
+    interrupt_message = (
+        f"Revise o plano do relatório:\n\n{sections_str}\n\n"
+        "O plano atende às suas necessidades?\n"
+        "Envie 'true' para aprovar o plano.\n"
+        "Ou envie um feedback para gerar um novo plano:"
+    )
+    feedback = interrupt(interrupt_message)
+
+    if isinstance(feedback, bool) and feedback is True:
+        return Command(goto="generate_section_queries")
+    elif isinstance(feedback, str):
+        return Command(goto="generate_report_plan", update={"feedback_on_report_plan": feedback})
+    else:
+        raise TypeError(f"Interrupt value of type {type(feedback)} is not supported.")
+
+
+async def generate_section_queries(
+    state: ReportState, config: RunnableConfig
+) -> Command[Literal["build_section_with_web_research", "gather_completed_sections"]]:
+    """Generate the first search queries of every research section in one call, then start the section pipelines."""
+    topic = state["topic"]
+    research_sections = [s for s in state["sections"] if s.research]
+    if not research_sections:
+        return Command(goto="gather_completed_sections")
+
+    configurable = Configuration.from_runnable_config(config)
+    number_of_queries = configurable.number_of_queries
+    structured_llm = planner_model(configurable).with_structured_output(BatchedQueries)
+    system_instructions = SECTION_QUERIES_INSTRUCTIONS.format(
+        topic=topic,
+        sections="\n".join(f"- {s.name}: {s.description}" for s in research_sections),
+        number_of_queries=number_of_queries,
+    )
+    try:
+        batched = await structured_llm.ainvoke(
+            [
+                SystemMessage(content=system_instructions),
+                HumanMessage(content="Gere as consultas de busca de cada seção."),
+            ]
+        )
+        batched_sections = batched.sections
+    except Exception as e:
+        # Sections without queries generate their own in the pipeline
+        logger.warning("Batched query generation failed: %s", e)
+        batched_sections = []
+
+    queries_by_name = {item.section_name.strip().lower(): item.queries for item in batched_sections}
+    sends = []
+    for i, section in enumerate(research_sections):
+        queries = queries_by_name.get(section.name.strip().lower())
+        if queries is None and len(batched_sections) == len(research_sections):
+            # Names were rewritten but the order was kept
+            queries = batched_sections[i].queries
+        sends.append(
+            Send(
+                "build_section_with_web_research",
+                {
+                    "topic": topic,
+                    "section": section,
+                    "search_iterations": 0,
+                    "search_queries": (queries or [])[:number_of_queries],
+                },
+            )
+        )
+    return Command(goto=sends)
+
+
+## Section pipeline
+def route_section_start(state: SectionState) -> Literal["search_web", "generate_queries"]:
+    """Search right away when the batched call provided the section's queries."""
+    return "search_web" if state.get("search_queries") else "generate_queries"
+
+
+async def generate_queries(state: SectionState, config: RunnableConfig):
+    """Generate search queries for a section the batched call did not cover."""
+    configurable = Configuration.from_runnable_config(config)
+    structured_llm = writer_model(configurable).with_structured_output(Queries)
+    system_instructions = QUERY_WRITER_INSTRUCTIONS.format(
+        topic=state["topic"],
+        section_topic=state["section"].description,
+        number_of_queries=configurable.number_of_queries,
+    )
+    queries = await structured_llm.ainvoke(
+        [
+            SystemMessage(content=system_instructions),
+            HumanMessage(content="Gere consultas de busca sobre o tema da seção."),
+        ]
+    )
+    return {"search_queries": queries.queries}
+
+
+async def search_web(state: SectionState, config: RunnableConfig):
+    """Run the section's search queries."""
+    configurable = Configuration.from_runnable_config(config)
+    source_str = await run_search(configurable, state["search_queries"])
+    return {"source_str": source_str, "search_iterations": state["search_iterations"] + 1}
+
+
+async def write_section(state: SectionState, config: RunnableConfig) -> Command[Literal[END, "search_web"]]:
+    """Write the section from its sources, then grade it and search again if it falls short."""
+    topic = state["topic"]
+    section = state["section"]
+    configurable = Configuration.from_runnable_config(config)
+
+    section_writer_inputs = SECTION_WRITER_INPUTS.format(
+        topic=topic,
+        section_name=section.name,
+        section_topic=section.description,
+        context=state["source_str"],
+        section_content=section.content,
+    )
+    section_content = await writer_model(configurable).ainvoke(
+        [
+            SystemMessage(content=SECTION_WRITER_INSTRUCTIONS),
+            HumanMessage(content=section_writer_inputs),
+        ]
+    )
+    section = section.model_copy(update={"content": section_content.content})
+
+    # The last iteration is final whatever its grade; don't pay for grading it
+    if state["search_iterations"] >= configurable.max_search_depth:
+        return Command(update={"completed_sections": [section]}, goto=END)
+
+    structured_llm = planner_model(configurable).with_structured_output(Feedback)
+    section_grader_instructions = SECTION_GRADER_INSTRUCTIONS.format(
+        topic=topic,
+        section_topic=section.description,
+        section=section.content,
+        number_of_follow_up_queries=configurable.number_of_queries,
+    )
+    feedback = await structured_llm.ainvoke(
+        [
+            SystemMessage(content=section_grader_instructions),
+            HumanMessage(
+                content="Avalie o relatório e indique as consultas de acompanhamento para as informações que faltam. "
+                "Se a nota for 'pass', retorne uma lista vazia de consultas."
+            ),
+        ]
+    )
+
+    if feedback.grade == "pass" or not feedback.follow_up_queries:
+        return Command(update={"completed_sections": [section]}, goto=END)
+    return Command(
+        update={"search_queries": feedback.follow_up_queries, "section": section},
+        goto="search_web",
+    )
+
+
+## Final sections
+def gather_completed_sections(state: ReportState):
+    """Digest the researched sections as context for the sections written without research."""
+    completed_sections = state["completed_sections"]
+    return {"report_sections_from_research": "\n\n".join(section_digest(s) for s in completed_sections)}
+
+
+def initiate_final_section_writing(state: ReportState):
+    """Write the sections that need no research in parallel."""
+    final_sections = [s for s in state["sections"] if not s.research]
+    if not final_sections:
+        return "compile_final_report"
+    return [
+        Send(
+            "write_final_sections",
+            {
+                "topic": state["topic"],
+                "section": section,
+                "report_sections_from_research": state["report_sections_from_research"],
+            },
+        )
+        for section in final_sections
+    ]
+
+
+async def write_final_sections(state: SectionState, config: RunnableConfig):
+    """Write a section that needs no research (introduction, conclusion)."""
+    configurable = Configuration.from_runnable_config(config)
+    section = state["section"]
+    system_instructions = FINAL_SECTION_WRITER_INSTRUCTIONS.format(
+        topic=state["topic"],
+        section_name=section.name,
+        section_topic=section.description,
+        context=state["report_sections_from_research"],
+    )
+    section_content = await writer_model(configurable).ainvoke(
+        [
+            SystemMessage(content=system_instructions),
+            HumanMessage(content="Escreva a seção do relatório com base nas seções fornecidas."),
+        ]
+    )
+    return {"completed_sections": [section.model_copy(update={"content": section_content.content})]}
+
+
+def compile_final_report(state: ReportState):
+    """Assemble the completed sections in the order of the plan."""
+    completed_sections = {s.name: s.content for s in state["completed_sections"]}
+    sections = [
+        section.model_copy(update={"content": completed_sections[section.name]})
+        for section in state["sections"]
+        if section.name in completed_sections
+    ]
+    return {"final_report": "\n\n".join(s.content for s in sections), "sections": sections}
+
+
+## Graphs
+def build_section_builder() -> StateGraph:
+    """Build the search/write/grade pipeline run for each research section."""
+    section_builder = StateGraph(SectionState, output=SectionOutputState)
+    section_builder.add_node("generate_queries", generate_queries)
+    section_builder.add_node("search_web", search_web)
+    section_builder.add_node("write_section", write_section)
+
+    section_builder.add_conditional_edges(START, route_section_start, ["generate_queries", "search_web"])
+    section_builder.add_edge("generate_queries", "search_web")
+    section_builder.add_edge("search_web", "write_section")
+    return section_builder
+
+
+def build_builder() -> StateGraph:
+    """Build the workflow around the compiled section pipeline."""
+    builder = StateGraph(
+        ReportState,
+        input=ReportStateInput,
+        output=ReportStateOutput,
+        config_schema=Configuration,
+    )
+    builder.add_node("generate_report_plan", generate_report_plan)
+    builder.add_node("human_feedback", human_feedback)
+    builder.add_node("generate_section_queries", generate_section_queries)
+    builder.add_node("build_section_with_web_research", _build("section_graph"))
+    builder.add_node("gather_completed_sections", gather_completed_sections)
+    builder.add_node("write_final_sections", write_final_sections)
+    builder.add_node("compile_final_report", compile_final_report)
+
+    builder.add_edge(START, "generate_report_plan")
+    builder.add_edge("generate_report_plan", "human_feedback")
+    builder.add_edge("build_section_with_web_research", "gather_completed_sections")
+    builder.add_conditional_edges(
+        "gather_completed_sections",
+        initiate_final_section_writing,
+        ["write_final_sections", "compile_final_report"],
+    )
+    builder.add_edge("write_final_sections", "compile_final_report")
+    builder.add_edge("compile_final_report", END)
+    return builder
+
+
+_LAZY_GRAPH_FACTORIES = {
+    "section_builder": build_section_builder,
+    "section_graph": lambda: _build("section_builder").compile(),
+    "builder": build_builder,
+    "graph": lambda: _build("builder").compile(),
+}
+
+
+@lru_cache(maxsize=None)
+def _build(name: str):
+    return _LAZY_GRAPH_FACTORIES[name]()
+
+
+def __getattr__(name: str):
+    """Build and compile the graphs on first attribute access (PEP 562).
+
+    Keeps ``import open_deep_research.graph`` cheap for workers that never touch the
+    graph, while ``langgraph.json`` and ``from ... import builder`` still work.
+    """
+    if name in _LAZY_GRAPH_FACTORIES:
+        return _build(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
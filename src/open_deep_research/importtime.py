@@ -0,0 +1,197 @@
+"""Import-time profiling harness for the graph and app entry points.
+
+Runs a module import in a fresh interpreter with ``python -X importtime`` and
+turns the raw stderr trace into a readable cold-start report. Usage::
+
+    python -m open_deep_research.importtime open_deep_research.multi_agent --touch graph --budget-ms 1500
+
+The process exits with status 1 when the measured cold start exceeds the budget,
+so the harness can gate CI or container images.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+IMPORTTIME_PREFIX = "import time:"
+
+
+@dataclass
+class ImportRecord:
+    """A single line of ``-X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    """Parsed import-time trace for one cold start."""
+
+    target: str
+    records: List[ImportRecord] = field(default_factory=list)
+    touch_ms: Optional[float] = None  # Wall time of the optional attribute access (e.g. graph compile)
+
+    @property
+    def total_import_ms(self) -> float:
+        """Sum of the cumulative time of every top-level import."""
+        return sum(r.cumulative_us for r in self.records if r.depth == 0) / 1000
+
+    @property
+    def total_ms(self) -> float:
+        """Import time plus the time spent in the touched attribute."""
+        return self.total_import_ms + (self.touch_ms or 0.0)
+
+    def slowest(self, limit: int = 20) -> List[ImportRecord]:
+        """Return the imports with the highest cumulative time."""
+        return sorted(self.records, key=lambda r: r.cumulative_us, reverse=True)[:limit]
+
+    def by_package(self, limit: int = 20) -> List[tuple]:
+        """Aggregate self time per top-level package (e.g. ``langchain_core``)."""
+        totals: Dict[str, int] = {}
+        for record in self.records:
+            package = record.module.split(".")[0]
+            totals[package] = totals.get(package, 0) + record.self_us
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def to_dict(self, limit: int = 20) -> dict:
+        """Serialize the report summary for JSON output."""
+        return {
+            "target": self.target,
+            "total_import_ms": round(self.total_import_ms, 2),
+            "touch_ms": None if self.touch_ms is None else round(self.touch_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+            "modules_imported": len(self.records),
+            "slowest": [
+                {"module": r.module, "self_ms": r.self_us / 1000, "cumulative_ms": r.cumulative_us / 1000}
+                for r in self.slowest(limit)
+            ],
+            "by_package": [{"package": p, "self_ms": us / 1000} for p, us in self.by_package(limit)],
+        }
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse the stderr produced by ``python -X importtime``.
+
+    Args:
+        stderr: Raw stderr of the profiled interpreter.
+
+    Returns:
+        List[ImportRecord]: One record per imported module, in trace order.
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        parts = line[len(IMPORTTIME_PREFIX):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        # Skip the header row ("self [us] | cumulative | imported package")
+        if not self_us.strip().isdigit():
+            continue
+        # Nested imports are indented by two spaces per level after the leading separator space
+        indent = len(name) - len(name.lstrip(" "))
+        records.append(
+            ImportRecord(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=max(0, (indent - 1) // 2),
+            )
+        )
+    return records
+
+
+def profile_import(target: str, touch: Optional[str] = None, python: str = sys.executable) -> ImportReport:
+    """Import ``target`` in a fresh interpreter and collect its import-time trace.
+
+    Args:
+        target: Dotted module path to import.
+        touch: Optional module attribute to access after import (e.g. ``graph`` to
+            include lazy graph compilation in the measurement).
+        python: Interpreter used for the cold start.
+
+    Returns:
+        ImportReport: The parsed trace.
+    """
+    code = f"import {target}"
+    if touch:
+        code += (
+            "\nimport time, sys"
+            "\n_start = time.perf_counter()"
+            f"\ngetattr(sys.modules[{target!r}], {touch!r})"
+            "\nprint((time.perf_counter() - _start) * 1000)"
+        )
+    env = dict(os.environ)
+    # Profile a true cold start: no cached bytecode writes and no user site noise
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        # Surface the real import error instead of an empty report
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith(IMPORTTIME_PREFIX)]
+        raise RuntimeError(f"Importing '{target}' failed:\n" + "\n".join(errors))
+
+    report = ImportReport(target=target, records=parse_importtime(proc.stderr))
+    if touch and proc.stdout.strip():
+        report.touch_ms = float(proc.stdout.strip().splitlines()[-1])
+    return report
+
+
+def format_report(report: ImportReport, limit: int = 20) -> str:
+    """Render a report as a plain-text table."""
+    lines = [
+        f"Cold start for '{report.target}': {report.total_ms:.1f} ms "
+        f"({len(report.records)} modules, imports {report.total_import_ms:.1f} ms"
+        + (f", touch {report.touch_ms:.1f} ms)" if report.touch_ms is not None else ")"),
+        "",
+        f"{'cumulative ms':>14} {'self ms':>10}  module",
+    ]
+    for record in report.slowest(limit):
+        lines.append(f"{record.cumulative_us / 1000:>14.1f} {record.self_us / 1000:>10.1f}  {record.module}")
+    lines += ["", f"{'self ms':>14}  package"]
+    for package, self_us in report.by_package(limit):
+        lines.append(f"{self_us / 1000:>14.1f}  {package}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the cold-start import cost of a module")
+    parser.add_argument("targets", nargs="*", default=["open_deep_research.multi_agent"], help="Modules to profile")
+    parser.add_argument("--touch", help="Module attribute to access after import (e.g. 'graph')")
+    parser.add_argument("--limit", type=int, default=20, help="Number of rows per table")
+    parser.add_argument("--budget-ms", type=float, help="Fail if any target's cold start exceeds this budget")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    over_budget = False
+    reports = []
+    for target in args.targets:
+        report = profile_import(target, touch=args.touch)
+        reports.append(report)
+        if args.budget_ms is not None and report.total_ms > args.budget_ms:
+            over_budget = True
+
+    if args.json:
+        sys.stdout.write(json.dumps([r.to_dict(args.limit) for r in reports], indent=2) + "\n")
+    else:
+        for report in reports:
+            sys.stdout.write(format_report(report, args.limit) + "\n\n")
+        if args.budget_ms is not None:
+            sys.stdout.write(f"Budget {args.budget_ms:.0f} ms: {'EXCEEDED' if over_budget else 'ok'}\n")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
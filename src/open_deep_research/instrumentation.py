@@ -0,0 +1,269 @@
+"""Local latency, token and cache instrumentation for report runs.
+
+Works offline, without LangSmith. ``instrument_run`` attaches a callback handler to a
+run's config and makes a ``RunMetrics`` current for everything the run does. It
+records, per graph node, wall time and LLM input/output tokens; per search backend,
+wall time and result size; and bytes fetched plus page and LLM cache hits. Finished
+runs can be appended to a JSONL file, and process-wide totals are exposed as
+Prometheus text.
+"""
+
+import contextvars
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Finished runs are appended here when set
+METRICS_PATH = os.environ.get("ODR_METRICS_PATH")
+
+
+def _node_counters() -> Dict[str, float]:
+    return {"calls": 0, "wall_seconds": 0.0, "input_tokens": 0, "output_tokens": 0}
+
+
+def _search_counters() -> Dict[str, float]:
+    return {"calls": 0, "wall_seconds": 0.0, "output_bytes": 0}
+
+
+@dataclass
+class RunMetrics:
+    """Counters for one report run (or, for the process totals, for all runs)."""
+
+    run_id: str
+    started_at: float = field(default_factory=time.time)
+    wall_seconds: float = 0.0
+    nodes: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    search: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    fetch: Dict[str, int] = field(default_factory=lambda: {"requests": 0, "bytes": 0, "page_cache_hits": 0})
+    llm_cache: Dict[str, int] = field(default_factory=lambda: {"hits": 0, "misses": 0})
+
+    def node(self, name: str) -> Dict[str, float]:
+        """Return the counters of graph node ``name``, creating them on first use."""
+        if name not in self.nodes:
+            self.nodes[name] = _node_counters()
+        return self.nodes[name]
+
+    def backend(self, name: str) -> Dict[str, float]:
+        """Return the counters of search backend ``name``, creating them on first use."""
+        if name not in self.search:
+            self.search[name] = _search_counters()
+        return self.search[name]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the counters as plain JSON-serializable data."""
+        return asdict(self)
+
+
+_totals = RunMetrics(run_id="process")
+_current_run: contextvars.ContextVar[Optional[RunMetrics]] = contextvars.ContextVar("odr_run_metrics", default=None)
+
+
+def _targets():
+    run = _current_run.get()
+    return (_totals,) if run is None else (run, _totals)
+
+
+def record_fetch(nbytes: int, cache_hit: bool) -> None:
+    """Record one page fetch (``nbytes`` downloaded, or served from the page cache)."""
+    for metrics in _targets():
+        metrics.fetch["requests"] += 1
+        if cache_hit:
+            metrics.fetch["page_cache_hits"] += 1
+        else:
+            metrics.fetch["bytes"] += nbytes
+
+
+def record_llm_cache(hit: bool) -> None:
+    """Record one LLM response cache lookup."""
+    for metrics in _targets():
+        metrics.llm_cache["hits" if hit else "misses"] += 1
+
+
+def _usage(response) -> tuple:
+    """Return (input_tokens, output_tokens) from an ``LLMResult``."""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0)
+
+
+class InstrumentationHandler(BaseCallbackHandler):
+    """Callback handler attributing wall time and tokens to graph nodes and search tools."""
+
+    run_inline = True
+
+    def __init__(self, metrics: RunMetrics):
+        """Record into ``metrics`` and the process totals."""
+        self.metrics = metrics
+        self._nodes: Dict[Any, tuple] = {}  # run_id -> (node, start)
+        self._llm_nodes: Dict[Any, str] = {}  # run_id -> node
+        self._tools: Dict[Any, tuple] = {}  # run_id -> (tool, start)
+
+    def _apply(self, update) -> None:
+        for metrics in (self.metrics, _totals):
+            update(metrics)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        """Start timing a graph node run."""
+        node = (metadata or {}).get("langgraph_node")
+        # Only the node's own run, not the runnables nested inside it
+        if node and kwargs.get("name") == node:
+            self._nodes[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        """Add a finished node run's wall time to its node."""
+        started = self._nodes.pop(run_id, None)
+        if started is not None:
+            node, start = started
+            elapsed = time.perf_counter() - start
+
+            def update(metrics):
+                counters = metrics.node(node)
+                counters["calls"] += 1
+                counters["wall_seconds"] += elapsed
+
+            self._apply(update)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        """Count a failed node run like a finished one."""
+        self.on_chain_end(None, run_id=run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        """Remember which node a chat model call belongs to."""
+        self._llm_nodes[run_id] = (metadata or {}).get("langgraph_node", "unknown")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        """Add a model call's input and output tokens to its node."""
+        node = self._llm_nodes.pop(run_id, "unknown")
+        input_tokens, output_tokens = _usage(response)
+
+        def update(metrics):
+            counters = metrics.node(node)
+            counters["input_tokens"] += input_tokens
+            counters["output_tokens"] += output_tokens
+
+        self._apply(update)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        """Forget a failed model call."""
+        self._llm_nodes.pop(run_id, None)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        """Start timing a search tool call."""
+        name = kwargs.get("name") or (serialized or {}).get("name", "")
+        if name.endswith("_search"):
+            self._tools[run_id] = (name, time.perf_counter())
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        """Add a search call's wall time and output size to its backend."""
+        started = self._tools.pop(run_id, None)
+        if started is None:
+            return
+        backend, start = started
+        elapsed = time.perf_counter() - start
+        output_bytes = len(str(getattr(output, "content", output)).encode("utf-8"))
+
+        def update(metrics):
+            counters = metrics.backend(backend)
+            counters["calls"] += 1
+            counters["wall_seconds"] += elapsed
+            counters["output_bytes"] += output_bytes
+
+        self._apply(update)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        """Forget a failed search call."""
+        self._tools.pop(run_id, None)
+
+
+@contextmanager
+def instrument_run(config: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None):
+    """Instrument one graph run.
+
+    Args:
+        config: The run's config; a copy with the instrumentation handler added is yielded.
+        run_id: Identifier for the run (defaults to the ``thread_id`` or a random id).
+
+    Yields:
+        tuple: ``(config, metrics)``. Pass ``config`` to ``ainvoke``/``astream`` inside
+        the block. On exit, ``metrics`` is complete and, when ``ODR_METRICS_PATH`` is
+        set, appended to that file.
+    """
+    config = dict(config or {})
+    run_id = run_id or (config.get("configurable") or {}).get("thread_id") or uuid.uuid4().hex
+    metrics = RunMetrics(run_id=str(run_id))
+    config["callbacks"] = list(config.get("callbacks") or []) + [InstrumentationHandler(metrics)]
+
+    token = _current_run.set(metrics)
+    start = time.perf_counter()
+    try:
+        yield config, metrics
+    finally:
+        metrics.wall_seconds = time.perf_counter() - start
+        _current_run.reset(token)
+        if METRICS_PATH:
+            write_jsonl(metrics, METRICS_PATH)
+
+
+def write_jsonl(metrics: RunMetrics, path: str) -> None:
+    """Append ``metrics`` as one JSON line to ``path``."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(metrics.to_dict(), ensure_ascii=False) + "\n")
+
+
+def process_totals() -> RunMetrics:
+    """Return the counters accumulated over every run in this process."""
+    return _totals
+
+
+def prometheus_text(metrics: Optional[RunMetrics] = None) -> str:
+    """Render counters in the Prometheus text exposition format.
+
+    Args:
+        metrics: Counters to render; defaults to the process totals.
+
+    Returns:
+        str: The exposition text.
+    """
+    metrics = metrics or _totals
+    lines = []
+
+    def counter(name: str, help_text: str, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    nodes = sorted(metrics.nodes.items())
+    counter("odr_node_calls_total", "Graph node executions.", [({"node": n}, c["calls"]) for n, c in nodes])
+    counter("odr_node_seconds_total", "Wall time spent in graph nodes.", [({"node": n}, round(c["wall_seconds"], 6)) for n, c in nodes])
+    counter(
+        "odr_llm_tokens_total",
+        "LLM tokens by node and direction.",
+        [({"node": n, "direction": "input"}, c["input_tokens"]) for n, c in nodes]
+        + [({"node": n, "direction": "output"}, c["output_tokens"]) for n, c in nodes],
+    )
+    backends = sorted(metrics.search.items())
+    counter("odr_search_calls_total", "Search tool calls by backend.", [({"backend": b}, c["calls"]) for b, c in backends])
+    counter("odr_search_seconds_total", "Wall time of search tool calls by backend.", [({"backend": b}, round(c["wall_seconds"], 6)) for b, c in backends])
+    counter("odr_search_output_bytes_total", "Size of search tool outputs by backend.", [({"backend": b}, c["output_bytes"]) for b, c in backends])
+    counter("odr_fetch_requests_total", "Page fetches, including cache hits.", [({}, metrics.fetch["requests"])])
+    counter("odr_fetch_bytes_total", "Bytes downloaded by page fetches.", [({}, metrics.fetch["bytes"])])
+    counter(
+        "odr_cache_hits_total",
+        "Cache hits by cache.",
+        [({"cache": "page"}, metrics.fetch["page_cache_hits"]), ({"cache": "llm"}, metrics.llm_cache["hits"])],
+    )
+    counter("odr_llm_cache_misses_total", "LLM response cache misses.", [({}, metrics.llm_cache["misses"])])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,283 @@
+"""Background report jobs for the Streamlit app.
+
+Running a report inside the Streamlit script thread blocks that thread for the whole
+multi-minute run, and a rerun of the script (any widget interaction, a page reload)
+can kill it. The app instead submits jobs to a process-wide ``JobManager``: a pool of
+asyncio workers running on one long-lived event loop in a background thread, so all
+runs share the per-loop model clients, section scheduler and prefetches.
+
+Jobs are recorded in a local SQLite database. Their status, completed sections and
+final result are persisted as the run progresses, so sessions poll the job by id and
+survive reruns. Every job is a durable run checkpointed under its own ``thread_id``:
+a failed job can be retried, and jobs left unfinished by a previous server process are
+resumed from their last checkpoint when the manager starts.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from open_deep_research.blobstore import CACHE_DIR
+
+JOBS_PATH = os.environ.get("ODR_JOBS_PATH", os.path.join(CACHE_DIR, "jobs.sqlite"))
+JOB_WORKERS = int(os.environ.get("ODR_JOB_WORKERS", "4"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_JSON_COLUMNS = ("input", "config", "metadata", "sections", "result")
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore:
+    """SQLite-backed job records.
+
+    Args:
+        path: SQLite database file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                input TEXT,
+                config TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                sections TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )"""
+        )
+        self._conn.commit()
+
+    def create(self, job_id: str, graph_input: Any, config: Dict[str, Any], metadata: Dict[str, Any]) -> None:
+        """Record a new queued job."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, input, config, metadata, sections, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    QUEUED,
+                    json.dumps(graph_input, ensure_ascii=False, default=str),
+                    json.dumps(config, ensure_ascii=False, default=str),
+                    json.dumps(metadata, ensure_ascii=False, default=str),
+                    "[]",
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+    def update(self, job_id: str, **values: Any) -> None:
+        """Set columns of a job; ``result`` is stored as JSON."""
+        if "result" in values and values["result"] is not None:
+            values["result"] = json.dumps(values["result"], ensure_ascii=False, default=str)
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*values.values(), job_id))
+            self._conn.commit()
+
+    def add_section(self, job_id: str, section: Dict[str, str]) -> None:
+        """Append a completed body section to a job."""
+        with self._lock:
+            row = self._conn.execute("SELECT sections FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            sections = json.loads(row["sections"])
+            if section not in sections:
+                sections.append(section)
+            self._conn.execute(
+                "UPDATE jobs SET sections = ? WHERE id = ?",
+                (json.dumps(sections, ensure_ascii=False), job_id),
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job record, with its JSON columns decoded, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        for column in _JSON_COLUMNS:
+            if job[column] is not None:
+                job[column] = json.loads(job[column])
+        return job
+
+    def unfinished(self) -> List[str]:
+        """Return the ids of queued or running jobs, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (QUEUED, RUNNING),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+
+def _serialize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the JSON-serializable part of a graph output."""
+    messages = []
+    for message in result.get("messages") or []:
+        if isinstance(message, dict):
+            messages.append({"role": message.get("role"), "content": message.get("content")})
+        else:
+            messages.append({"role": getattr(message, "type", None), "content": getattr(message, "content", None)})
+    return {"final_report": result.get("final_report"), "messages": messages}
+
+
+class JobManager:
+    """Runs report jobs on a pool of asyncio workers in a background event loop thread.
+
+    Args:
+        store: Where jobs are recorded.
+        workers: Number of reports generated concurrently.
+    """
+
+    def __init__(self, store: JobStore, workers: int = JOB_WORKERS):
+        self.store = store
+        self.workers = max(1, int(workers))
+        self._loop = asyncio.new_event_loop()
+        self._queue: Optional[asyncio.Queue] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="report-jobs", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._workers = [self._loop.create_task(self._worker()) for _ in range(self.workers)]
+        # Jobs left unfinished by a previous server process resume from their checkpoints
+        for job_id in self.store.unfinished():
+            self._queue.put_nowait(job_id)
+        self._ready.set()
+        self._loop.run_forever()
+
+    def _enqueue(self, job_id: str) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job_id)
+
+    def submit(
+        self,
+        graph_input: Dict[str, Any],
+        config: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Queue a report and return its job id.
+
+        Args:
+            graph_input: Graph input, e.g. ``{"messages": [...]}``; must be JSON-serializable.
+            config: Optional runnable config (``configurable`` settings).
+            metadata: Caller data kept with the job (e.g. what the form displayed).
+
+        Raises:
+            ValueError: If the configuration is invalid; nothing is queued.
+        """
+        from open_deep_research.configuration import Configuration
+
+        job_id = uuid.uuid4().hex
+        config = dict(config or {})
+        config["configurable"] = {**(config.get("configurable") or {}), "thread_id": f"job-{job_id}"}
+        Configuration.from_runnable_config(config)
+        self.store.create(job_id, graph_input, config, metadata or {})
+        self._enqueue(job_id)
+        return job_id
+
+    def retry(self, job_id: str) -> bool:
+        """Queue a failed job again; it resumes from its last checkpoint.
+
+        Returns:
+            bool: Whether the job was failed and has been queued.
+        """
+        job = self.store.get(job_id)
+        if job is None or job["status"] != FAILED:
+            return False
+        self.store.update(job_id, status=QUEUED, error=None, finished_at=None)
+        self._enqueue(job_id)
+        return True
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job record, or None for an unknown id.
+
+        The record holds ``status``, the ``sections`` completed so far, ``result`` once
+        done, ``error`` if failed, plus its ``metadata`` and timestamps.
+        """
+        return self.store.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the worker count, queue depth and number of jobs per status."""
+        return {"workers": self.workers, "queued": self._queue.qsize(), "jobs": self.store.counts()}
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                logger.exception("Error running job %s", job_id)
+                self.store.update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str) -> None:
+        from open_deep_research.runs import resume_report, run_status, stream_report
+
+        job = self.store.get(job_id)
+        if job is None or job["status"] not in (QUEUED, RUNNING):
+            return
+        config = job["config"]
+        thread_id = config["configurable"]["thread_id"]
+        self.store.update(job_id, status=RUNNING, started_at=time.time())
+
+        # A job with a checkpoint was interrupted or retried: don't redo its finished sections
+        if (await run_status(thread_id))["exists"]:
+            events = resume_report(thread_id, config)
+        else:
+            events = stream_report(job["input"], config)
+
+        result: Dict[str, Any] = {}
+        async for event in events:
+            if event["type"] == "section":
+                section = event["section"]
+                self.store.add_section(job_id, {"name": section.name, "content": section.content})
+            elif event["type"] == "done":
+                result = event["result"]
+
+        if not result.get("final_report"):
+            raise RuntimeError("the run finished without a final report")
+        self.store.update(job_id, status=DONE, result=_serialize_result(result), finished_at=time.time())
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager, starting its workers on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(JobStore(JOBS_PATH))
+    return _manager
@@ -0,0 +1,154 @@
+"""Exact-match cache of chat model responses.
+
+Responses are keyed on the model name, the JSON schemas of the bound tools and a
+normalized form of the full message list, and stored in SQLite. Re-running a report
+after a downstream failure (PDF rendering, UI), tests and repeated identical requests
+then replay the model's answers instead of paying for them again.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from open_deep_research.blobstore import CACHE_DIR
+from open_deep_research.instrumentation import record_llm_cache
+from open_deep_research.models import timed_ainvoke
+
+# Message fields that differ between otherwise identical conversations (random ids,
+# provider metadata, token usage) and must not be part of the cache key
+_VOLATILE_MESSAGE_FIELDS = ("id", "tool_call_id", "additional_kwargs", "response_metadata", "usage_metadata")
+
+
+def _normalize_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    data = {k: v for k, v in message["data"].items() if k not in _VOLATILE_MESSAGE_FIELDS}
+    if data.get("tool_calls"):
+        data["tool_calls"] = [{"name": c["name"], "args": c["args"]} for c in data["tool_calls"]]
+    data.pop("invalid_tool_calls", None)
+    return {"type": message["type"], "data": data}
+
+
+def cache_key(model: str, tools: Sequence[Any], messages: Sequence[Any]) -> str:
+    """Return the cache key for a model call.
+
+    Args:
+        model: Model identifier (e.g. ``openai:gpt-4.1-mini``).
+        tools: Tools bound to the model.
+        messages: Prompt messages, as dicts or ``BaseMessage`` objects.
+
+    Returns:
+        str: SHA-256 hex digest of the normalized call.
+    """
+    from langchain_core.messages import convert_to_messages, messages_to_dict
+    from langchain_core.utils.function_calling import convert_to_openai_tool
+
+    payload = {
+        "model": model,
+        "tools": [convert_to_openai_tool(t) for t in tools],
+        "messages": [_normalize_message(m) for m in messages_to_dict(convert_to_messages(messages))],
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed store of model responses.
+
+    Args:
+        path: SQLite database file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """Return the cached ``AIMessage`` for ``key``, or None."""
+        from langchain_core.messages import messages_from_dict
+
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM llm_responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        message = messages_from_dict([json.loads(row[0])])[0]
+        # A replayed message must not reuse the original id, or add_messages would
+        # replace the earlier copy in the conversation instead of appending
+        message.id = None
+        return message
+
+    def put(self, key: str, model: str, message) -> None:
+        """Store a model response."""
+        from langchain_core.messages import messages_to_dict
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?)",
+                (key, model, json.dumps(messages_to_dict([message])[0], default=str), time.time()),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counts and the hit rate for this process."""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+_caches: Dict[str, LLMCache] = {}
+
+
+def get_llm_cache(path: Optional[str] = None) -> LLMCache:
+    """Return the process-wide cache for ``path`` (default under ``ODR_CACHE_DIR``)."""
+    path = path or os.path.join(CACHE_DIR, "llm_cache.sqlite")
+    if path not in _caches:
+        _caches[path] = LLMCache(path)
+    return _caches[path]
+
+
+async def cached_ainvoke(llm, messages: List[Any], *, model: str, tools: Sequence[Any], cache: Optional[LLMCache]):
+    """Invoke ``llm`` on ``messages``, serving and storing the response through ``cache``.
+
+    Args:
+        llm: The chat model, with ``tools`` already bound.
+        messages: The full prompt.
+        model: Model identifier, part of the cache key.
+        tools: The bound tools, part of the cache key.
+        cache: The cache to use, or None to call the model directly.
+
+    Returns:
+        AIMessage: The (possibly replayed) model response.
+    """
+    if cache is None:
+        return await timed_ainvoke(llm, messages, model)
+
+    key = cache_key(model, tools, messages)
+    cached = cache.get(key)
+    record_llm_cache(hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    response = await timed_ainvoke(llm, messages, model)
+    cache.put(key, model, response)
+    return response
+
+
+def llm_cache_from_config(configurable) -> Optional[LLMCache]:
+    """Return the cache selected by a ``Configuration``, or None when caching is off."""
+    return get_llm_cache(configurable.llm_cache_path) if configurable.llm_cache else None
@@ -0,0 +1,130 @@
+"""Registry of chat model clients shared across graph invocations.
+
+``init_chat_model`` builds a new provider client (and HTTP connection pool) every
+time it is called. The registry creates each chat model, and each tool binding of
+it, once per event loop and hands the same objects to every node execution, so
+connections stay warm across agent loop iterations, sections and reports.
+
+Provider clients hold loop-bound async HTTP clients, so there is one registry per
+live event loop; long-lived loops (workers, servers) share clients across all runs.
+
+The shared runnables carry no callbacks of their own: each call inherits the callbacks
+of the graph run that makes it (tracing, instrumentation). Call latency is recorded by
+``timed_ainvoke`` around the call instead.
+"""
+
+import asyncio
+import json
+import time
+import weakref
+from typing import Any, Dict, Optional, Sequence
+
+
+def _kwargs_key(kwargs: Dict[str, Any]) -> str:
+    return json.dumps(kwargs, sort_keys=True, default=str)
+
+
+class ModelRegistry:
+    """Create-once cache of chat models and their tool bindings."""
+
+    def __init__(self):
+        self._models: Dict[tuple, Any] = {}
+        self._bound: Dict[tuple, Any] = {}
+        self.created = 0
+        self.reused = 0
+        self._latency: Dict[str, Dict[str, float]] = {}
+
+    def _raw_model(self, model: str, kwargs: Dict[str, Any]):
+        key = (model, _kwargs_key(kwargs))
+        llm = self._models.get(key)
+        if llm is None:
+            from langchain.chat_models import init_chat_model
+
+            llm = self._models[key] = init_chat_model(model=model, **kwargs)
+            self.created += 1
+        return llm
+
+    def get_model(self, model: str, **kwargs):
+        """Return the shared chat model for ``model`` and ``kwargs``, creating it on first use."""
+        key = (model, _kwargs_key(kwargs), None)
+        llm = self._bound.get(key)
+        if llm is None:
+            llm = self._bound[key] = self._raw_model(model, kwargs)
+        else:
+            self.reused += 1
+        return llm
+
+    def get_bound(self, model: str, tools: Sequence[Any], tool_choice: Optional[str] = None, **kwargs):
+        """Return the shared ``model`` with ``tools`` bound.
+
+        Tool lists are identified by object identity, which is stable because the
+        tools are module-level objects. ``tool_choice`` forces a specific tool.
+        """
+        key = (model, _kwargs_key(kwargs), tuple(id(t) for t in tools), tool_choice)
+        bound = self._bound.get(key)
+        if bound is None:
+            bind_kwargs = {"tool_choice": tool_choice} if tool_choice else {}
+            bound = self._bound[key] = self._raw_model(model, kwargs).bind_tools(list(tools), **bind_kwargs)
+        else:
+            self.reused += 1
+        return bound
+
+    def record_latency(self, model: str, seconds: float) -> None:
+        """Record the wall time of one model call."""
+        stats = self._latency.setdefault(model, {"calls": 0, "first_call_s": seconds, "warm_total_s": 0.0})
+        stats["calls"] += 1
+        if stats["calls"] > 1:
+            stats["warm_total_s"] += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """Return client reuse counts and per-model call latency.
+
+        ``first_call_s`` includes client and connection setup; ``mean_warm_call_s``
+        averages the calls that reused the pooled connection.
+        """
+        latency = {}
+        for model, stats in self._latency.items():
+            warm_calls = stats["calls"] - 1
+            latency[model] = {
+                "calls": stats["calls"],
+                "first_call_s": round(stats["first_call_s"], 3),
+                "mean_warm_call_s": round(stats["warm_total_s"] / warm_calls, 3) if warm_calls else None,
+            }
+        return {"clients_created": self.created, "reused": self.reused, "latency": latency}
+
+
+_registries: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ModelRegistry]" = weakref.WeakKeyDictionary()
+_fallback_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the registry for the running event loop (or a process-wide one outside a loop)."""
+    global _fallback_registry
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        if _fallback_registry is None:
+            _fallback_registry = ModelRegistry()
+        return _fallback_registry
+    registry = _registries.get(loop)
+    if registry is None:
+        registry = _registries[loop] = ModelRegistry()
+    return registry
+
+
+def get_chat_model(model: str, **kwargs):
+    """Return the shared chat model for ``model``."""
+    return get_model_registry().get_model(model, **kwargs)
+
+
+def get_bound_model(model: str, tools: Sequence[Any], tool_choice: Optional[str] = None, **kwargs):
+    """Return the shared chat model for ``model`` with ``tools`` bound."""
+    return get_model_registry().get_bound(model, tools, tool_choice=tool_choice, **kwargs)
+
+
+async def timed_ainvoke(llm, messages, model: str):
+    """Invoke ``llm`` on ``messages`` and record the call's wall time under ``model``."""
+    start = time.perf_counter()
+    response = await llm.ainvoke(messages)
+    get_model_registry().record_latency(model, time.perf_counter() - start)
+    return response
@@ -1,9 +1,13 @@
+import asyncio
+import logging
+import time
+import uuid
+from functools import lru_cache
 from typing import List, Annotated, TypedDict, operator, Literal
 from pydantic import BaseModel, Field
 
-from langchain.chat_models import init_chat_model
-
 # from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.tools import tool
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import MessagesState
@@ -11,9 +15,33 @@ from langgraph.graph import MessagesState
 from langgraph.types import Command, Send
 from langgraph.graph import START, END, StateGraph
 
+from open_deep_research.budgets import budget_exceeded, report_usage, reset_report_usage
+from open_deep_research.compaction import compact_messages, estimate_tokens
+from open_deep_research.digests import section_digest
 from open_deep_research.configuration import Configuration
+from open_deep_research.llm_cache import cached_ainvoke, llm_cache_from_config
+from open_deep_research.models import get_bound_model, get_chat_model
 from open_deep_research.utils import get_config_value, tavily_search, duckduckgo_search
-from open_deep_research.prompts import SUPERVISOR_INSTRUCTIONS, RESEARCH_INSTRUCTIONS
+from open_deep_research.tool_outputs import materialize_messages, store_tool_output
+from open_deep_research.section_scheduler import get_section_scheduler
+from open_deep_research.section_store import match_template, section_store_from_config
+from open_deep_research.prefetch import get_prefetched, start_prefetch
+from open_deep_research.residency_data import residency_data
+from open_deep_research.prompts import (
+    SUPERVISOR_INSTRUCTIONS,
+    RESEARCH_INSTRUCTIONS,
+    SECTION_PERSONALIZATION_INSTRUCTIONS,
+    SECTION_NEUTRALIZATION_INSTRUCTIONS,
+    FINAL_REPORT_INSTRUCTIONS,
+    FINAL_INTRODUCTION_INSTRUCTIONS,
+    FINAL_CONCLUSION_INSTRUCTIONS,
+    BUDGET_EXHAUSTED_INSTRUCTIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sections being neutralized and stored in the background, referenced until they finish
+_section_store_tasks: set = set()
 
 
 ## Tools factory - will be initialized based on configuration
@@ -38,8 +66,9 @@ def get_search_tool(config: RunnableConfig):
         )
 
 
-@tool
 class Section(BaseModel):
+    """Write a section of the report."""
+
     name: str = Field(
         description="Name for this section of the report.",
     )
@@ -49,15 +78,17 @@ class Section(BaseModel):
     content: str = Field(description="The content of the section.")
 
 
-@tool
 class Sections(BaseModel):
+    """List the sections of the report."""
+
     sections: List[str] = Field(
         description="Sections of the report.",
     )
 
 
-@tool
 class Introduction(BaseModel):
+    """Write the introduction of the report."""
+
     name: str = Field(
         description="Name for the report.",
     )
@@ -66,8 +97,9 @@ class Introduction(BaseModel):
     )
 
 
-@tool
 class Conclusion(BaseModel):
+    """Write the conclusion of the report."""
+
     name: str = Field(
         description="Name for the conclusion of the report.",
     )
@@ -76,6 +108,15 @@ class Conclusion(BaseModel):
     )
 
 
+# The tools return instances of the models above. State and checkpoints hold those
+# instances, and checkpoints rebuild them from their class, so the module-level names
+# must stay the plain models rather than the tools wrapping them.
+section_tool = tool(Section)
+sections_tool = tool(Sections)
+introduction_tool = tool(Introduction)
+conclusion_tool = tool(Conclusion)
+
+
 ## State
 class ReportStateOutput(TypedDict):
     final_report: str  # Final report
@@ -84,35 +125,118 @@ class ReportStateOutput(TypedDict):
 class ReportState(MessagesState):
     sections: list[str]  # List of report sections
     completed_sections: Annotated[list, operator.add]  # Send() API key
+    section_digests: Annotated[list, operator.add]  # Compact digests of completed_sections, for finalization
     final_report: str  # Final report
 
 
 class SectionState(MessagesState):
     section: str  # Report section
+    report_id: str  # Report the section belongs to, for report budgets
+    started_at: float  # When the section's research started
+    tool_calls: int  # Search calls made so far
+    prompt_tokens: int  # Prompt tokens sent to the research agent so far
     completed_sections: list[
         Section
     ]  # Final key we duplicate in outer state for Send() API
 
 
+class SectionTask(TypedDict):
+    section: str  # Report section
+    priority: int  # Lower values are researched first
+    report_id: str  # Report the section belongs to, for per-report concurrency caps
+    context: str  # The student's request, used to personalize sections reused from the section store
+
+
 class SectionOutputState(TypedDict):
     completed_sections: list[
         Section
     ]  # Final key we duplicate in outer state for Send() API
 
 
-# Tool lists will be built dynamically based on configuration
+# Tool lists will be built dynamically based on configuration. Bundles are cached per
+# search API so every node call gets the same list (and model registry binding).
+@lru_cache(maxsize=None)
+def _tool_bundle(search_api: str, kind: str):
+    search_tool = get_search_tool({"configurable": {"search_api": search_api}})
+    if kind == "supervisor":
+        tool_list = [search_tool, residency_data, sections_tool]
+    else:
+        tool_list = [search_tool, residency_data, section_tool]
+    return tool_list, {tool.name: tool for tool in tool_list}
+
+
 def get_supervisor_tools(config: RunnableConfig):
     """Get supervisor tools based on configuration"""
-    search_tool = get_search_tool(config)
-    tool_list = [search_tool, Sections, Introduction, Conclusion]
-    return tool_list, {tool.name: tool for tool in tool_list}
+    configurable = Configuration.from_runnable_config(config)
+    return _tool_bundle(get_config_value(configurable.search_api), "supervisor")
 
 
 def get_research_tools(config: RunnableConfig):
     """Get research tools based on configuration"""
+    configurable = Configuration.from_runnable_config(config)
+    return _tool_bundle(get_config_value(configurable.search_api), "research")
+
+
+async def _invoke_tool(tool, args):
+    # Perform the tool call - use ainvoke for async tools
+    if hasattr(tool, "ainvoke"):
+        return await tool.ainvoke(args)
+    return tool.invoke(args)
+
+
+async def execute_tool_calls(tool_calls, tools_by_name, max_concurrency: int = 4) -> list:
+    """Run the tool calls of one model turn concurrently.
+
+    Args:
+        tool_calls: The ``tool_calls`` of the last AI message.
+        tools_by_name: Mapping from tool name to tool.
+        max_concurrency: Maximum number of tool calls in flight at once.
+
+    Returns:
+        list: Observations in the same order as ``tool_calls``, so tool messages keep the
+        order of their ``tool_call_id``s.
+    """
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+    async def run(tool_call):
+        async with semaphore:
+            return await _invoke_tool(tools_by_name[tool_call["name"]], tool_call["args"])
+
+    return await asyncio.gather(*(run(tool_call) for tool_call in tool_calls))
+
+
+def prefetch_enabled(configurable: Configuration) -> bool:
+    """Whether standard searches should be prefetched for this report"""
+    return bool(configurable.speculative_prefetch and configurable.specialty and configurable.residency_state)
+
+
+async def prefetched_history(template: str, configurable: Configuration, config: RunnableConfig) -> list:
+    """Return a search call and its prefetched result to seed a standard section's history"""
     search_tool = get_search_tool(config)
-    tool_list = [search_tool, Section]
-    return tool_list, {tool.name: tool for tool in tool_list}
+    prefetched = await get_prefetched(
+        configurable.specialty, configurable.residency_state, template, search_tool
+    )
+    if prefetched is None:
+        return []
+    query, result = prefetched
+    tool_call_id = f"prefetch_{template}"
+    return [
+        AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": search_tool.name,
+                    "args": {next(iter(search_tool.args)): [query]},
+                    "id": tool_call_id,
+                }
+            ],
+        ),
+        ToolMessage(
+            content=store_tool_output(result),
+            name=search_tool.name,
+            tool_call_id=tool_call_id,
+        ),
+    ]
 
 
 async def supervisor(state: ReportState, config: RunnableConfig):
@@ -125,33 +249,44 @@ async def supervisor(state: ReportState, config: RunnableConfig):
     configurable = Configuration.from_runnable_config(config)
     supervisor_model = get_config_value(configurable.supervisor_model)
 
-    # Initialize the model
-    llm = init_chat_model(model=supervisor_model)
-    # llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
-
-    # If sections have been completed, but we don't yet have the final report, then we need to initiate writing the introduction and conclusion
-    if state.get("completed_sections") and not state.get("final_report"):
-        research_complete_message = {
-            "role": "user",
-            "content": "Research is complete. Now write the introduction and conclusion for the report. Here are the completed main body sections: \n\n"
-            + "\n\n".join([s.content for s in state["completed_sections"]]),
-        }
-        messages = messages + [research_complete_message]
-
     # Get tools based on configuration
     supervisor_tool_list, _ = get_supervisor_tools(config)
 
-    # Invoke
+    # New user input on the thread (the first request, or a follow-up after a finished report)
+    # starts a new run: its report budgets must not inherit the previous run's usage
+    thread_id = config.get("configurable", {}).get("thread_id")
+    if thread_id and messages and messages[-1].type == "human":
+        reset_report_usage(str(thread_id))
+
+    # On the first turn, start the standard sections' searches while the supervisor plans
+    if len(messages) == 1 and prefetch_enabled(configurable):
+        store = section_store_from_config(configurable)
+        start_prefetch(
+            configurable.specialty,
+            configurable.residency_state,
+            get_search_tool(config),
+            skip=store.fresh_templates(configurable.specialty, configurable.residency_state) if store else (),
+        )
+
+    # Shared model client with the tools bound, created once per event loop
+    llm = get_bound_model(supervisor_model, supervisor_tool_list)
+    # llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
+
+    # Invoke (replayed from the LLM cache when enabled and the call is identical)
     return {
         "messages": [
-            await llm.bind_tools(supervisor_tool_list).ainvoke(
+            await cached_ainvoke(
+                llm,
                 [
                     {
                         "role": "system",
                         "content": SUPERVISOR_INSTRUCTIONS,
                     }
                 ]
-                + messages
+                + materialize_messages(messages),
+                model=supervisor_model,
+                tools=supervisor_tool_list,
+                cache=llm_cache_from_config(configurable),
             )
         ]
     }
@@ -164,27 +299,24 @@ async def supervisor_tools(
 
     result = []
     sections_list = []
-    intro_content = None
-    conclusion_content = None
 
     # Get tools based on configuration
+    configurable = Configuration.from_runnable_config(config)
     _, supervisor_tools_by_name = get_supervisor_tools(config)
 
-    # First process all tool calls to ensure we respond to each one (required for OpenAI)
-    for tool_call in state["messages"][-1].tool_calls:
-        # Get the tool
-        tool = supervisor_tools_by_name[tool_call["name"]]
-        # Perform the tool call - use ainvoke for async tools
-        if hasattr(tool, "ainvoke"):
-            observation = await tool.ainvoke(tool_call["args"])
-        else:
-            observation = tool.invoke(tool_call["args"])
-
+    # First process all tool calls to ensure we respond to each one (required for OpenAI).
+    # The calls run concurrently; observations come back in call order.
+    tool_calls = state["messages"][-1].tool_calls
+    observations = await execute_tool_calls(
+        tool_calls, supervisor_tools_by_name, configurable.max_concurrent_tool_calls
+    )
+    for tool_call, observation in zip(tool_calls, observations):
         # Append to messages
         result.append(
             {
                 "role": "tool",
-                "content": observation,
+                # Large outputs go to the blob store; the state keeps a reference
+                "content": store_tool_output(observation),
                 "name": tool_call["name"],
                 "tool_call_id": tool_call["id"],
             }
@@ -193,58 +325,28 @@ async def supervisor_tools(
         # Store special tool results for processing after all tools have been called
         if tool_call["name"] == "Sections":
             sections_list = observation.sections
-        elif tool_call["name"] == "Introduction":
-            # Format introduction with proper H1 heading if not already formatted
-            if not observation.content.startswith("# "):
-                intro_content = f"# {observation.name}\n\n{observation.content}"
-            else:
-                intro_content = observation.content
-        elif tool_call["name"] == "Conclusion":
-            # Format conclusion with proper H2 heading if not already formatted
-            if not observation.content.startswith("## "):
-                conclusion_content = f"## {observation.name}\n\n{observation.content}"
-            else:
-                conclusion_content = observation.content
 
     # After processing all tool calls, decide what to do next
     if sections_list:
         # Send the sections to the research agents
+        # Sections are queued through the section scheduler in the order the supervisor listed them
+        report_id = config.get("configurable", {}).get("thread_id") or uuid.uuid4().hex
+        context = state["messages"][0].content if state["messages"] else ""
         return Command(
-            goto=[Send("research_team", {"section": s}) for s in sections_list],
+            goto=[
+                Send(
+                    "research_team",
+                    {
+                        "section": s,
+                        "priority": i,
+                        "report_id": str(report_id),
+                        "context": context,
+                    },
+                )
+                for i, s in enumerate(sections_list)
+            ],
             update={"messages": result},
         )
-    elif intro_content:
-        # Store introduction while waiting for conclusion
-        # Append to messages to guide the LLM to write conclusion next
-        result.append(
-            {
-                "role": "user",
-                "content": "Introduction written. Now write a conclusion section.",
-            }
-        )
-        return Command(
-            goto="supervisor",
-            update={"final_report": intro_content, "messages": result},
-        )
-    elif conclusion_content:
-        # Get all sections and combine in proper order: Introduction, Body Sections, Conclusion
-        intro = state.get("final_report", "")
-        body_sections = "\n\n".join([s.content for s in state["completed_sections"]])
-
-        # Assemble final report in correct order
-        complete_report = f"{intro}\n\n{body_sections}\n\n{conclusion_content}"
-
-        # Append to messages to indicate completion
-        result.append(
-            {
-                "role": "user",
-                "content": "Report is now complete with introduction, body sections, and conclusion.",
-            }
-        )
-        return Command(
-            goto="supervisor",
-            update={"final_report": complete_report, "messages": result},
-        )
     else:
         # Default case (for search tools, etc.)
         return Command(goto="supervisor", update={"messages": result})
@@ -274,28 +376,72 @@ async def research_agent(state: SectionState, config: RunnableConfig):
     configurable = Configuration.from_runnable_config(config)
     researcher_model = get_config_value(configurable.researcher_model)
 
-    # Initialize the model
-    llm = init_chat_model(model=researcher_model)
-    # llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
-
     # Get tools based on configuration
     research_tool_list, _ = get_research_tools(config)
 
+    # Check the section and report budgets
+    report = report_usage(state["report_id"]) if state.get("report_id") else None
+    # Clocks restart with each run: a resumed section restores its checkpointed history
+    # and counters, but not the start time of the attempt that failed
+    started_at = report.section_clock(state["section"]) if report else state.get("started_at") or time.time()
+    reason = budget_exceeded(
+        started_at=started_at,
+        tool_calls=state.get("tool_calls", 0),
+        prompt_tokens=state.get("prompt_tokens", 0),
+        deadline_seconds=configurable.section_deadline_seconds,
+        max_tool_calls=configurable.section_max_tool_calls,
+        max_prompt_tokens=configurable.section_max_prompt_tokens,
+    )
+    if reason is None and report is not None:
+        reason = budget_exceeded(
+            started_at=report.started_at,
+            tool_calls=report.tool_calls,
+            prompt_tokens=report.prompt_tokens,
+            deadline_seconds=configurable.report_deadline_seconds,
+            max_tool_calls=configurable.report_max_tool_calls,
+            max_prompt_tokens=configurable.report_max_prompt_tokens,
+        )
+
+    prompt = [
+        {
+            "role": "system",
+            "content": RESEARCH_INSTRUCTIONS.format(
+                section_description=state["section"]
+            ),
+        }
+    ] + materialize_messages(state["messages"])
+
+    if reason:
+        # Budget exhausted: force the agent to write the section with what it has
+        tools = [section_tool]
+        llm = get_bound_model(researcher_model, tools, tool_choice="Section")
+        prompt.append(
+            {"role": "user", "content": BUDGET_EXHAUSTED_INSTRUCTIONS.format(reason=reason)}
+        )
+    else:
+        # Shared model client with the tools bound, created once per event loop
+        tools = research_tool_list
+        llm = get_bound_model(researcher_model, tools)
+    # llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
+
+    # Enforce tool calling to either perform more search or call the Section tool to write the section
+    response = await cached_ainvoke(
+        llm,
+        prompt,
+        model=researcher_model,
+        tools=tools,
+        cache=llm_cache_from_config(configurable),
+    )
+
+    usage = getattr(response, "usage_metadata", None) or {}
+    prompt_tokens = usage.get("input_tokens") or estimate_tokens(prompt)
+    if report is not None:
+        report.prompt_tokens += prompt_tokens
+
     return {
-        "messages": [
-            # Enforce tool calling to either perform more search or call the Section tool to write the section
-            await llm.bind_tools(research_tool_list).ainvoke(
-                [
-                    {
-                        "role": "system",
-                        "content": RESEARCH_INSTRUCTIONS.format(
-                            section_description=state["section"]
-                        ),
-                    }
-                ]
-                + state["messages"]
-            )
-        ]
+        "messages": [response],
+        "started_at": started_at,
+        "prompt_tokens": state.get("prompt_tokens", 0) + prompt_tokens,
     }
 
 
@@ -306,22 +452,21 @@ async def research_agent_tools(state: SectionState, config: RunnableConfig):
     completed_section = None
 
     # Get tools based on configuration
+    configurable = Configuration.from_runnable_config(config)
     _, research_tools_by_name = get_research_tools(config)
 
-    # Process all tool calls first (required for OpenAI)
-    for tool_call in state["messages"][-1].tool_calls:
-        # Get the tool
-        tool = research_tools_by_name[tool_call["name"]]
-        # Perform the tool call - use ainvoke for async tools
-        if hasattr(tool, "ainvoke"):
-            observation = await tool.ainvoke(tool_call["args"])
-        else:
-            observation = tool.invoke(tool_call["args"])
+    # Process all tool calls first (required for OpenAI), concurrently and in call order
+    tool_calls = state["messages"][-1].tool_calls
+    observations = await execute_tool_calls(
+        tool_calls, research_tools_by_name, configurable.max_concurrent_tool_calls
+    )
+    for tool_call, observation in zip(tool_calls, observations):
         # Append to messages
         result.append(
             {
                 "role": "tool",
-                "content": observation,
+                # Large outputs go to the blob store; the state keeps a reference
+                "content": store_tool_output(observation),
                 "name": tool_call["name"],
                 "tool_call_id": tool_call["id"],
             }
@@ -331,13 +476,42 @@ async def research_agent_tools(state: SectionState, config: RunnableConfig):
         if tool_call["name"] == "Section":
             completed_section = observation
 
+    # Count the searches against the section and report budgets
+    searches = sum(
+        1 for tool_call in tool_calls if tool_call["name"] not in ("Section", residency_data.name)
+    )
+    if state.get("report_id"):
+        report_usage(state["report_id"]).tool_calls += searches
+    update = {"messages": result, "tool_calls": state.get("tool_calls", 0) + searches}
+
     # After processing all tools, decide what to do next
     if completed_section:
         # Write the completed section to state and return to the supervisor
-        return {"messages": result, "completed_sections": [completed_section]}
-    else:
-        # Continue the research loop for search tools, etc.
-        return {"messages": result}
+        update["completed_sections"] = [completed_section]
+    # Otherwise continue the research loop for search tools, etc.
+    return update
+
+
+async def research_agent_tools_should_continue(
+    state: SectionState,
+) -> Literal["compact_context", END]:
+    """End the section once the Section tool has been called, otherwise keep researching"""
+
+    if state.get("completed_sections"):
+        return END
+    return "compact_context"
+
+
+async def compact_context(state: SectionState, config: RunnableConfig):
+    """Compact search outputs the research agent has already read once its history exceeds the token ceiling"""
+
+    configurable = Configuration.from_runnable_config(config)
+    replacements = compact_messages(
+        materialize_messages(state["messages"]),
+        configurable.research_context_max_tokens,
+    )
+    # Replacements carry the original message ids, so add_messages swaps them in place
+    return {"messages": replacements} if replacements else {}
 
 
 async def research_agent_should_continue(
@@ -356,48 +530,233 @@ async def research_agent_should_continue(
         return END
 
 
+async def _rewrite_section(section: dict, prompt: str, configurable: Configuration, report_id: str = ""):
+    """Rewrite a section's content with the researcher model, counting the call against the report budget"""
+
+    researcher_model = get_config_value(configurable.researcher_model)
+    messages = [{"role": "user", "content": prompt}]
+    response = await cached_ainvoke(
+        get_chat_model(researcher_model),
+        messages,
+        model=researcher_model,
+        tools=[],
+        cache=llm_cache_from_config(configurable),
+    )
+    if report_id:
+        usage = getattr(response, "usage_metadata", None) or {}
+        report_usage(report_id).prompt_tokens += usage.get("input_tokens") or estimate_tokens(messages)
+    return Section(
+        name=section["name"],
+        description=section["description"],
+        content=response.content or section["content"],
+    )
+
+
+async def personalize_section(stored: dict, context: str, configurable: Configuration, report_id: str = ""):
+    """Adapt a section reused from the section store to the current student's request"""
+
+    prompt = SECTION_PERSONALIZATION_INSTRUCTIONS.format(context=context, section=stored["content"])
+    return await _rewrite_section(stored, prompt, configurable, report_id)
+
+
+async def neutralize_section(section: Section, configurable: Configuration, report_id: str = ""):
+    """Strip the current student's context from a researched section before it is stored for reuse"""
+
+    prompt = SECTION_NEUTRALIZATION_INSTRUCTIONS.format(
+        specialty=configurable.specialty,
+        residency_state=configurable.residency_state,
+        section=section.content,
+    )
+    return await _rewrite_section(section.model_dump(), prompt, configurable, report_id)
+
+
+async def _store_neutral_section(store, template: str, section: Section, configurable: Configuration, report_id: str):
+    """Store a version of ``section`` without the current student's context for later reports"""
+
+    try:
+        neutral = await neutralize_section(section, configurable, report_id)
+        await asyncio.to_thread(store.put, configurable.specialty, configurable.residency_state, template, neutral)
+    except Exception:
+        logger.exception("Storing section %s failed", template)
+
+
+async def wait_for_section_stores() -> None:
+    """Wait until the sections stored in the background on the running loop are written."""
+    loop = asyncio.get_running_loop()
+    tasks = [task for task in _section_store_tasks if task.get_loop() is loop]
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def research_team(state: SectionTask, config: RunnableConfig):
+    """Run the research subgraph for one section once the section scheduler admits it"""
+
+    # Standard sections already researched for this specialty and state are reused
+    configurable = Configuration.from_runnable_config(config)
+    store = section_store_from_config(configurable)
+    template = match_template(state["section"])
+    if template and store:
+        stored = store.get(configurable.specialty, configurable.residency_state, template)
+        if stored:
+            section = await personalize_section(stored, state.get("context", ""), configurable, state["report_id"])
+            return {"completed_sections": [section], "section_digests": [section_digest(section)]}
+
+    scheduler = get_section_scheduler()
+    async with scheduler.slot(state["report_id"], state.get("priority", 0)):
+        section_input = {"section": state["section"], "report_id": state["report_id"]}
+        # Standard sections start from their prefetched first search
+        if template and prefetch_enabled(configurable):
+            history = await prefetched_history(template, configurable, config)
+            if history:
+                section_input.update(messages=history, tool_calls=1)
+                report_usage(state["report_id"]).tool_calls += 1
+        output = await _build("research_graph").ainvoke(section_input, config)
+    completed_sections = output.get("completed_sections", [])
+
+    if template and store and completed_sections:
+        # The section was researched for this student; other students get a version without
+        # their context, personalized when it is read. Neutralizing it is off the report's
+        # critical path, so it runs in the background.
+        task = asyncio.create_task(
+            _store_neutral_section(store, template, completed_sections[-1], configurable, state["report_id"])
+        )
+        _section_store_tasks.add(task)
+        task.add_done_callback(_section_store_tasks.discard)
+    return {
+        "completed_sections": completed_sections,
+        "section_digests": [section_digest(section) for section in completed_sections],
+    }
+
+
+async def _write_final_part(tool, instructions: str, state: ReportState, configurable: Configuration):
+    """Ask the supervisor model for the introduction or conclusion through its tool"""
+
+    supervisor_model = get_config_value(configurable.supervisor_model)
+    # Digests instead of the full sections keep the finalization prompts small
+    digests = state.get("section_digests") or [
+        section_digest(section) for section in state["completed_sections"]
+    ]
+    response = await cached_ainvoke(
+        get_bound_model(supervisor_model, [tool]),
+        [
+            {"role": "system", "content": FINAL_REPORT_INSTRUCTIONS},
+            # The student's request
+            state["messages"][0],
+            {"role": "user", "content": instructions.format(sections="\n\n".join(digests))},
+        ],
+        model=supervisor_model,
+        tools=[tool],
+        cache=llm_cache_from_config(configurable),
+    )
+    if response.tool_calls:
+        args = response.tool_calls[0]["args"]
+        return args.get("name", ""), args.get("content", "")
+    # The model answered in plain text instead of calling the tool
+    return "", response.content
+
+
+async def finalize_report(state: ReportState, config: RunnableConfig):
+    """Write the introduction and conclusion concurrently and assemble the final report"""
+
+    configurable = Configuration.from_runnable_config(config)
+    (intro_name, intro), (conclusion_name, conclusion) = await asyncio.gather(
+        _write_final_part(introduction_tool, FINAL_INTRODUCTION_INSTRUCTIONS, state, configurable),
+        _write_final_part(conclusion_tool, FINAL_CONCLUSION_INSTRUCTIONS, state, configurable),
+    )
+
+    # Format introduction with a H1 heading and the conclusion with a H2 heading if not already formatted
+    if not intro.startswith("# "):
+        intro = f"# {intro_name}\n\n{intro}"
+    if not conclusion.startswith("## "):
+        conclusion = f"## {conclusion_name}\n\n{conclusion}"
+
+    # Assemble final report in correct order: Introduction, Body Sections, Conclusion
+    body_sections = "\n\n".join([s.content for s in state["completed_sections"]])
+    return {"final_report": f"{intro}\n\n{body_sections}\n\n{conclusion}"}
+
+
 """Build the multi-agent workflow"""
 
-# Research agent workflow
-research_builder = StateGraph(
-    SectionState, output=SectionOutputState, config_schema=Configuration
-)
-research_builder.add_node("research_agent", research_agent)
-research_builder.add_node("research_agent_tools", research_agent_tools)
-research_builder.add_edge(START, "research_agent")
-research_builder.add_conditional_edges(
-    "research_agent",
-    research_agent_should_continue,
-    {
-        # Name returned by should_continue : Name of next node to visit
-        "research_agent_tools": "research_agent_tools",
-        END: END,
-    },
-)
-research_builder.add_edge("research_agent_tools", "research_agent")
-
-# Supervisor workflow
-supervisor_builder = StateGraph(
-    ReportState,
-    input=MessagesState,
-    output=ReportStateOutput,
-    config_schema=Configuration,
-)
-supervisor_builder.add_node("supervisor", supervisor)
-supervisor_builder.add_node("supervisor_tools", supervisor_tools)
-supervisor_builder.add_node("research_team", research_builder.compile())
-
-# Flow of the supervisor agent
-supervisor_builder.add_edge(START, "supervisor")
-supervisor_builder.add_conditional_edges(
-    "supervisor",
-    supervisor_should_continue,
-    {
-        # Name returned by should_continue : Name of next node to visit
-        "supervisor_tools": "supervisor_tools",
-        END: END,
-    },
-)
-supervisor_builder.add_edge("research_team", "supervisor")
 
-graph = supervisor_builder.compile()
+def build_research_builder() -> StateGraph:
+    """Build the research agent workflow (one section per invocation)."""
+    research_builder = StateGraph(
+        SectionState, output=SectionOutputState, config_schema=Configuration
+    )
+    research_builder.add_node("research_agent", research_agent)
+    research_builder.add_node("research_agent_tools", research_agent_tools)
+    research_builder.add_node("compact_context", compact_context)
+    research_builder.add_edge(START, "research_agent")
+    research_builder.add_conditional_edges(
+        "research_agent",
+        research_agent_should_continue,
+        {
+            # Name returned by should_continue : Name of next node to visit
+            "research_agent_tools": "research_agent_tools",
+            END: END,
+        },
+    )
+    research_builder.add_conditional_edges(
+        "research_agent_tools",
+        research_agent_tools_should_continue,
+        {
+            "compact_context": "compact_context",
+            END: END,
+        },
+    )
+    research_builder.add_edge("compact_context", "research_agent")
+    return research_builder
+
+
+def build_supervisor_builder() -> StateGraph:
+    """Build the supervisor workflow around the compiled research subgraph."""
+    supervisor_builder = StateGraph(
+        ReportState,
+        input=MessagesState,
+        output=ReportStateOutput,
+        config_schema=Configuration,
+    )
+    supervisor_builder.add_node("supervisor", supervisor)
+    supervisor_builder.add_node("supervisor_tools", supervisor_tools)
+    supervisor_builder.add_node("research_team", research_team)
+    supervisor_builder.add_node("finalize_report", finalize_report)
+
+    # Flow of the supervisor agent
+    supervisor_builder.add_edge(START, "supervisor")
+    supervisor_builder.add_conditional_edges(
+        "supervisor",
+        supervisor_should_continue,
+        {
+            # Name returned by should_continue : Name of next node to visit
+            "supervisor_tools": "supervisor_tools",
+            END: END,
+        },
+    )
+    # Once every section is researched, write the introduction and conclusion in one step
+    supervisor_builder.add_edge("research_team", "finalize_report")
+    supervisor_builder.add_edge("finalize_report", END)
+    return supervisor_builder
+
+
+_LAZY_GRAPH_FACTORIES = {
+    "research_builder": build_research_builder,
+    "research_graph": lambda: _build("research_builder").compile(),
+    "supervisor_builder": build_supervisor_builder,
+    "graph": lambda: _build("supervisor_builder").compile(),
+}
+
+
+@lru_cache(maxsize=None)
+def _build(name: str):
+    return _LAZY_GRAPH_FACTORIES[name]()
+
+
+def __getattr__(name: str):
+    """Build and compile the graphs on first attribute access (PEP 562).
+
+    Keeps ``import open_deep_research.multi_agent`` cheap for workers that never
+    touch the graph, while ``langgraph.json`` and ``from ... import graph`` still work.
+    """
+    if name in _LAZY_GRAPH_FACTORIES:
+        return _build(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
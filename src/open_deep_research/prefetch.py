@@ -0,0 +1,101 @@
+"""Speculative prefetch of the standard sections' first searches.
+
+Every report covers the same standard sections (see ``section_store.SECTION_TEMPLATES``),
+so the first search each research agent runs is predictable from the specialty and
+state alone. The supervisor starts these searches in the background on its first turn,
+in parallel with its own initial search and planning. When a standard section is then
+researched, its agent starts with the prefetched results already in its history and
+does not need a first search round trip.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Dict, Optional, Tuple
+
+from open_deep_research.section_store import SECTION_TEMPLATES, normalize
+
+# Prefetched results older than this are discarded
+PREFETCH_TTL = 3600
+
+logger = logging.getLogger(__name__)
+
+
+def standard_queries(specialty: str, state: str) -> Dict[str, str]:
+    """Return the predicted first search query of each standard section."""
+    queries = {
+        "panorama": f"{specialty} especialidade médica panorama atuação e subespecialidades no Brasil",
+        "mercado_de_trabalho": f"mercado de trabalho {specialty} remuneração média e demanda em {state}",
+        "formacao_e_residencia": f"residência médica em {specialty} {state} vagas duração e programas de referência",
+        "desafios_e_recompensas": f"desafios rotina e qualidade de vida na carreira de {specialty}",
+        "primeiros_passos": f"primeiros passos na carreira de {specialty} após a residência oportunidades em {state}",
+    }
+    return {template: queries[template] for template in SECTION_TEMPLATES}
+
+
+_prefetches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, tuple]]" = weakref.WeakKeyDictionary()
+
+
+def _loop_prefetches() -> Dict[tuple, tuple]:
+    loop = asyncio.get_running_loop()
+    prefetches = _prefetches.get(loop)
+    if prefetches is None:
+        prefetches = _prefetches[loop] = {}
+    return prefetches
+
+
+def _prefetch_key(specialty: str, state: str, template: str, search_tool) -> tuple:
+    # Results of one search backend must not seed a section researched with another
+    return (normalize(specialty), normalize(state), template, search_tool.name)
+
+
+def start_prefetch(specialty: str, state: str, search_tool, skip=()) -> int:
+    """Start the standard searches for ``specialty`` and ``state`` in the background.
+
+    Args:
+        specialty: The report's specialty.
+        state: The state where the student wants residency.
+        search_tool: The configured search tool; its first argument takes the query list.
+        skip: Templates not to prefetch (e.g. sections reused from the section store).
+
+    Returns:
+        int: Number of searches started (searches already in flight or fresh are reused).
+    """
+    prefetches = _loop_prefetches()
+    now = time.time()
+    for key in [k for k, (created_at, _, _) in prefetches.items() if now - created_at > PREFETCH_TTL]:
+        del prefetches[key]
+
+    query_arg = next(iter(search_tool.args))
+    started = 0
+    for template, query in standard_queries(specialty, state).items():
+        key = _prefetch_key(specialty, state, template, search_tool)
+        if template in skip or key in prefetches:
+            continue
+        task = asyncio.create_task(search_tool.ainvoke({query_arg: [query]}))
+        # Failures are reported by get_prefetched; don't log unretrieved exceptions
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        prefetches[key] = (now, query, task)
+        started += 1
+    return started
+
+
+async def get_prefetched(specialty: str, state: str, template: str, search_tool) -> Optional[Tuple[str, str]]:
+    """Return ``(query, result)`` for a prefetched standard search, waiting for it if needed.
+
+    Returns None when nothing was prefetched for the section with ``search_tool`` or the
+    search failed.
+    """
+    entry = _loop_prefetches().get(_prefetch_key(specialty, state, template, search_tool))
+    if entry is None:
+        return None
+    _, query, task = entry
+    try:
+        # Shielded so a cancelled section does not cancel a search other reports may reuse
+        result = await asyncio.shield(task)
+    except Exception as e:
+        # The section falls back to running its own first search
+        logger.warning("Prefetched search failed for %s: %s", template, e)
+        return None
+    return query, result
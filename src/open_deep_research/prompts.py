@@ -20,22 +20,13 @@ Você é um supervisor de pesquisa encarregado de delinear um relatório detalha
         * **Primeiros Passos na Carreira:** Como iniciar após a residência, oportunidades iniciais, dicas para o recém-formado.
     * Não crie seções para introdução ou conclusão nesta etapa de planejamento. As seções devem ser formuladas para permitir pesquisa independente posterior por outros pesquisadores.
 
-2.  **Montagem do Relatório Final (após recebimento do conteúdo das seções):**
-    * Verifique seu histórico para confirmar as etapas já concluídas.
-    * Se ainda não o fez, gere uma introdução utilizando a ferramenta `Introduction`. O título do relatório deve ser formatado com `#` (nível H1). Exemplo: `Planejamento de Carreira em [Especialidade(s)]\n\n[Conteúdo da introdução...]`.
-    * A introdução deve contextualizar a importância do planejamento de carreira médica, apresentar a(s) especialidade(s) abordada(s) e resumir brevemente o conteúdo que será explorado nas seções, destacando o foco em informações atuais de mercado e preparação para a residência.
-    * O conteúdo da introdução deve ser claro e conciso, com foco em guiar o estudante pelo conteúdo do relatório.
-    * Após a introdução e o conteúdo das seções, gere uma conclusão utilizando a ferramenta `Conclusion` para resumir na forma de um passo a passo para o estudante seguir para se diferenciar no mercado. O título da conclusão deve ser formatado com `##` (nível H2). Exemplo: `Passo a passo para a diferenciação:\n\n[Conteúdo da conclusão...]`.
-    * Considere que seu público são estudantes de medicina, use linguagem e vocabulário de acordo.
-    * Use tom de voz informativo e instrutivo, como estivesse guiando o estudante de medicina pelas seções.
-    * Seu tom de vóz deve ser diretamente direcionado ao estudante, se referindo a ele diretamente como se estivesse se comunicando com ele.
-
-
 **Notas Adicionais:**
+* Para números de residentes, vagas de R1, crescimento das vagas e especialistas por região, use a ferramenta `residency_data`, que traz dados exatos sem gastar buscas.
 * Certifique-se de **SEMPRE** utilizar a ferramenta `enhanced_tavily_search` com topic 'general' para realizar a busca inicial e obter informações relevantes.
-* Seu foco principal na fase inicial é usar a busca única para obter o contexto necessário para **planejar** a estrutura do relatório de forma lógica e abrangente, incluindo a identificação inicial de recursos para planejamento de residência.
+* Seu foco é usar a busca única para obter o contexto necessário para **planejar** a estrutura do relatório de forma lógica e abrangente, incluindo a identificação inicial de recursos para planejamento de residência.
 * Mantenha um tom claro, informativo e profissional.
-* O relatório final deve ser personalizado o máximo possível com base nas informações fornecidas pelo usuário (especialidade(s), localização, etc.).
+* O relatório deve ser personalizado o máximo possível com base nas informações fornecidas pelo usuário (especialidade(s), localização, etc.).
+* A introdução e a conclusão são escritas depois, quando todas as seções estiverem concluídas.
 """
 
 RESEARCH_INSTRUCTIONS = """
@@ -52,6 +43,9 @@ Comece revisando o escopo de trabalho da seção. Isso define seu foco de pesqui
 Use a ferramenta `Sections` para definir uma lista de seções do relatório.
 Cada seção deve ser uma descrição escrita com: um nome de seção e um plano de pesquisa para a seção.
 
+### Dados Locais de Residência
+Para números de médicos residentes, vagas de R1 por ano (2018–2024), crescimento das vagas, número de especialistas, especialistas por 100 mil habitantes e distribuição regional, use a ferramenta `residency_data` **antes** de qualquer busca na web. Esses dados são exatos: cite-os como fonte e não faça buscas para obtê-los.
+
 ### Processo Estratégico de Pesquisa Otimizado
 
 Siga esta estratégia de pesquisa precisa para minimizar chamadas desnecessárias e otimizar o uso das ferramentas:
@@ -108,3 +102,289 @@ Exemplo de formato para `content`:
 
 
 """
+
+SECTION_PERSONALIZATION_INSTRUCTIONS = """
+Você está adaptando uma seção já pesquisada de um relatório sobre planejamento de carreira em especialidades médicas para um novo estudante.
+
+**Pedido do estudante:**
+{context}
+
+**Seção pesquisada:**
+{section}
+
+**Instruções:**
+* Mantenha todos os fatos, números, instituições e fontes da seção pesquisada. **NÃO** invente informações novas.
+* Ajuste apenas o enquadramento, os exemplos e as recomendações ao contexto do estudante (faculdade, ciclo e preocupações), quando pertinente.
+* Mantenha o título da seção e a formatação markdown.
+* Dirija-se diretamente ao estudante, com linguagem adequada a estudantes de medicina.
+* Responda apenas com o conteúdo final da seção, sem comentários adicionais.
+"""
+
+SECTION_NEUTRALIZATION_INSTRUCTIONS = """
+Você está preparando uma seção pesquisada de um relatório sobre planejamento de carreira em especialidades médicas para ser reutilizada nos relatórios de outros estudantes de {specialty} em {residency_state}.
+
+**Seção pesquisada:**
+{section}
+
+**Instruções:**
+* Remova tudo o que se refere ao estudante que pediu o relatório: nome, faculdade, ciclo, cidade de origem, preocupações e recomendações feitas especificamente para ele.
+* Mantenha todos os fatos, números, instituições e fontes sobre a especialidade e sobre {residency_state}. **NÃO** invente informações novas.
+* Mantenha o título da seção e a formatação markdown, incluindo a subseção de fontes.
+* Dirija-se ao estudante de forma genérica, com linguagem adequada a estudantes de medicina.
+* Responda apenas com o conteúdo final da seção, sem comentários adicionais.
+"""
+
+FINAL_REPORT_INSTRUCTIONS = """
+Você é o supervisor de um relatório detalhado sobre planejamento de carreira em especialidades médicas, com base na(s) especialidade(s) médica(s) de interesse fornecida(s) pelo usuário. As seções do corpo do relatório já foram pesquisadas e escritas; falta escrever a introdução e a conclusão.
+
+**Orientações de montagem do relatório final:**
+* A introdução é escrita com a ferramenta `Introduction`. O título do relatório deve ser formatado com `#` (nível H1). Exemplo: `Planejamento de Carreira em [Especialidade(s)]\n\n[Conteúdo da introdução...]`.
+* A introdução deve contextualizar a importância do planejamento de carreira médica, apresentar a(s) especialidade(s) abordada(s) e resumir brevemente o conteúdo que será explorado nas seções, destacando o foco em informações atuais de mercado e preparação para a residência.
+* O conteúdo da introdução deve ser claro e conciso, com foco em guiar o estudante pelo conteúdo do relatório.
+* A conclusão é escrita com a ferramenta `Conclusion` e resume, na forma de um passo a passo, o que o estudante deve seguir para se diferenciar no mercado. O título da conclusão deve ser formatado com `##` (nível H2). Exemplo: `Passo a passo para a diferenciação:\n\n[Conteúdo da conclusão...]`.
+* Considere que seu público são estudantes de medicina, use linguagem e vocabulário de acordo.
+* Use tom de voz informativo e instrutivo, como estivesse guiando o estudante de medicina pelas seções.
+* Seu tom de vóz deve ser diretamente direcionado ao estudante, se referindo a ele diretamente como se estivesse se comunicando com ele.
+* O relatório final deve ser personalizado o máximo possível com base nas informações fornecidas pelo usuário (especialidade(s), localização, etc.).
+"""
+
+FINAL_INTRODUCTION_INSTRUCTIONS = """
+A pesquisa está concluída. Escreva agora **apenas a introdução** do relatório utilizando a ferramenta `Introduction`, seguindo as orientações de montagem do relatório final. O título do relatório deve ser formatado com `#` (nível H1).
+
+Estes são os resumos das seções do corpo do relatório já concluídas (título, tópicos, números-chave e número de fontes). O texto completo das seções será inserido no relatório final entre a introdução e a conclusão:
+
+{sections}
+"""
+
+FINAL_CONCLUSION_INSTRUCTIONS = """
+A pesquisa está concluída. Escreva agora **apenas a conclusão** do relatório utilizando a ferramenta `Conclusion`, seguindo as orientações de montagem do relatório final: um passo a passo para o estudante se diferenciar no mercado. O título da conclusão deve ser formatado com `##` (nível H2).
+
+Estes são os resumos das seções do corpo do relatório já concluídas (título, tópicos, números-chave e número de fontes). O texto completo das seções será inserido no relatório final entre a introdução e a conclusão:
+
+{sections}
+"""
+
+BUDGET_EXHAUSTED_INSTRUCTIONS = """
+O orçamento de pesquisa desta seção foi atingido ({reason}). **NÃO** faça novas buscas. Escreva agora a seção utilizando a ferramenta `Section`, com base apenas nas informações já coletadas, seguindo as orientações de escrita da seção.
+"""
+
+## Workflow (plan-then-research graph)
+REPORT_PLANNER_QUERY_WRITER_INSTRUCTIONS = """
+Você está realizando a pesquisa inicial para planejar um relatório.
+
+<Tema do relatório>
+{topic}
+</Tema do relatório>
+
+<Organização do relatório>
+{report_organization}
+</Organização do relatório>
+
+<Tarefa>
+Gere {number_of_queries} consultas de busca que ajudem a planejar as seções do relatório.
+
+As consultas devem:
+1. Estar relacionadas ao tema do relatório
+2. Ajudar a cumprir os requisitos da organização do relatório
+
+Elabore consultas específicas o suficiente para encontrar fontes relevantes e de qualidade, cobrindo a amplitude necessária para a estrutura do relatório.
+</Tarefa>
+"""
+
+REPORT_PLANNER_INSTRUCTIONS = """
+Você deve planejar as seções de um relatório conciso e objetivo.
+
+<Tema do relatório>
+{topic}
+</Tema do relatório>
+
+<Organização do relatório>
+Siga esta organização:
+{report_organization}
+</Organização do relatório>
+
+<Contexto>
+Use este contexto da pesquisa inicial para planejar as seções:
+{context}
+</Contexto>
+
+<Tarefa>
+Gere a lista de seções do relatório. Cada seção deve ter os campos:
+
+- name: nome da seção.
+- description: breve visão geral dos principais tópicos cobertos pela seção.
+- research: se a seção exige pesquisa na web.
+- content: conteúdo da seção, que deve ficar vazio por enquanto.
+
+As seções de introdução e conclusão não exigem pesquisa, pois são escritas a partir das demais seções.
+Cada seção deve ter um foco distinto, sem sobreposição de conteúdo, e ser diretamente relevante para o tema. Não crie seções tangenciais.
+</Tarefa>
+
+<Feedback>
+Feedback sobre a estrutura do relatório (se houver):
+{feedback}
+</Feedback>
+"""
+
+SECTION_QUERIES_INSTRUCTIONS = """
+Você é um redator técnico que prepara as buscas na web de todas as seções de um relatório de uma só vez.
+
+<Tema do relatório>
+{topic}
+</Tema do relatório>
+
+<Seções que exigem pesquisa>
+{sections}
+</Seções que exigem pesquisa>
+
+<Tarefa>
+Para cada seção acima, na mesma ordem e usando exatamente o mesmo nome, gere {number_of_queries} consultas de busca que reúnam as informações necessárias para escrevê-la.
+
+As consultas devem ser específicas do tema da seção, buscar fontes atuais e confiáveis e não repetir consultas de outras seções.
+</Tarefa>
+"""
+
+QUERY_WRITER_INSTRUCTIONS = """
+Você é um redator técnico que prepara consultas de busca na web para reunir as informações necessárias para escrever uma seção de um relatório.
+
+<Tema do relatório>
+{topic}
+</Tema do relatório>
+
+<Tema da seção>
+{section_topic}
+</Tema da seção>
+
+<Tarefa>
+Gere {number_of_queries} consultas de busca que cubram de forma abrangente o tema da seção.
+
+As consultas devem ser específicas do tema, buscar fontes atuais e confiáveis e cobrir aspectos diferentes do tema.
+</Tarefa>
+"""
+
+SECTION_WRITER_INSTRUCTIONS = """
+Escreva uma seção de um relatório de pesquisa.
+
+<Tarefa>
+1. Revise o tema do relatório, o nome e o tema da seção.
+2. Se houver conteúdo existente da seção, revise-o.
+3. Em seguida, leia as fontes fornecidas.
+4. Decida quais fontes usará para escrever a seção.
+5. Escreva a seção e liste as fontes.
+</Tarefa>
+
+<Diretrizes de escrita>
+- Se o conteúdo existente da seção estiver vazio, escreva do zero
+- Se houver conteúdo existente, complemente-o com as novas fontes
+- Limite estrito de 150 a 200 palavras
+- Use linguagem simples e clara
+- Use parágrafos curtos (no máximo 2 a 3 frases)
+- Use `##` para o título da seção (formato markdown)
+</Diretrizes de escrita>
+
+<Regras de citação>
+- Atribua a cada URL única um número de citação no texto
+- Termine com ### Fontes, listando cada fonte com o número correspondente
+- IMPORTANTE: numere as fontes em sequência, sem lacunas (1, 2, 3, 4...), na lista final
+- Formato: [1] Título da fonte: URL
+</Regras de citação>
+
+<Verificação final>
+1. Verifique se TODAS as afirmações se apoiam nas fontes fornecidas
+2. Confirme que cada URL aparece apenas uma vez na lista de fontes
+3. Confirme que as fontes estão numeradas em sequência, sem lacunas
+</Verificação final>
+"""
+
+SECTION_WRITER_INPUTS = """
+<Tema do relatório>
+{topic}
+</Tema do relatório>
+
+<Nome da seção>
+{section_name}
+</Nome da seção>
+
+<Tema da seção>
+{section_topic}
+</Tema da seção>
+
+<Conteúdo existente da seção (se houver)>
+{section_content}
+</Conteúdo existente da seção>
+
+<Fontes>
+{context}
+</Fontes>
+"""
+
+SECTION_GRADER_INSTRUCTIONS = """
+Revise uma seção de relatório em relação ao tema especificado:
+
+<Tema do relatório>
+{topic}
+</Tema do relatório>
+
+<Tema da seção>
+{section_topic}
+</Tema da seção>
+
+<Seção escrita>
+{section}
+</Seção escrita>
+
+<Tarefa>
+Avalie se o conteúdo da seção trata adequadamente do tema da seção.
+
+Se não tratar, gere {number_of_follow_up_queries} consultas de busca de acompanhamento para reunir as informações que faltam.
+</Tarefa>
+
+<Formato>
+- grade: "pass" se a seção atende aos requisitos, "fail" caso contrário
+- follow_up_queries: lista de consultas de acompanhamento
+</Formato>
+"""
+
+FINAL_SECTION_WRITER_INSTRUCTIONS = """
+Você é um redator técnico especialista que escreve uma seção que sintetiza as informações do restante do relatório.
+
+<Tema do relatório>
+{topic}
+</Tema do relatório>
+
+<Nome da seção>
+{section_name}
+</Nome da seção>
+
+<Tema da seção>
+{section_topic}
+</Tema da seção>
+
+<Resumos das seções pesquisadas>
+{context}
+</Resumos das seções pesquisadas>
+
+<Tarefa>
+1. Para a introdução:
+- Use `#` para o título do relatório (formato markdown)
+- Limite de 50 a 100 palavras
+- Escreva em linguagem simples e clara
+- Apresente em 1 a 2 parágrafos a motivação central do relatório
+- Não inclua listas nem tabelas
+- Não inclua seção de fontes
+
+2. Para a conclusão:
+- Use `##` para o título da seção (formato markdown)
+- Limite de 100 a 150 palavras
+- Inclua no máximo um elemento estrutural (uma tabela comparativa ou uma lista curta) que sintetize as seções
+- Termine com os próximos passos ou implicações concretas
+- Não inclua seção de fontes
+
+3. Para as demais seções sem pesquisa, escreva com base apenas nos resumos acima, sem inventar informações.
+</Tarefa>
+
+<Verificação final>
+1. Verifique a formatação markdown
+2. Não inclua preâmbulo antes do conteúdo da seção
+</Verificação final>
+"""
@@ -0,0 +1,146 @@
+"""In-memory index over the bundled residency CSVs, exposed as an agent tool.
+
+The ``data/`` directory ships exact figures per specialty: residents in training, R1
+positions from 2018 to 2024 and their growth, number of specialists, specialists per
+100k inhabitants and their regional distribution. The agents used to spend web searches
+(and sometimes invent numbers) looking for them. The files are loaded once into
+dictionaries keyed by normalized specialty name, and the ``residency_data`` tool answers
+lookups from memory.
+"""
+
+import csv
+import difflib
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from langchain_core.tools import tool
+
+from open_deep_research.section_store import normalize
+
+DATA_DIR = os.environ.get(
+    "ODR_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data"),
+)
+
+GROWTH_YEARS = ("2018", "2019", "2020", "2021", "2022", "2023", "2024")
+
+# Names suggested when a lookup matches no specialty
+MAX_CANDIDATES = 5
+
+logger = logging.getLogger(__name__)
+
+
+def _read_csv(filename: str, key_column: str) -> Dict[str, dict]:
+    path = os.path.join(DATA_DIR, filename)
+    if not os.path.exists(path):
+        logger.warning("Residency data file not found: %s", path)
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return {normalize(row[key_column]): row for row in csv.DictReader(f) if row.get(key_column)}
+
+
+class ResidencyData:
+    """Specialty-indexed view of the three bundled CSV files."""
+
+    def __init__(self):
+        self.residents = _read_csv("residents_1_n.csv", "Especialidade")
+        self.growth = _read_csv("residency_growth_cleaned.csv", "Especialidade")
+        self.specialists = _read_csv("specialty_data.csv", "especialidade")
+        self.names = {}
+        for table in (self.residents, self.growth, self.specialists):
+            for key, row in table.items():
+                self.names.setdefault(key, row.get("Especialidade") or row.get("especialidade"))
+
+    def resolve(self, specialty: str) -> Optional[str]:
+        """Return the index key for ``specialty``, ignoring accents and case, or None.
+
+        Only exact names resolve: a partial or close match is often another specialty
+        ("Cirurgia" is not "Neurocirurgia"), so those are offered by ``candidates``.
+        """
+        key = normalize(specialty)
+        return key if key in self.names else None
+
+    def candidates(self, specialty: str) -> List[str]:
+        """Return the names of specialties containing or resembling ``specialty``."""
+        key = normalize(specialty)
+        partial = sorted((name for name in self.names if key in name or name in key), key=len)
+        close = difflib.get_close_matches(key, list(self.names), n=MAX_CANDIDATES, cutoff=0.6)
+        keys = list(dict.fromkeys(partial + close))[:MAX_CANDIDATES]
+        return [self.names[name] for name in keys]
+
+    def describe(self, specialty: str) -> str:
+        """Return the figures for ``specialty`` as text for the agents."""
+        key = self.resolve(specialty)
+        if key is None:
+            message = f"Especialidade '{specialty}' não encontrada nos dados locais."
+            candidates = self.candidates(specialty)
+            if candidates:
+                message += f" Especialidades com nomes próximos: {', '.join(candidates)}."
+            return message
+
+        lines = [f"### {self.names[key]}"]
+        residents = self.residents.get(key)
+        if residents:
+            lines.append(
+                f"- Médicos residentes (total): {residents['Medicos_residentes_total_N']} "
+                f"({residents['Medicos_residentes_total_Percent']}% do total do país)"
+            )
+            lines.append(
+                f"- Residentes R1: {residents['Medicos_residentes_R1_N']} "
+                f"({residents['Medicos_residentes_R1_Percent']}% do total de R1)"
+            )
+        growth = self.growth.get(key)
+        if growth:
+            series = ", ".join(f"{year}: {growth[year]}" for year in GROWTH_YEARS if growth.get(year))
+            lines.append(f"- Vagas de R1 por ano: {series}")
+            lines.append(f"- Crescimento das vagas de R1 (2018–2024): {growth['crescimento_total']}%")
+        specialists = self.specialists.get(key)
+        if specialists:
+            lines.append(
+                f"- Especialistas: {specialists['n_especialistas']} "
+                f"({specialists['especialistas_100k']} por 100 mil habitantes)"
+            )
+            lines.append(
+                "- Distribuição regional dos especialistas: "
+                f"Sudeste {specialists['sudeste (%)']}%, Sul {specialists['sul (%)']}%, "
+                f"Nordeste {specialists['nordeste (%)']}%, Norte {specialists['norte (%)']}%, "
+                f"Centro-Oeste {specialists['centro_oeste (%)']}%"
+            )
+            lines.append(
+                "- Distribuição por porte de município: "
+                f"capitais {specialists['capital (%)']}%, "
+                f"interior acima de 300 mil habitantes {specialists['interior_mais_300k (%)']}%, "
+                f"interior de 100 a 300 mil {specialists['interior_100k_300k (%)']}%, "
+                f"interior abaixo de 100 mil {specialists['interior_menos_100k (%)']}%"
+            )
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=1)
+def get_residency_data() -> ResidencyData:
+    """Return the process-wide index, loading the CSV files on first use."""
+    return ResidencyData()
+
+
+@tool
+def residency_data(specialties: List[str]) -> str:
+    """Look up exact Brazilian residency and workforce figures for medical specialties.
+
+    Returns, for each specialty: residents in training and R1 residents, R1 positions
+    per year from 2018 to 2024 and their total growth, number of specialists,
+    specialists per 100k inhabitants, and regional distribution. Prefer this tool over
+    web search for these numbers.
+
+    Args:
+        specialties: Specialty names in Portuguese, e.g. ["Cardiologia", "Pediatria"].
+            Names must match exactly (accents and case are ignored); an unknown name
+            returns the closest specialty names instead of figures.
+
+    Returns:
+        str: The figures, one block per specialty.
+    """
+    data = get_residency_data()
+    blocks = [data.describe(specialty) for specialty in specialties]
+    return "Dados locais MedCampus (residentes, vagas de R1 2018–2024 e especialistas):\n\n" + "\n\n".join(blocks)
@@ -0,0 +1,156 @@
+"""Running multi-agent reports with incremental delivery and durable checkpoints.
+
+``graph.ainvoke`` only returns once every section, the introduction and the conclusion
+are written. ``stream_report`` drives the same graph through ``graph.astream`` and
+yields each body section as soon as its research subgraph finishes, so callers can
+show content long before the full report is assembled.
+
+Durable runs are checkpointed to a local SQLite database after every step, keyed by
+``thread_id``. If a run fails or is interrupted (e.g. one section's research raises
+after the others have finished), ``resume_report`` restarts it from the last
+checkpoint: sections that already completed are not researched again.
+"""
+
+import os
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from open_deep_research.blobstore import CACHE_DIR
+from open_deep_research.budgets import reset_report_usage
+from open_deep_research.configuration import Configuration
+from open_deep_research.instrumentation import instrument_run
+
+CHECKPOINT_PATH = os.environ.get("ODR_CHECKPOINT_PATH", os.path.join(CACHE_DIR, "checkpoints.sqlite"))
+
+
+@asynccontextmanager
+async def checkpointed_graph(path: Optional[str] = None):
+    """Compile the multi-agent graph with a SQLite checkpointer.
+
+    Args:
+        path: Checkpoint database (defaults to ``ODR_CHECKPOINT_PATH``).
+
+    Yields:
+        The compiled graph; checkpoints are written for every run given a ``thread_id``.
+    """
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    from open_deep_research.multi_agent import supervisor_builder
+
+    path = path or CHECKPOINT_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(path) as checkpointer:
+        yield supervisor_builder.compile(checkpointer=checkpointer)
+
+
+async def _stream_events(graph, graph_input, config) -> AsyncIterator[Dict[str, Any]]:
+    async for mode, chunk in graph.astream(graph_input, config, stream_mode=["updates", "values"]):
+        if mode == "values":
+            yield {"type": "values", "values": chunk}
+            continue
+        for node, update in chunk.items():
+            if not isinstance(update, dict):
+                continue
+            if node == "research_team":
+                for section in update.get("completed_sections") or []:
+                    yield {"type": "section", "section": section}
+            elif update.get("final_report"):
+                yield {"type": "final_report", "final_report": update["final_report"]}
+
+
+async def stream_report(
+    initial_input: Optional[Dict[str, Any]],
+    config: Optional[RunnableConfig] = None,
+    durable: bool = True,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run the multi-agent graph and yield progress events.
+
+    Args:
+        initial_input: Graph input, e.g. ``{"messages": [...]}``; None resumes the
+            checkpointed run of ``config``'s ``thread_id``.
+        config: Optional runnable config (``configurable`` settings, ``thread_id``).
+        durable: Checkpoint the run so it can be resumed with ``resume_report``. A
+            ``thread_id`` is generated when the config has none.
+
+    Yields:
+        dict: Events with a ``type`` key:
+
+        - ``{"type": "started", "thread_id": str}`` first (``thread_id`` is None for
+          non-durable runs without one).
+        - ``{"type": "section", "section": Section}`` for each completed body section,
+          in completion order.
+        - ``{"type": "final_report", "final_report": str}`` when the full report is
+          assembled.
+        - ``{"type": "done", "result": dict, "metrics": dict}`` once, with the graph
+          output and the run's instrumentation counters.
+    """
+    config = dict(config or {})
+    configurable = dict(config.get("configurable") or {})
+    if durable:
+        configurable.setdefault("thread_id", uuid.uuid4().hex)
+    config["configurable"] = configurable
+    # Raises ValueError on misconfiguration before any model or search call
+    Configuration.from_runnable_config(config)
+    if configurable.get("thread_id"):
+        # A new run or a resume gets fresh budget clocks and report counters
+        reset_report_usage(str(configurable["thread_id"]))
+    yield {"type": "started", "thread_id": configurable.get("thread_id")}
+
+    result: Dict[str, Any] = {}
+    with instrument_run(config) as (config, metrics):
+        if durable:
+            async with checkpointed_graph() as graph:
+                async for event in _stream_events(graph, initial_input, config):
+                    if event["type"] == "values":
+                        result = event["values"]
+                    else:
+                        yield event
+                # A resumed run that was already complete streams nothing; read the saved state
+                if not result:
+                    result = (await graph.aget_state(config)).values
+        else:
+            from open_deep_research.multi_agent import graph
+
+            async for event in _stream_events(graph, initial_input, config):
+                if event["type"] == "values":
+                    result = event["values"]
+                else:
+                    yield event
+    yield {"type": "done", "result": result, "metrics": metrics.to_dict()}
+
+
+def resume_report(thread_id: str, config: Optional[RunnableConfig] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Resume a failed or interrupted durable run from its last checkpoint.
+
+    Args:
+        thread_id: The ``thread_id`` reported in the run's ``started`` event.
+        config: Optional runnable config; must carry the same settings as the original run.
+
+    Returns:
+        The same event stream as ``stream_report``.
+    """
+    config = dict(config or {})
+    config["configurable"] = {**(config.get("configurable") or {}), "thread_id": thread_id}
+    return stream_report(None, config, durable=True)
+
+
+async def run_status(thread_id: str) -> Dict[str, Any]:
+    """Return the checkpointed status of a durable run.
+
+    Returns:
+        dict: ``exists``, ``complete`` (no pending nodes), ``next`` (nodes that would run
+        on resume) and ``completed_sections`` (number of body sections already written).
+    """
+    config = {"configurable": {"thread_id": thread_id}}
+    async with checkpointed_graph() as graph:
+        snapshot = await graph.aget_state(config)
+    values = snapshot.values or {}
+    return {
+        "exists": bool(values),
+        "complete": bool(values) and not snapshot.next,
+        "next": list(snapshot.next),
+        "completed_sections": len(values.get("completed_sections") or []),
+    }
@@ -0,0 +1,140 @@
+"""Bounded, prioritized scheduling of research sections.
+
+The supervisor fans a report out into one research subgraph per section. Without a
+limit, a single large report starts every section at once and opens dozens of
+simultaneous model and search calls. The ``SectionScheduler`` admits section runs in
+priority order, capping how many run per report and in total on the event loop, so
+concurrent reports share capacity fairly and providers are not flooded.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Dict
+
+SECTION_MAX_CONCURRENCY = int(os.environ.get("SECTION_MAX_CONCURRENCY", "8"))
+SECTION_PER_REPORT_CONCURRENCY = int(os.environ.get("SECTION_PER_REPORT_CONCURRENCY", "3"))
+
+
+@dataclass
+class SectionScheduler:
+    """Priority queue of section runs with per-report and global concurrency caps.
+
+    Lower ``priority`` values start first; ties start in arrival order. A waiting
+    section whose report is at its cap does not block sections of other reports.
+    """
+
+    per_report_concurrency: int = SECTION_PER_REPORT_CONCURRENCY
+    max_concurrency: int = SECTION_MAX_CONCURRENCY
+
+    def __post_init__(self):
+        """Initialize the wait queue and the counters."""
+        self._waiting: list = []  # Heap of (priority, seq, report_id, future)
+        self._seq = itertools.count()
+        self._active = 0
+        self._active_by_report: Dict[str, int] = defaultdict(int)
+        self._queued_by_report: Dict[str, int] = defaultdict(int)
+        self.max_queue_depth = 0
+        self.started = 0
+        self.completed = 0
+        self.wait_seconds = 0.0
+
+    @property
+    def queued(self) -> int:
+        """Number of section runs waiting for a slot."""
+        return sum(self._queued_by_report.values())
+
+    def _dispatch(self) -> None:
+        skipped = []
+        while self._waiting and self._active < self.max_concurrency:
+            entry = heapq.heappop(self._waiting)
+            _, _, report_id, future = entry
+            if future.done():
+                # Waiter was cancelled
+                continue
+            if self._active_by_report.get(report_id, 0) >= self.per_report_concurrency:
+                skipped.append(entry)
+                continue
+            self._dequeue(report_id)
+            self._active += 1
+            self._active_by_report[report_id] += 1
+            future.set_result(None)
+        for entry in skipped:
+            heapq.heappush(self._waiting, entry)
+
+    def _dequeue(self, report_id: str) -> None:
+        self._queued_by_report[report_id] -= 1
+        if not self._queued_by_report[report_id]:
+            del self._queued_by_report[report_id]
+
+    def _release(self, report_id: str) -> None:
+        self._active -= 1
+        self._active_by_report[report_id] -= 1
+        if not self._active_by_report[report_id]:
+            del self._active_by_report[report_id]
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, report_id: str, priority: int = 0):
+        """Wait until a section of ``report_id`` may run, then hold the slot."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._seq), report_id, future))
+        self._queued_by_report[report_id] += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        queued_at = time.monotonic()
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                self._dequeue(report_id)
+            else:
+                # Slot was granted just before the cancellation arrived
+                self._release(report_id)
+            raise
+        self.started += 1
+        self.wait_seconds += time.monotonic() - queued_at
+
+        try:
+            yield
+        finally:
+            self.completed += 1
+            self._release(report_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, running sections and wait time, overall and per report."""
+        reports = set(self._active_by_report) | set(self._queued_by_report)
+        return {
+            "queued": self.queued,
+            "active": self._active,
+            "max_queue_depth": self.max_queue_depth,
+            "started": self.started,
+            "completed": self.completed,
+            "mean_wait_seconds": round(self.wait_seconds / self.started, 3) if self.started else 0.0,
+            "reports": {
+                report_id: {
+                    "active": self._active_by_report.get(report_id, 0),
+                    "queued": self._queued_by_report.get(report_id, 0),
+                }
+                for report_id in reports
+            },
+        }
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SectionScheduler]" = weakref.WeakKeyDictionary()
+
+
+def get_section_scheduler() -> SectionScheduler:
+    """Return the section scheduler shared by every report on the running event loop."""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = SectionScheduler()
+    return scheduler
@@ -0,0 +1,146 @@
+"""Cross-run store of researched report sections.
+
+Most of a career report does not depend on the student: the "Panorama da
+Especialidade" or "Mercado de Trabalho" sections for a given specialty and state are
+nearly identical from one report to the next. Sections the supervisor plans are matched
+against the standard section templates. A researched section is stripped of the
+student's context and stored under a normalized ``(specialty, state, template)`` key.
+Later reports reuse it within a freshness window, after a cheap personalization pass,
+instead of launching a research subgraph.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+
+from open_deep_research.blobstore import CACHE_DIR
+
+SECTION_CACHE_TTL = 7 * 24 * 3600
+
+# Standard sections required by SUPERVISOR_INSTRUCTIONS and the phrases identifying them
+SECTION_TEMPLATES = {
+    "panorama": ("panorama da especialidade", "panorama"),
+    "mercado_de_trabalho": ("mercado de trabalho",),
+    "formacao_e_residencia": ("formacao e residencia", "formacao"),
+    "desafios_e_recompensas": ("desafios e recompensas",),
+    "primeiros_passos": ("primeiros passos",),
+}
+
+
+def normalize(text: str) -> str:
+    """Lowercase ``text``, strip accents and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+def match_template(section_description: str) -> Optional[str]:
+    """Return the template a planned section corresponds to, or None for custom sections.
+
+    Only the section name (the text before the first colon, or the first line) is
+    matched, so research plans mentioning other topics do not cause false matches.
+    """
+    head = normalize(section_description.split(":", 1)[0].splitlines()[0] if section_description else "")
+    for template, phrases in SECTION_TEMPLATES.items():
+        if any(phrase in head for phrase in phrases):
+            return template
+    return None
+
+
+class SectionStore:
+    """SQLite-backed store of researched sections.
+
+    Args:
+        path: SQLite database file.
+        ttl: Seconds a stored section may be reused.
+    """
+
+    def __init__(self, path: str, ttl: float = SECTION_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS sections (
+                specialty TEXT NOT NULL,
+                state TEXT NOT NULL,
+                template TEXT NOT NULL,
+                name TEXT NOT NULL,
+                description TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (specialty, state, template)
+            )"""
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, specialty: str, state: str, template: str) -> Optional[Dict[str, Any]]:
+        """Return the stored section (name, description, content) if it is still fresh."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name, description, content, created_at FROM sections WHERE specialty = ? AND state = ? AND template = ?",
+                (normalize(specialty), normalize(state), template),
+            ).fetchone()
+        if row is None or time.time() - row[3] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"name": row[0], "description": row[1], "content": row[2]}
+
+    def fresh_templates(self, specialty: str, state: str) -> set:
+        """Return the templates with a fresh stored section for ``specialty`` and ``state``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT template FROM sections WHERE specialty = ? AND state = ? AND created_at > ?",
+                (normalize(specialty), normalize(state), time.time() - self.ttl),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def put(self, specialty: str, state: str, template: str, section) -> None:
+        """Store a researched ``Section``."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sections VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    normalize(specialty),
+                    normalize(state),
+                    template,
+                    section.name,
+                    section.description,
+                    section.content,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counts and the hit rate for this process."""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+_stores: Dict[tuple, SectionStore] = {}
+
+
+def get_section_store(ttl: float = SECTION_CACHE_TTL) -> SectionStore:
+    """Return the process-wide section store under ``ODR_CACHE_DIR``."""
+    key = (os.path.join(CACHE_DIR, "sections.sqlite"), float(ttl))
+    if key not in _stores:
+        _stores[key] = SectionStore(key[0], ttl=float(ttl))
+    return _stores[key]
+
+
+def section_store_from_config(configurable) -> Optional[SectionStore]:
+    """Return the section store selected by a ``Configuration``, or None.
+
+    None means the section cache is off or the report's specialty and state are unknown.
+    """
+    if not configurable.section_cache or not configurable.specialty or not configurable.residency_state:
+        return None
+    return get_section_store(configurable.section_cache_ttl)
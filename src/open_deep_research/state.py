@@ -62,3 +62,16 @@ class SectionState(TypedDict):
 
 class SectionOutputState(TypedDict):
     completed_sections: list[Section] # Final key we duplicate in outer state for Send() API
+
+class SectionQueries(BaseModel):
+    section_name: str = Field(
+        description="Name of the report section, exactly as given.",
+    )
+    queries: List[SearchQuery] = Field(
+        description="Search queries for this section.",
+    )
+
+class BatchedQueries(BaseModel):
+    sections: List[SectionQueries] = Field(
+        description="Search queries for every section that needs research, in the given order.",
+    )
@@ -0,0 +1,74 @@
+"""Out-of-band storage of large tool outputs.
+
+Search tools return up to tens of thousands of characters of page text per call. Kept
+verbatim in ``messages``, that text is copied into every checkpoint, every state
+snapshot and the final graph output. Instead, large observations are written to the
+blob store and the tool message holds a reference (the blob digest) followed by a short
+preview. References are materialized back into full text only when building a model
+prompt.
+"""
+
+import os
+from typing import Any, List, Optional, Sequence
+
+from open_deep_research.blobstore import get_blob_store
+
+# Observations up to this size stay inline in the state
+TOOL_OUTPUT_INLINE_CHARS = int(os.environ.get("TOOL_OUTPUT_INLINE_CHARS", "2000"))
+TOOL_OUTPUT_PREVIEW_CHARS = 400
+
+REFERENCE_PREFIX = "[tool-output sha256:"
+
+
+def store_tool_output(observation: Any) -> Any:
+    """Return the value to keep in state for a tool observation.
+
+    Args:
+        observation: The tool's return value.
+
+    Returns:
+        The observation itself when it is not a string or is short, otherwise a
+        reference of the form ``[tool-output sha256:<digest>]`` plus a preview.
+    """
+    if not isinstance(observation, str) or len(observation) <= TOOL_OUTPUT_INLINE_CHARS:
+        return observation
+    digest = get_blob_store().put(observation)
+    preview = observation[:TOOL_OUTPUT_PREVIEW_CHARS]
+    return f"{REFERENCE_PREFIX}{digest}] ({len(observation)} chars)\n{preview}..."
+
+
+def reference_digest(content: Any) -> Optional[str]:
+    """Return the blob digest referenced by ``content``, or None if it is not a reference."""
+    if not isinstance(content, str) or not content.startswith(REFERENCE_PREFIX):
+        return None
+    return content[len(REFERENCE_PREFIX):content.index("]")]
+
+
+def load_tool_output(content: Any) -> Any:
+    """Return the full observation for ``content``.
+
+    Non-reference content is returned unchanged; a reference whose blob has been evicted
+    falls back to the stored preview.
+    """
+    digest = reference_digest(content)
+    if digest is None:
+        return content
+    text = get_blob_store().get_text(digest)
+    return content if text is None else text
+
+
+def materialize_messages(messages: Sequence[Any]) -> List[Any]:
+    """Return ``messages`` with tool output references replaced by the full outputs.
+
+    Messages are copied, never modified, so the state keeps holding references.
+    """
+    materialized = []
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else getattr(message, "content", None)
+        if reference_digest(content) is None:
+            materialized.append(message)
+        elif isinstance(message, dict):
+            materialized.append({**message, "content": load_tool_output(content)})
+        else:
+            materialized.append(message.model_copy(update={"content": load_tool_output(content)}))
+    return materialized
@@ -1,27 +1,24 @@
 import os
 import asyncio
-import requests
 import random 
-import concurrent
-import aiohttp
-import httpx
 import time
 from typing import List, Optional, Dict, Any, Union
 from urllib.parse import unquote
 
-from exa_py import Exa
-from linkup import LinkupClient
-from tavily import AsyncTavilyClient
-from duckduckgo_search import DDGS 
-from bs4 import BeautifulSoup
-from markdownify import markdownify
-
-from langchain_community.retrievers import ArxivRetriever
-from langchain_community.utilities.pubmed import PubMedAPIWrapper
+# Search SDKs, HTTP clients and HTML parsers are imported inside the functions that
+# use them: importing them all up front dominated the cold start of every worker.
 from langchain_core.tools import tool
 
 from langsmith import traceable
 
+from open_deep_research.fetch import (
+    fetch_page,
+    get_http_client,
+    html_to_text,
+    make_soup,
+    random_user_agent,
+    run_in_parse_executor,
+)
 from open_deep_research.state import Section
     
 def get_config_value(value):
@@ -163,6 +160,8 @@ async def tavily_search_async(search_queries, max_results: int = 5, topic: str =
                     ]
                 }
     """
+    from tavily import AsyncTavilyClient
+
     tavily_async_client = AsyncTavilyClient()
     search_tasks = []
     for query in search_queries:
@@ -206,6 +205,8 @@ def perplexity_search(search_queries):
             }
     """
 
+    import requests
+
     headers = {
         "accept": "application/json",
         "content-type": "application/json",
@@ -315,6 +316,8 @@ async def exa_search(search_queries, max_characters: Optional[int] = None, num_r
     if include_domains and exclude_domains:
         raise ValueError("Cannot specify both include_domains and exclude_domains")
     
+    from exa_py import Exa
+
     # Initialize Exa client (API key should be configured in your .env file)
     exa = Exa(api_key = f"{os.getenv('EXA_API_KEY')}")
     
@@ -507,6 +510,7 @@ async def arxiv_search_async(search_queries, load_max_docs=5, get_full_documents
                 ]
             }
     """
+    from langchain_community.retrievers import ArxivRetriever
     
     async def process_single_query(query):
         try:
@@ -665,6 +669,7 @@ async def pubmed_search_async(search_queries, top_k_results=5, email=None, api_k
                 ]
             }
     """
+    from langchain_community.utilities.pubmed import PubMedAPIWrapper
     
     async def process_single_query(query):
         try:
@@ -804,6 +809,8 @@ async def linkup_search(search_queries, depth: Optional[str] = "standard"):
                 ]
             }
     """
+    from linkup import LinkupClient
+
     client = LinkupClient()
     search_tasks = []
     for query in search_queries:
@@ -828,6 +835,35 @@ async def linkup_search(search_queries, depth: Optional[str] = "standard"):
 
     return search_results
 
+def parse_google_results(html: str) -> List[Dict[str, Any]]:
+    """Parse the result blocks of a Google results page (no-JS layout).
+
+    Only the ``div.ezO2md`` result blocks are built into a tree, which keeps parsing
+    cheap compared to building the full page.
+
+    Args:
+        html (str): The results page markup
+
+    Returns:
+        List[dict]: Results as {'title', 'url', 'content'} dicts, in page order
+    """
+    from bs4 import SoupStrainer
+
+    soup = make_soup(html, parse_only=SoupStrainer("div", class_="ezO2md"))
+    parsed = []
+    for result in soup.find_all("div", class_="ezO2md"):
+        link_tag = result.find("a", href=True)
+        title_tag = link_tag.find("span", class_="CVA68e") if link_tag else None
+        description_tag = result.find("span", class_="FrIlee")
+
+        if link_tag and title_tag and description_tag:
+            parsed.append({
+                "title": title_tag.text,
+                "url": unquote(link_tag["href"].split("&")[0].replace("/url?q=", "")),
+                "content": description_tag.text,
+            })
+    return parsed
+
 @traceable
 async def google_search_async(search_queries: Union[str, List[str]], max_results: int = 5, include_raw_content: bool = True):
     """
@@ -842,8 +878,6 @@ async def google_search_async(search_queries: Union[str, List[str]], max_results
     Returns:
         List[dict]: List of search responses from Google, one per query
     """
-
-
     # Check for API credentials from environment variables
     api_key = os.environ.get("GOOGLE_API_KEY")
     cx = os.environ.get("GOOGLE_CX")
@@ -853,20 +887,75 @@ async def google_search_async(search_queries: Union[str, List[str]], max_results
     if isinstance(search_queries, str):
         search_queries = [search_queries]
     
-    # Define user agent generator
-    def get_useragent():
-        """Generates a random user agent string."""
-        lynx_version = f"Lynx/{random.randint(2, 3)}.{random.randint(8, 9)}.{random.randint(0, 2)}"
-        libwww_version = f"libwww-FM/{random.randint(2, 3)}.{random.randint(13, 15)}"
-        ssl_mm_version = f"SSL-MM/{random.randint(1, 2)}.{random.randint(3, 5)}"
-        openssl_version = f"OpenSSL/{random.randint(1, 3)}.{random.randint(0, 4)}.{random.randint(0, 9)}"
-        return f"{lynx_version} {libwww_version} {ssl_mm_version} {openssl_version}"
-    
-    # Create executor for running synchronous operations
-    executor = None if use_api else concurrent.futures.ThreadPoolExecutor(max_workers=5)
+    # All requests share the pooled client; page fetches are queued through the
+    # per-host politeness scheduler and parsing runs on the persistent parse executor
+    client = get_http_client()
     
     # Use a semaphore to limit concurrent requests
-    semaphore = asyncio.Semaphore(5 if use_api else 2)
+    semaphore = asyncio.Semaphore(5 if use_api else 3)
+    
+    async def google_scrape(query, max_results):
+        """Scrape Google result pages for a query, pacing page requests asynchronously."""
+        try:
+            lang = "en"
+            safe = "active"
+            start = 0
+            fetched_links = set()
+            search_results = []
+            
+            while len(search_results) < max_results:
+                # Send request to Google (paced per host by the fetch scheduler)
+                resp = await fetch_page(
+                    "https://www.google.com/search",
+                    headers={
+                        "User-Agent": random_user_agent(),
+                        "Accept": "*/*",
+                        # Bypasses the consent page
+                        "Cookie": "CONSENT=PENDING+987; SOCS=CAESHAgBEhIaAB",
+                    },
+                    params={
+                        "q": query,
+                        "num": max_results + 2,
+                        "hl": lang,
+                        "start": start,
+                        "safe": safe,
+                    },
+                )
+                resp.raise_for_status()
+                
+                # Parse results off the event loop
+                page_results = await run_in_parse_executor(parse_google_results, resp.text)
+                new_results = 0
+                
+                for result in page_results:
+                    if result["url"] in fetched_links:
+                        continue
+                    
+                    fetched_links.add(result["url"])
+                    
+                    # Store result in the same format as the API results
+                    search_results.append({
+                        "title": result["title"],
+                        "url": result["url"],
+                        "content": result["content"],
+                        "score": None,
+                        "raw_content": result["content"]
+                    })
+                    new_results += 1
+                    
+                    if len(search_results) >= max_results:
+                        break
+                
+                if new_results == 0:
+                    break
+                    
+                start += 10
+            
+            return search_results
+                
+        except Exception as e:
+            print(f"Error in Google search for '{query}': {str(e)}")
+            return []
     
     async def search_single_query(query):
         async with semaphore:
@@ -890,25 +979,23 @@ async def google_search_async(search_queries: Union[str, List[str]], max_results
                         }
                         print(f"Requesting {num} results for '{query}' from Google API...")
 
-                        async with aiohttp.ClientSession() as session:
-                            async with session.get('https://www.googleapis.com/customsearch/v1', params=params) as response:
-                                if response.status != 200:
-                                    error_text = await response.text()
-                                    print(f"API error: {response.status}, {error_text}")
-                                    break
-                                    
-                                data = await response.json()
-                                
-                                # Process search results
-                                for item in data.get('items', []):
-                                    result = {
-                                        "title": item.get('title', ''),
-                                        "url": item.get('link', ''),
-                                        "content": item.get('snippet', ''),
-                                        "score": None,
-                                        "raw_content": item.get('snippet', '')
-                                    }
-                                    results.append(result)
+                        response = await client.get('https://www.googleapis.com/customsearch/v1', params=params)
+                        if response.status_code != 200:
+                            print(f"API error: {response.status_code}, {response.text}")
+                            break
+                            
+                        data = response.json()
+                        
+                        # Process search results
+                        for item in data.get('items', []):
+                            result = {
+                                "title": item.get('title', ''),
+                                "url": item.get('link', ''),
+                                "content": item.get('snippet', ''),
+                                "score": None,
+                                "raw_content": item.get('snippet', '')
+                            }
+                            results.append(result)
                         
                         # Respect API quota with a small delay
                         await asyncio.sleep(0.2)
@@ -919,145 +1006,41 @@ async def google_search_async(search_queries: Union[str, List[str]], max_results
                 
                 # Web scraping based search
                 else:
-                    # Add delay between requests
-                    await asyncio.sleep(0.5 + random.random() * 1.5)
                     print(f"Scraping Google for '{query}'...")
-
-                    # Define scraping function
-                    def google_search(query, max_results):
-                        try:
-                            lang = "en"
-                            safe = "active"
-                            start = 0
-                            fetched_results = 0
-                            fetched_links = set()
-                            search_results = []
-                            
-                            while fetched_results < max_results:
-                                # Send request to Google
-                                resp = requests.get(
-                                    url="https://www.google.com/search",
-                                    headers={
-                                        "User-Agent": get_useragent(),
-                                        "Accept": "*/*"
-                                    },
-                                    params={
-                                        "q": query,
-                                        "num": max_results + 2,
-                                        "hl": lang,
-                                        "start": start,
-                                        "safe": safe,
-                                    },
-                                    cookies = {
-                                        'CONSENT': 'PENDING+987',  # Bypasses the consent page
-                                        'SOCS': 'CAESHAgBEhIaAB',
-                                    }
-                                )
-                                resp.raise_for_status()
-                                
-                                # Parse results
-                                soup = BeautifulSoup(resp.text, "html.parser")
-                                result_block = soup.find_all("div", class_="ezO2md")
-                                new_results = 0
-                                
-                                for result in result_block:
-                                    link_tag = result.find("a", href=True)
-                                    title_tag = link_tag.find("span", class_="CVA68e") if link_tag else None
-                                    description_tag = result.find("span", class_="FrIlee")
-                                    
-                                    if link_tag and title_tag and description_tag:
-                                        link = unquote(link_tag["href"].split("&")[0].replace("/url?q=", ""))
-                                        
-                                        if link in fetched_links:
-                                            continue
-                                        
-                                        fetched_links.add(link)
-                                        title = title_tag.text
-                                        description = description_tag.text
-                                        
-                                        # Store result in the same format as the API results
-                                        search_results.append({
-                                            "title": title,
-                                            "url": link,
-                                            "content": description,
-                                            "score": None,
-                                            "raw_content": description
-                                        })
-                                        
-                                        fetched_results += 1
-                                        new_results += 1
-                                        
-                                        if fetched_results >= max_results:
-                                            break
-                                
-                                if new_results == 0:
-                                    break
-                                    
-                                start += 10
-                                time.sleep(1)  # Delay between pages
-                            
-                            return search_results
-                                
-                        except Exception as e:
-                            print(f"Error in Google search for '{query}': {str(e)}")
-                            return []
-                    
-                    # Execute search in thread pool
-                    loop = asyncio.get_running_loop()
-                    search_results = await loop.run_in_executor(
-                        executor, 
-                        lambda: google_search(query, max_results)
-                    )
-                    
-                    # Process the results
-                    results = search_results
+                    results = await google_scrape(query, max_results)
                 
                 # If requested, fetch full page content asynchronously (for both API and web scraping)
                 if include_raw_content and results:
-                    content_semaphore = asyncio.Semaphore(3)
                     
-                    async with aiohttp.ClientSession() as session:
-                        fetch_tasks = []
+                    async def fetch_full_content(result):
+                        url = result['url']
+                        headers = {
+                            'User-Agent': random_user_agent(),
+                            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
+                        }
                         
-                        async def fetch_full_content(result):
-                            async with content_semaphore:
-                                url = result['url']
-                                headers = {
-                                    'User-Agent': get_useragent(),
-                                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
-                                }
+                        try:
+                            # Served from the page cache when fresh, revalidated with a conditional GET otherwise;
+                            # concurrency and spacing per host are handled by the fetch scheduler
+                            response = await fetch_page(url, cache=True, headers=headers, timeout=10)
+                            if response.status_code == 200:
+                                # Check content type to handle binary files
+                                content_type = response.headers.get('Content-Type', '').lower()
                                 
-                                try:
-                                    await asyncio.sleep(0.2 + random.random() * 0.6)
-                                    async with session.get(url, headers=headers, timeout=10) as response:
-                                        if response.status == 200:
-                                            # Check content type to handle binary files
-                                            content_type = response.headers.get('Content-Type', '').lower()
-                                            
-                                            # Handle PDFs and other binary files
-                                            if 'application/pdf' in content_type or 'application/octet-stream' in content_type:
-                                                # For PDFs, indicate that content is binary and not parsed
-                                                result['raw_content'] = f"[Binary content: {content_type}. Content extraction not supported for this file type.]"
-                                            else:
-                                                try:
-                                                    # Try to decode as UTF-8 with replacements for non-UTF8 characters
-                                                    html = await response.text(errors='replace')
-                                                    soup = BeautifulSoup(html, 'html.parser')
-                                                    result['raw_content'] = soup.get_text()
-                                                except UnicodeDecodeError as ude:
-                                                    # Fallback if we still have decoding issues
-                                                    result['raw_content'] = f"[Could not decode content: {str(ude)}]"
-                                except Exception as e:
-                                    print(f"Warning: Failed to fetch content for {url}: {str(e)}")
-                                    result['raw_content'] = f"[Error fetching content: {str(e)}]"
-                                return result
-                        
-                        for result in results:
-                            fetch_tasks.append(fetch_full_content(result))
-                        
-                        updated_results = await asyncio.gather(*fetch_tasks)
-                        results = updated_results
-                        print(f"Fetched full content for {len(results)} results")
+                                # Handle PDFs and other binary files
+                                if 'application/pdf' in content_type or 'application/octet-stream' in content_type:
+                                    # For PDFs, indicate that content is binary and not parsed
+                                    result['raw_content'] = f"[Binary content: {content_type}. Content extraction not supported for this file type.]"
+                                else:
+                                    # httpx decodes with replacement characters for non-UTF8 bytes
+                                    result['raw_content'] = await run_in_parse_executor(html_to_text, response.text)
+                        except Exception as e:
+                            print(f"Warning: Failed to fetch content for {url}: {str(e)}")
+                            result['raw_content'] = f"[Error fetching content: {str(e)}]"
+                        return result
+                    
+                    results = await asyncio.gather(*[fetch_full_content(result) for result in results])
+                    print(f"Fetched full content for {len(results)} results")
                 
                 return {
                     "query": query,
@@ -1076,18 +1059,9 @@ async def google_search_async(search_queries: Union[str, List[str]], max_results
                     "results": []
                 }
     
-    try:
-        # Create tasks for all search queries
-        search_tasks = [search_single_query(query) for query in search_queries]
-        
-        # Execute all searches concurrently
-        search_results = await asyncio.gather(*search_tasks)
-        
-        return search_results
-    finally:
-        # Only shut down executor if it was created
-        if executor:
-            executor.shutdown(wait=False)
+    # Create tasks for all search queries and execute them concurrently
+    search_tasks = [search_single_query(query) for query in search_queries]
+    return await asyncio.gather(*search_tasks)
 
 async def scrape_pages(titles: List[str], urls: List[str]) -> str:
     """
@@ -1107,44 +1081,42 @@ async def scrape_pages(titles: List[str], urls: List[str]) -> str:
         str: A formatted string containing the full content of each page in markdown format,
              with clear section dividers and source attribution
     """
+    from markdownify import markdownify
     
-    # Create an async HTTP client
-    async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-        pages = []
-        
-        # Fetch each URL and convert to markdown
-        for url in urls:
-            try:
-                # Fetch the content
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                # Convert HTML to markdown if successful
-                if response.status_code == 200:
-                    # Handle different content types
-                    content_type = response.headers.get('Content-Type', '')
-                    if 'text/html' in content_type:
-                        # Convert HTML to markdown
-                        markdown_content = markdownify(response.text)
-                        pages.append(markdown_content)
-                    else:
-                        # For non-HTML content, just mention the content type
-                        pages.append(f"Content type: {content_type} (not converted to markdown)")
+    async def scrape_page(url):
+        try:
+            # Fetch the content through the page cache, pooled client and per-host scheduler
+            response = await fetch_page(url, cache=True)
+            response.raise_for_status()
+            
+            # Convert HTML to markdown if successful
+            if response.status_code == 200:
+                # Handle different content types
+                content_type = response.headers.get('Content-Type', '')
+                if 'text/html' in content_type:
+                    # Convert HTML to markdown off the event loop
+                    return await run_in_parse_executor(markdownify, response.text)
                 else:
-                    pages.append(f"Error: Received status code {response.status_code}")
-        
-            except Exception as e:
-                # Handle any exceptions during fetch
-                pages.append(f"Error fetching URL: {str(e)}")
-        
-        # Create formatted output 
-        formatted_output = f"Search results: \n\n"
-        
-        for i, (title, url, page) in enumerate(zip(titles, urls, pages)):
-            formatted_output += f"\n\n--- SOURCE {i+1}: {title} ---\n"
-            formatted_output += f"URL: {url}\n\n"
-            formatted_output += f"FULL CONTENT:\n {page}"
-            formatted_output += "\n\n" + "-" * 80 + "\n"
+                    # For non-HTML content, just mention the content type
+                    return f"Content type: {content_type} (not converted to markdown)"
+            else:
+                return f"Error: Received status code {response.status_code}"
+    
+        except Exception as e:
+            # Handle any exceptions during fetch
+            return f"Error fetching URL: {str(e)}"
+    
+    # Fetch all URLs concurrently; the scheduler keeps requests to any one host polite
+    pages = await asyncio.gather(*[scrape_page(url) for url in urls])
+    
+    # Create formatted output 
+    formatted_output = f"Search results: \n\n"
+    
+    for i, (title, url, page) in enumerate(zip(titles, urls, pages)):
+        formatted_output += f"\n\n--- SOURCE {i+1}: {title} ---\n"
+        formatted_output += f"URL: {url}\n\n"
+        formatted_output += f"FULL CONTENT:\n {page}"
+        formatted_output += "\n\n" + "-" * 80 + "\n"
         
     return  formatted_output
 
@@ -1158,6 +1130,7 @@ async def duckduckgo_search(search_queries: List[str]):
     Returns:
         List[dict]: List of search results
     """
+    from duckduckgo_search import DDGS
     
     async def process_single_query(query):
         # Execute synchronous search in the event loop's thread pool
@@ -12,10 +12,9 @@ import tempfile
 from pathlib import Path
 import markdown
 from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML, CSS
-import streamlit as st
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+# WeasyPrint, Streamlit and Plotly are imported where they are used: they are the
+# slowest imports of the app and most code paths (e.g. workers) never render a PDF.
 
 # Constants
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -263,6 +262,8 @@ def save_default_css():
 
 def extract_charts_from_session():
     """Extract charts from Streamlit session state."""
+    import streamlit as st
+
     charts = []
 
     if "specialty_chart" in st.session_state:
@@ -410,6 +411,8 @@ def generate_pdf_from_markdown(markdown_content, title=None, charts=None):
     rendered_html = template.render(**template_data)
 
     # Create PDF using WeasyPrint
+    from weasyprint import HTML, CSS
+
     html = HTML(string=rendered_html)
     css = CSS(string=DEFAULT_CSS)
 
@@ -441,6 +444,8 @@ def save_charts_to_session_state(chart_objects):
     Args:
         chart_objects (list): List of chart objects from convert_streamlit_fig_to_chart_object
     """
+    import streamlit as st
+
     for i, chart in enumerate(chart_objects):
         key_name = f"chart_{i}"
         st.session_state[key_name] = chart
@@ -506,6 +511,9 @@ def generate_complete_pdf(
 
 def test_pdf_generation():
     """Test PDF generation with sample data."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     markdown_content = """
 # Relatório de Análise: Cardiologia
 
@@ -1,6 +1,4 @@
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
 
 
@@ -15,6 +13,8 @@ def create_specialty_growth_chart(specialty, specialty_history):
     Returns:
         Figure: The Plotly figure object is both displayed in Streamlit and stored in session_state
     """
+    import plotly.graph_objects as go  # Deferred: slow to import, needed only once a report is shown
+
     if specialty_history.empty:
         st.warning(f"Dados históricos não disponíveis para {specialty}")
         return
@@ -175,6 +175,8 @@ def create_specialties_comparison_chart(specialty, residents_growth_df):
     Returns:
         None: Displays the chart and data table directly in Streamlit
     """
+    import plotly.express as px
+
     # Get the category of the specialty to find related ones
     # This is a simplified approach - in a real app you might have a more sophisticated categorization
     surgical_specialties = [
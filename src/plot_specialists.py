@@ -1,7 +1,4 @@
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import streamlit as st
 import numpy as np
 
@@ -17,6 +14,9 @@ def create_specialist_visualization(specialty, specialty_data_df):
     Returns:
         tuple: Tuple of Plotly figure objects that are both displayed in Streamlit and stored in session_state
     """
+    import plotly.graph_objects as go  # Deferred: slow to import, needed only once a report is shown
+    from plotly.subplots import make_subplots
+
     # Filter data for the selected specialty
     specialty_row = specialty_data_df[specialty_data_df["especialidade"] == specialty]
 
@@ -155,6 +155,9 @@ def create_specialists_comparison(specialty, specialty_data_df):
     Returns:
         Figure: The Plotly figure object is both displayed in Streamlit and stored in session_state
     """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     # Define specialty categories for grouping
     surgical_specialties = [
         "Cirurgia",
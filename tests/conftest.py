@@ -3,6 +3,10 @@ Pytest configuration for open_deep_research tests.
 """
 
 import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
 
 def pytest_addoption(parser):
     """Add command-line options to pytest."""
@@ -15,4 +19,27 @@ def pytest_addoption(parser):
     parser.addoption("--planner-model", action="store", help="Model for planning")
     parser.addoption("--writer-provider", action="store", help="Provider for writer model")
     parser.addoption("--writer-model", action="store", help="Model for writing")
-    parser.addoption("--max-search-depth", action="store", help="Maximum search depth")
\ No newline at end of file
+    parser.addoption("--max-search-depth", action="store", help="Maximum search depth")
+
+class FakeChatModel(BaseChatModel):
+    """Chat model answering "ok" and reporting fixed token usage."""
+
+    @property
+    def _llm_type(self):
+        return "fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        usage = {"input_tokens": 7, "output_tokens": 3, "total_tokens": 10}
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok", usage_metadata=usage))])
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(**kwargs)
+
+
+@pytest.fixture
+def fake_chat_model(monkeypatch):
+    """Make the model registry create ``FakeChatModel`` clients instead of provider ones."""
+    import langchain.chat_models
+
+    monkeypatch.setattr(langchain.chat_models, "init_chat_model", lambda model, **kwargs: FakeChatModel())
+    return FakeChatModel
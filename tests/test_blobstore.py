@@ -0,0 +1,56 @@
+import os
+import time
+
+from open_deep_research.blobstore import BlobStore, content_digest
+
+PAGE = ("<p>vagas de residência em cardiologia</p>" * 100).encode("utf-8")
+
+
+def test_round_trip_and_compression(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.put(PAGE)
+    assert digest == content_digest(PAGE)
+    assert store.get(digest) == PAGE
+    assert store.get_text(digest) == PAGE.decode("utf-8")
+    stats = store.stats()
+    assert stats["raw_bytes_in"] == len(PAGE)
+    assert stats["compression_ratio"] > 1
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = BlobStore(str(tmp_path))
+    assert store.put(PAGE) == store.put(PAGE.decode("utf-8"))
+    assert store.counters["dedup_hits"] == 1
+    assert store.counters["stored_bytes_in"] == store.stats()["size_bytes"]
+    assert sum(len(files) for _, _, files in os.walk(tmp_path)) == 1
+
+
+def test_missing_blobs(tmp_path):
+    store = BlobStore(str(tmp_path))
+    assert store.get(content_digest(b"nada")) is None
+    assert store.counters["misses"] == 1
+
+
+def test_least_recently_used_blobs_are_evicted(tmp_path):
+    blobs = [os.urandom(1000) for _ in range(4)]  # Incompressible, so each takes ~1000 bytes
+    store = BlobStore(str(tmp_path), max_bytes=3500)
+    digests = []
+    for i, blob in enumerate(blobs[:3]):
+        digests.append(store.put(blob))
+        # Distinct, increasing access times
+        os.utime(store._find(digests[-1]), (time.time() - 100 + i, time.time() - 100 + i))
+    # Reading the oldest blob makes it the most recently used
+    assert store.get(digests[0]) == blobs[0]
+
+    digests.append(store.put(blobs[3]))
+    assert store.counters["evictions"] >= 1
+    assert store.get(digests[1]) is None  # Least recently used
+    assert store.get(digests[0]) == blobs[0]
+    assert store.get(digests[3]) == blobs[3]
+    assert store.stats()["size_bytes"] <= 3500 * 0.9
+
+
+def test_size_survives_a_restart(tmp_path):
+    store = BlobStore(str(tmp_path))
+    store.put(PAGE)
+    assert BlobStore(str(tmp_path)).stats()["size_bytes"] == store.stats()["size_bytes"]
@@ -0,0 +1,51 @@
+import time
+
+from open_deep_research.budgets import budget_exceeded, report_usage, reset_report_usage
+
+
+def test_report_usage_is_shared_until_reset():
+    usage = report_usage("budgets-test")
+    usage.tool_calls = 5
+    assert report_usage("budgets-test") is usage
+
+    reset_report_usage("budgets-test")
+    fresh = report_usage("budgets-test")
+    assert fresh is not usage
+    assert fresh.tool_calls == 0
+    reset_report_usage("budgets-test")
+
+
+def test_section_clock_restarts_with_the_run():
+    usage = report_usage("budgets-test")
+    started = usage.section_clock("Panorama")
+    assert usage.section_clock("Panorama") == started
+
+    # A resume after the deadline passed gets a full deadline again
+    usage.section_started_at["Panorama"] = time.time() - 600
+    assert budget_exceeded(
+        started_at=usage.section_clock("Panorama"),
+        tool_calls=0,
+        prompt_tokens=0,
+        deadline_seconds=300,
+        max_tool_calls=2,
+        max_prompt_tokens=0,
+    )
+    reset_report_usage("budgets-test")
+    assert not budget_exceeded(
+        started_at=report_usage("budgets-test").section_clock("Panorama"),
+        tool_calls=0,
+        prompt_tokens=0,
+        deadline_seconds=300,
+        max_tool_calls=2,
+        max_prompt_tokens=0,
+    )
+    reset_report_usage("budgets-test")
+
+
+def test_zero_limits_are_not_enforced():
+    assert budget_exceeded(
+        started_at=0, tool_calls=99, prompt_tokens=10**9, deadline_seconds=0, max_tool_calls=0, max_prompt_tokens=0
+    ) is None
+    assert budget_exceeded(
+        started_at=time.time(), tool_calls=2, prompt_tokens=0, deadline_seconds=0, max_tool_calls=2, max_prompt_tokens=0
+    ) == "limite de 2 buscas"
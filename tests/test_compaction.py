@@ -0,0 +1,75 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph.message import add_messages
+
+from open_deep_research.compaction import (
+    COMPACTED_MARKER,
+    compact_messages,
+    compact_tool_output,
+    estimate_tokens,
+)
+
+
+def search_output(n_sources=2, content_chars=5000):
+    blocks = []
+    for i in range(1, n_sources + 1):
+        blocks.append(
+            f"--- SOURCE {i}: Fonte {i} ---\nURL: https://example.com/{i}\n\nSUMMARY:\nResumo {i}\n\n"
+            f"FULL CONTENT:\n{'x' * content_chars}\n\n" + "-" * 80
+        )
+    return "Search results: \n\n" + "\n\n".join(blocks)
+
+
+def history():
+    """A research history with two consumed searches and one the model has not read yet."""
+    messages = [HumanMessage(content="Pesquise", id="h")]
+    for i in range(3):
+        messages.append(AIMessage(content="", tool_calls=[{"name": "search", "args": {}, "id": f"c{i}"}], id=f"a{i}"))
+        messages.append(ToolMessage(content=search_output(), name="search", tool_call_id=f"c{i}", id=f"t{i}"))
+    return messages
+
+
+def test_compact_tool_output_keeps_source_notes():
+    compacted = compact_tool_output(search_output(), excerpt_chars=100)
+    assert compacted.startswith(COMPACTED_MARKER)
+    assert "--- SOURCE 2: Fonte 2 ---" in compacted
+    assert "URL: https://example.com/1" in compacted
+    assert "Resumo 2" in compacted
+    assert "EXCERPT:\n" + "x" * 100 + "..." in compacted
+    assert "FULL CONTENT" not in compacted
+
+
+def test_compact_tool_output_without_sources():
+    compacted = compact_tool_output("y" * 1000, excerpt_chars=10)
+    assert compacted == f"{COMPACTED_MARKER}\n\n{'y' * 10}..."
+
+
+def test_history_under_the_ceiling_is_untouched():
+    messages = history()
+    assert compact_messages(messages, max_tokens=estimate_tokens(messages)) == []
+
+
+def test_unread_tool_outputs_are_kept():
+    messages = history()
+    replacements = compact_messages(messages, max_tokens=1)
+    # The last tool output comes after the last AI message: the model has not read it
+    assert [m.id for m in replacements] == ["t0", "t1"]
+    assert all(m.content.startswith(COMPACTED_MARKER) for m in replacements)
+    assert [m.tool_call_id for m in replacements] == ["c0", "c1"]
+
+
+def test_oldest_outputs_are_compacted_first_and_only_as_needed():
+    messages = history()
+    one_output = len(search_output()) // 4
+    replacements = compact_messages(messages, max_tokens=estimate_tokens(messages) - one_output // 2)
+    assert [m.id for m in replacements] == ["t0"]
+
+
+def test_replacements_update_messages_in_place():
+    messages = history()
+    updated = add_messages(messages, compact_messages(messages, max_tokens=1))
+    assert [m.id for m in updated] == [m.id for m in messages]
+    assert updated[2].content.startswith(COMPACTED_MARKER)
+    assert updated[-1].content == messages[-1].content
+    assert estimate_tokens(updated) < estimate_tokens(messages)
+    # Already compacted outputs are not compacted again
+    assert [m.id for m in compact_messages(updated, max_tokens=1)] == []
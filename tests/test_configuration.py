@@ -0,0 +1,135 @@
+import pytest
+
+from open_deep_research import configuration
+from open_deep_research.configuration import (
+    Configuration,
+    SearchAPI,
+    refresh_environment,
+)
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """Set configuration environment overrides; the snapshot is restored afterwards."""
+
+    def set_env(**values):
+        for name, value in values.items():
+            monkeypatch.setenv(name, value)
+        refresh_environment()
+
+    yield set_env
+    monkeypatch.undo()
+    refresh_environment()
+
+
+def test_defaults_without_overrides(env):
+    env()
+    config = Configuration.from_runnable_config({"configurable": {}})
+    assert config.search_api is SearchAPI.TAVILY
+    assert config.section_cache is False
+
+
+def test_coerces_valid_env_values(env):
+    env(
+        SEARCH_API="exa",
+        MAX_SEARCH_DEPTH="3",
+        LLM_CACHE="yes",
+        SPECULATIVE_PREFETCH="off",
+        PLANNER_MODEL_KWARGS='{"temperature": 0}',
+    )
+    config = Configuration.from_runnable_config()
+    assert config.search_api is SearchAPI.EXA
+    assert config.max_search_depth == 3
+    assert config.llm_cache is True
+    assert config.speculative_prefetch is False
+    assert config.planner_model_kwargs == {"temperature": 0}
+
+
+def test_env_overrides_configurable(env):
+    env(MAX_SEARCH_DEPTH="4")
+    config = Configuration.from_runnable_config({"configurable": {"max_search_depth": 1}})
+    assert config.max_search_depth == 4
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [
+        ("SEARCH_API", "bing"),
+        ("MAX_SEARCH_DEPTH", "two"),
+        ("LLM_CACHE", "maybe"),
+        ("PLANNER_MODEL_KWARGS", "[1, 2]"),
+        ("PLANNER_MODEL_KWARGS", "{not json"),
+    ],
+)
+def test_rejects_bad_env_values(env, name, value):
+    env(**{name: value})
+    with pytest.raises(ValueError, match=name.lower()):
+        Configuration.from_runnable_config()
+
+
+@pytest.mark.parametrize(
+    "configurable",
+    [
+        {"section_max_tool_calls": "x"},
+        {"section_max_tool_calls": 2.5},
+        {"section_max_tool_calls": True},
+        {"search_api": "bing"},
+        {"supervisor_model": 3},
+    ],
+)
+def test_rejects_bad_configurable_values(env, configurable):
+    env()
+    with pytest.raises(ValueError, match=next(iter(configurable))):
+        Configuration.from_runnable_config({"configurable": configurable})
+
+
+def test_keeps_falsy_values(env):
+    env()
+    config = Configuration.from_runnable_config(
+        {"configurable": {"section_max_tool_calls": 0, "speculative_prefetch": False, "report_structure": ""}}
+    )
+    assert config.section_max_tool_calls == 0
+    assert config.speculative_prefetch is False
+    assert config.report_structure == ""
+
+
+def test_none_falls_back_to_default(env):
+    env()
+    config = Configuration.from_runnable_config({"configurable": {"max_search_depth": None}})
+    assert config.max_search_depth == 2
+
+
+def test_cache_is_keyed_by_configurable_values(env):
+    env()
+    first = Configuration.from_runnable_config({"configurable": {"max_search_depth": 1, "thread_id": "a"}})
+    # Keys that are not configuration fields don't create new entries
+    assert Configuration.from_runnable_config({"configurable": {"max_search_depth": 1, "thread_id": "b"}}) is first
+    changed = Configuration.from_runnable_config({"configurable": {"max_search_depth": 5}})
+    assert changed is not first
+    assert changed.max_search_depth == 5
+    # Nested dict values are part of the key
+    a = Configuration.from_runnable_config({"configurable": {"search_api_config": {"max_results": 1}}})
+    b = Configuration.from_runnable_config({"configurable": {"search_api_config": {"max_results": 2}}})
+    assert a.search_api_config == {"max_results": 1}
+    assert b.search_api_config == {"max_results": 2}
+
+
+def test_environment_is_snapshotted(env, monkeypatch):
+    env(MAX_SEARCH_DEPTH="3")
+    assert Configuration.from_runnable_config().max_search_depth == 3
+
+    # Changes after the snapshot are ignored until the environment is refreshed
+    monkeypatch.setenv("MAX_SEARCH_DEPTH", "6")
+    configuration._resolved_configs.clear()
+    assert Configuration.from_runnable_config().max_search_depth == 3
+
+    refresh_environment()
+    assert Configuration.from_runnable_config().max_search_depth == 6
+
+
+def test_cache_is_bounded(env, monkeypatch):
+    env()
+    monkeypatch.setattr(configuration, "MAX_CACHED_CONFIGS", 4)
+    for depth in range(10):
+        Configuration.from_runnable_config({"configurable": {"max_search_depth": depth}})
+    assert len(configuration._resolved_configs) <= 4
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import threading
+
+import httpx
+import pytest
+
+from open_deep_research import fetch
+from open_deep_research.blobstore import BlobStore
+from open_deep_research.fetch import DomainScheduler, PageCache
+
+BODY = b"<html><body>" + b"residencia medica " * 200 + b"</body></html>"
+
+
+class Origin:
+    """Fake origin server honouring ``If-None-Match``."""
+
+    def __init__(self, etag='"v1"', body=BODY):
+        self.etag = etag
+        self.body = body
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        return httpx.Response(200, headers={"ETag": self.etag, "Content-Type": "text/html"}, content=self.body)
+
+
+@pytest.fixture
+def origin(monkeypatch, tmp_path):
+    origin = Origin()
+    page_cache = PageCache(str(tmp_path / "pages.sqlite"), ttl=3600, blob_store=BlobStore(str(tmp_path / "blobs")))
+    monkeypatch.setattr(fetch, "get_page_cache", lambda: page_cache)
+    monkeypatch.setattr(fetch, "get_domain_scheduler", lambda: DomainScheduler(min_interval=0))
+    monkeypatch.setattr(fetch, "get_http_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(origin)))
+    origin.page_cache = page_cache
+    return origin
+
+
+def fetch_twice(url, expire=False):
+    async def run():
+        first = await fetch.fetch_page(url, cache=True)
+        if expire:
+            fetch.get_page_cache().ttl = 0
+        second = await fetch.fetch_page(url, cache=True)
+        return first, second
+
+    return asyncio.run(run())
+
+
+def test_fresh_entries_are_served_without_a_request(origin):
+    first, second = fetch_twice("https://example.com/a")
+    assert first.content == second.content == BODY
+    assert second.headers["X-Cache"] == "HIT"
+    assert len(origin.requests) == 1
+    stats = origin.page_cache.stats()
+    assert stats["fresh_hits"] == 1
+    assert stats["bytes_served_fresh"] == len(BODY)
+    assert stats["bytes_downloaded"] == len(BODY)
+
+
+def test_expired_entries_are_revalidated(origin):
+    _, second = fetch_twice("https://example.com/a", expire=True)
+    assert origin.requests[-1].headers["If-None-Match"] == '"v1"'
+    assert second.status_code == 200
+    assert second.content == BODY
+    stats = origin.page_cache.stats()
+    assert stats["revalidated"] == 1
+    assert stats["bytes_saved_revalidation"] == len(BODY)
+    # Only the first fetch downloaded the body
+    assert stats["bytes_downloaded"] == len(BODY)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_changed_pages_are_downloaded_again(origin):
+    async def run():
+        await fetch.fetch_page("https://example.com/a", cache=True)
+        origin.page_cache.ttl = 0
+        origin.etag, origin.body = '"v2"', b"<html>nova versao</html>"
+        return await fetch.fetch_page("https://example.com/a", cache=True)
+
+    response = asyncio.run(run())
+    assert response.content == b"<html>nova versao</html>"
+    assert origin.page_cache.get("https://example.com/a")["etag"] == '"v2"'
+    assert origin.page_cache.stats()["misses"] == 2
+
+
+def test_cache_io_runs_off_the_event_loop(origin, monkeypatch):
+    threads = []
+    put = PageCache.put
+
+    def recording_put(self, url, response):
+        threads.append(threading.current_thread())
+        return put(self, url, response)
+
+    monkeypatch.setattr(PageCache, "put", recording_put)
+    fetch_twice("https://example.com/a")
+    assert threads and threads[0] is not threading.main_thread()
+
+
+
+def test_evicted_bodies_are_misses(origin):
+    asyncio.run(fetch.fetch_page("https://example.com/a", cache=True))
+    blob_store = origin.page_cache.blob_store
+    os.remove(blob_store._find(blob_store.put(BODY)))
+    # The dangling index entry is dropped and the page is downloaded again
+    assert origin.page_cache.get("https://example.com/a") is None
+    response = asyncio.run(fetch.fetch_page("https://example.com/a", cache=True))
+    assert response.content == BODY
+    assert len(origin.requests) == 2
@@ -0,0 +1,102 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+
+from open_deep_research import graph
+from open_deep_research.state import (
+    BatchedQueries,
+    Feedback,
+    Queries,
+    SearchQuery,
+    Section,
+    SectionQueries,
+    Sections,
+)
+
+PLAN = [
+    Section(name="Introdução", description="Abertura", research=False, content=""),
+    Section(name="Mercado", description="Mercado de trabalho", research=True, content=""),
+    Section(name="Residência", description="Programas de residência", research=True, content=""),
+    Section(name="Conclusão", description="Passo a passo", research=False, content=""),
+]
+
+
+class FakeStructured:
+    """Answers ``with_structured_output`` calls with canned instances of the schema."""
+
+    def __init__(self, schema, calls):
+        self.schema = schema
+        self.calls = calls
+
+    async def ainvoke(self, messages):
+        self.calls.append(self.schema.__name__)
+        if self.schema is Sections:
+            return Sections(sections=PLAN)
+        if self.schema is BatchedQueries:
+            # Only "Mercado" is covered; "Residência" falls back to its own query generation
+            return BatchedQueries(
+                sections=[SectionQueries(section_name="mercado", queries=[SearchQuery(search_query="mercado")])]
+            )
+        if self.schema is Feedback:
+            return Feedback(grade="pass", follow_up_queries=[])
+        return Queries(queries=[SearchQuery(search_query=messages[0].content[:20])])
+
+
+class FakeModel:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def with_structured_output(self, schema):
+        return FakeStructured(schema, self.calls)
+
+    async def ainvoke(self, messages):
+        self.calls.append("write")
+        return AIMessage(content=f"## texto\n\n{messages[-1].content[:40]}")
+
+
+def test_builder_compiles():
+    compiled = graph.builder.compile()
+    assert {
+        "generate_report_plan",
+        "human_feedback",
+        "generate_section_queries",
+        "build_section_with_web_research",
+        "gather_completed_sections",
+        "write_final_sections",
+        "compile_final_report",
+    } <= set(compiled.get_graph().nodes)
+    assert graph.section_builder.compile().get_graph().nodes
+
+
+def test_sections_are_researched_in_parallel(monkeypatch):
+    calls, searches = [], []
+    active = {"now": 0, "peak": 0}
+    model = FakeModel(calls)
+
+    async def fake_search(configurable, search_queries):
+        searches.append([query.search_query for query in search_queries])
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return "fontes"
+
+    monkeypatch.setattr(graph, "planner_model", lambda configurable: model)
+    monkeypatch.setattr(graph, "writer_model", lambda configurable: model)
+    monkeypatch.setattr(graph, "run_search", fake_search)
+
+    config = {"configurable": {"skip_human_feedback": True, "max_search_depth": 2, "number_of_queries": 1}}
+    result = asyncio.run(graph.builder.compile().ainvoke({"topic": "Cardiologia"}, config))
+
+    # One planning search, then both section pipelines searched at the same time
+    assert len(searches) == 3
+    assert active["peak"] == 2
+    assert ["mercado"] in searches
+    # One batched call for every section; besides the planning queries, only the section it
+    # missed generated its own
+    assert calls.count("BatchedQueries") == 1
+    assert calls.count("Queries") == 2
+    # Both research sections were graded once; the final sections were written from them
+    assert calls.count("Feedback") == 2
+    sections = result["final_report"].split("\n\n## ")
+    assert len(sections) == len(PLAN)
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+from langchain_core.tools import tool
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from open_deep_research import instrumentation
+from open_deep_research.instrumentation import (
+    instrument_run,
+    prometheus_text,
+    record_fetch,
+)
+from open_deep_research.llm_cache import cached_ainvoke
+from open_deep_research.models import get_chat_model
+
+
+@tool
+async def fake_search(queries: list[str]) -> str:
+    """Search the web."""
+    return "resultado " * len(queries)
+
+
+async def ask():
+    return await cached_ainvoke(get_chat_model("fake"), [("user", "oi")], model="fake", tools=[], cache=None)
+
+
+async def supervisor(state):
+    return {"messages": [await ask()]}
+
+
+async def research_agent(state):
+    await fake_search.ainvoke({"queries": ["a", "b"]})
+    record_fetch(100, cache_hit=False)
+    return {"messages": [await ask(), await ask()]}
+
+
+def run_graph(config=None):
+    builder = StateGraph(MessagesState)
+    builder.add_node("supervisor", supervisor)
+    builder.add_node("research_agent", research_agent)
+    builder.add_edge(START, "supervisor")
+    builder.add_edge("supervisor", "research_agent")
+    builder.add_edge("research_agent", END)
+
+    async def run():
+        with instrument_run(config, run_id="run-1") as (run_config, metrics):
+            await builder.compile().ainvoke({"messages": [("user", "oi")]}, run_config)
+        return metrics
+
+    return asyncio.run(run())
+
+
+def test_tokens_are_attributed_to_the_calling_node(fake_chat_model):
+    metrics = run_graph()
+    # FakeChatModel reports 7 input and 3 output tokens per call
+    assert metrics.nodes["supervisor"]["calls"] == 1
+    assert metrics.nodes["supervisor"]["input_tokens"] == 7
+    assert metrics.nodes["supervisor"]["output_tokens"] == 3
+    assert metrics.nodes["research_agent"]["input_tokens"] == 14
+    assert metrics.nodes["research_agent"]["output_tokens"] == 6
+    assert "unknown" not in metrics.nodes
+    assert metrics.nodes["research_agent"]["wall_seconds"] > 0
+
+
+def test_search_and_fetch_counters(fake_chat_model):
+    metrics = run_graph()
+    assert metrics.search["fake_search"]["calls"] == 1
+    assert metrics.search["fake_search"]["output_bytes"] == len("resultado resultado ")
+    assert metrics.fetch == {"requests": 1, "bytes": 100, "page_cache_hits": 0}
+
+
+def test_exports(fake_chat_model, monkeypatch, tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    monkeypatch.setattr(instrumentation, "METRICS_PATH", str(path))
+    metrics = run_graph()
+    record = json.loads(path.read_text(encoding="utf-8"))
+    assert record["run_id"] == "run-1"
+    assert record["nodes"]["supervisor"]["input_tokens"] == 7
+
+    text = prometheus_text(metrics)
+    assert 'odr_llm_tokens_total{node="research_agent",direction="output"} 6' in text
+    assert 'odr_search_calls_total{backend="fake_search"} 1' in text
@@ -0,0 +1,141 @@
+import asyncio
+import operator
+import time
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from open_deep_research import jobs, multi_agent, runs
+from open_deep_research.budgets import report_usage
+from open_deep_research.multi_agent import Section
+
+
+class FakeReportState(TypedDict):
+    messages: list
+    completed_sections: Annotated[list, operator.add]
+    final_report: str
+
+
+@pytest.fixture
+def fake_graph(monkeypatch, tmp_path):
+    """Replace the multi-agent graph with one section and a finalization that can be made to fail."""
+    calls = {"research": 0, "finalize": 0, "fail": 0, "report_tool_calls": []}
+
+    def research_team(state, config):
+        calls["research"] += 1
+        # Spends report budget, which a resumed run must not inherit
+        report_usage(config["configurable"]["thread_id"]).tool_calls += 5
+        return {"completed_sections": [Section(name="Panorama", description="d", content="## Panorama")]}
+
+    def finalize_report(state, config):
+        calls["finalize"] += 1
+        calls["report_tool_calls"].append(report_usage(config["configurable"]["thread_id"]).tool_calls)
+        if calls["fail"]:
+            calls["fail"] -= 1
+            raise RuntimeError("finalization failed")
+        return {"final_report": "# Relatório\n\n" + state["completed_sections"][0].content}
+
+    builder = StateGraph(FakeReportState)
+    builder.add_node("research_team", research_team)
+    builder.add_node("finalize_report", finalize_report)
+    builder.add_edge(START, "research_team")
+    builder.add_edge("research_team", "finalize_report")
+    builder.add_edge("finalize_report", END)
+    monkeypatch.setattr(multi_agent, "supervisor_builder", builder, raising=False)
+    monkeypatch.setattr(runs, "CHECKPOINT_PATH", str(tmp_path / "checkpoints.sqlite"))
+    return calls
+
+
+@pytest.fixture
+def store(tmp_path):
+    return jobs.JobStore(str(tmp_path / "jobs.sqlite"))
+
+
+def wait_for(manager, job_id, status, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.status(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} is {manager.status(job_id)['status']}, expected {status}")
+
+
+REQUEST = {"messages": [{"role": "user", "content": "Cardiologia"}]}
+
+
+def test_store_records_jobs(store):
+    store.create("j1", REQUEST, {"configurable": {"thread_id": "job-j1"}}, {"especialidade": "Cardiologia"})
+    job = store.get("j1")
+    assert job["status"] == jobs.QUEUED
+    assert job["input"] == REQUEST
+    assert job["metadata"] == {"especialidade": "Cardiologia"}
+
+    store.update("j1", status=jobs.RUNNING, started_at=time.time())
+    store.add_section("j1", {"name": "Panorama", "content": "## Panorama"})
+    store.add_section("j1", {"name": "Panorama", "content": "## Panorama"})
+    assert store.get("j1")["sections"] == [{"name": "Panorama", "content": "## Panorama"}]
+    assert store.unfinished() == ["j1"]
+
+    store.update("j1", status=jobs.DONE, result={"final_report": "# R"})
+    assert store.get("j1")["result"] == {"final_report": "# R"}
+    assert store.unfinished() == []
+    assert store.counts() == {jobs.DONE: 1}
+    assert store.get("missing") is None
+
+
+def test_submit_runs_to_completion(fake_graph, store):
+    manager = jobs.JobManager(store, workers=2)
+    job_id = manager.submit(REQUEST, metadata={"especialidade": "Cardiologia"})
+    job = wait_for(manager, job_id, jobs.DONE)
+    assert job["sections"] == [{"name": "Panorama", "content": "## Panorama"}]
+    assert job["result"]["final_report"] == "# Relatório\n\n## Panorama"
+    assert job["config"]["configurable"]["thread_id"] == f"job-{job_id}"
+    assert job["finished_at"] >= job["started_at"] >= job["created_at"]
+
+
+def test_submit_rejects_invalid_configuration(fake_graph, store):
+    manager = jobs.JobManager(store, workers=1)
+    with pytest.raises(ValueError):
+        manager.submit(REQUEST, config={"configurable": {"section_max_tool_calls": "x"}})
+    assert store.counts() == {}
+
+
+def test_failed_job_retries_from_its_checkpoint(fake_graph, store):
+    fake_graph["fail"] = 1
+    manager = jobs.JobManager(store, workers=1)
+    job_id = manager.submit(REQUEST)
+    job = wait_for(manager, job_id, jobs.FAILED)
+    assert "finalization failed" in job["error"]
+    assert not manager.retry("missing")
+
+    assert manager.retry(job_id)
+    job = wait_for(manager, job_id, jobs.DONE)
+    assert job["error"] is None
+    assert job["result"]["final_report"]
+    # The section was not researched again, and the retry started with a fresh report budget
+    assert fake_graph["research"] == 1
+    assert fake_graph["report_tool_calls"] == [5, 0]
+    assert not manager.retry(job_id)
+
+
+def test_unfinished_jobs_resume_when_the_manager_starts(fake_graph, store):
+    # A previous server process started the job and stopped after its section was checkpointed
+    config = {"configurable": {"thread_id": "job-old"}}
+    store.create("old", REQUEST, config, {})
+    store.update("old", status=jobs.RUNNING, started_at=time.time())
+    fake_graph["fail"] = 1
+
+    async def interrupted_run():
+        with pytest.raises(RuntimeError):
+            async for _ in runs.stream_report(REQUEST, config):
+                pass
+
+    asyncio.run(interrupted_run())
+
+    manager = jobs.JobManager(store, workers=1)
+    job = wait_for(manager, "old", jobs.DONE)
+    assert job["result"]["final_report"] == "# Relatório\n\n## Panorama"
+    assert fake_graph["research"] == 1
+    assert fake_graph["report_tool_calls"] == [5, 0]
@@ -0,0 +1,67 @@
+import asyncio
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from open_deep_research.llm_cache import cached_ainvoke
+from open_deep_research.models import (
+    get_bound_model,
+    get_chat_model,
+    get_model_registry,
+)
+
+
+class RecordingHandler(BaseCallbackHandler):
+    def __init__(self):
+        self.llm_calls = []
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self.llm_calls.append((parent_run_id, (metadata or {}).get("langgraph_node")))
+
+
+def run_node(call):
+    """Run ``call`` as the only node of a graph invoked with a recording handler."""
+    handler = RecordingHandler()
+
+    async def call_model(state):
+        return {"messages": [await call()]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("call_model", call_model)
+    builder.add_edge(START, "call_model")
+    builder.add_edge("call_model", END)
+
+    async def run():
+        result = await builder.compile().ainvoke({"messages": [("user", "oi")]}, {"callbacks": [handler]})
+        return result, get_model_registry().stats()
+
+    result, stats = asyncio.run(run())
+    return handler, result, stats
+
+
+def test_registry_models_inherit_the_run_callbacks(fake_chat_model):
+    def call():
+        return cached_ainvoke(get_chat_model("fake"), [("user", "oi")], model="fake", tools=[], cache=None)
+
+    handler, result, stats = run_node(call)
+    assert result["messages"][-1].content == "ok"
+    # The call is nested in the node's run, not cut off from it
+    assert len(handler.llm_calls) == 1
+    parent_run_id, node = handler.llm_calls[0]
+    assert parent_run_id is not None
+    assert node == "call_model"
+    assert stats["latency"]["fake"]["calls"] == 1
+
+
+def test_bound_models_are_shared_and_inherit_callbacks(fake_chat_model):
+    tools = [object()]
+
+    async def call():
+        llm = get_bound_model("fake", tools)
+        assert get_bound_model("fake", tools) is llm
+        return await cached_ainvoke(llm, [("user", "oi")], model="fake", tools=tools, cache=None)
+
+    handler, _, stats = run_node(call)
+    assert [node for _, node in handler.llm_calls] == ["call_model"]
+    assert stats["clients_created"] == 1
+    assert stats["reused"] == 1
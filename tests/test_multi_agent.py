@@ -0,0 +1,107 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from open_deep_research import multi_agent
+from open_deep_research.budgets import report_usage, reset_report_usage
+from open_deep_research.multi_agent import Section, get_supervisor_tools, section_tool
+from open_deep_research.prompts import SUPERVISOR_INSTRUCTIONS
+from open_deep_research.section_store import SectionStore
+
+USAGE = {"input_tokens": 120, "output_tokens": 30, "total_tokens": 150}
+
+
+def test_section_tool_output_survives_checkpoints():
+    section = section_tool.invoke({"name": "Panorama", "description": "Visão geral", "content": "## Panorama"})
+    serde = JsonPlusSerializer()
+    restored = serde.loads_typed(serde.dumps_typed({"completed_sections": [section]}))
+    assert restored["completed_sections"] == [section]
+    assert type(restored["completed_sections"][0]) is Section
+    assert section_tool.name == "Section"
+
+
+def test_supervisor_only_plans_sections():
+    # The introduction and conclusion are written by finalize_report once every section is done
+    tools, _ = get_supervisor_tools({"configurable": {}})
+    names = {tool.name for tool in tools}
+    assert "Sections" in names
+    assert not names & {"Introduction", "Conclusion"}
+    assert "`Introduction`" not in SUPERVISOR_INSTRUCTIONS
+    assert "`Conclusion`" not in SUPERVISOR_INSTRUCTIONS
+
+
+def test_section_store_keeps_student_context_out(monkeypatch, tmp_path):
+    prompts = []
+
+    async def fake_ainvoke(llm, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        prompts.append(prompt)
+        if "reutilizada" in prompt:
+            return AIMessage(content="## Panorama\n\nCardiologia em SP.", usage_metadata=USAGE)
+        return AIMessage(content="## Panorama\n\nCardiologia em SP, para você.", usage_metadata=USAGE)
+
+    class FakeResearchGraph:
+        async def ainvoke(self, section_input, config):
+            content = "## Panorama\n\nCardiologia em SP, perto da UNIFESP."
+            return {"completed_sections": [Section(name="Panorama", description="d", content=content)]}
+
+    store = SectionStore(str(tmp_path / "sections.sqlite"))
+    monkeypatch.setattr(multi_agent, "cached_ainvoke", fake_ainvoke)
+    monkeypatch.setattr(multi_agent, "get_chat_model", lambda model: None)
+    monkeypatch.setattr(multi_agent, "_build", lambda name: FakeResearchGraph())
+    monkeypatch.setattr(multi_agent, "section_store_from_config", lambda configurable: store)
+    config = {"configurable": {"specialty": "Cardiologia", "residency_state": "SP", "speculative_prefetch": False}}
+
+    def task(report_id, context):
+        return {"section": "Panorama da Especialidade: visão geral", "report_id": report_id, "context": context}
+
+    # The student who triggered the research gets their section; the store gets a neutral one
+    async def research_and_store():
+        result = await multi_agent.research_team(task("report-1", "Aluno da UNIFESP"), config)
+        # The neutral version is stored in the background, after the section is returned
+        assert store.get("Cardiologia", "SP", "panorama") is None
+        await multi_agent.wait_for_section_stores()
+        return result
+
+    first = asyncio.run(research_and_store())
+    assert "UNIFESP" in first["completed_sections"][0].content
+    stored = store.get("Cardiologia", "SP", "panorama")
+    assert "UNIFESP" not in stored["content"]
+
+    # The next student's section is personalized from the neutral version, within the report budget
+    reset_report_usage("report-2")
+    second = asyncio.run(multi_agent.research_team(task("report-2", "Aluno da USP"), config))
+    assert second["completed_sections"][0].content.endswith("para você.")
+    assert "Aluno da USP" in prompts[-1]
+    assert "UNIFESP" not in prompts[-1]
+    assert report_usage("report-2").prompt_tokens == USAGE["input_tokens"]
+    reset_report_usage("report-1")
+    reset_report_usage("report-2")
+
+
+def test_new_input_on_a_thread_starts_fresh_report_budgets(fake_chat_model):
+    config = {"configurable": {"thread_id": "budget-thread", "speculative_prefetch": False}}
+
+    async def turn(messages):
+        return await multi_agent.supervisor({"messages": messages}, config)
+
+    # The previous run on this thread spent its report budget
+    report_usage("budget-thread").tool_calls = 30
+    followup = [
+        HumanMessage(content="Cardiologia"),
+        AIMessage(content="Relatório pronto."),
+        HumanMessage(content="Agora Pediatria"),
+    ]
+    asyncio.run(turn(followup))
+    assert report_usage("budget-thread").tool_calls == 0
+
+    # Turns that answer tool calls belong to the same run and keep its usage
+    report_usage("budget-thread").tool_calls = 3
+    tool_turn = followup + [
+        AIMessage(content="", tool_calls=[{"name": "residency_data", "args": {"specialties": []}, "id": "c1"}]),
+        ToolMessage(content="dados", tool_call_id="c1"),
+    ]
+    asyncio.run(turn(tool_turn))
+    assert report_usage("budget-thread").tool_calls == 3
+    reset_report_usage("budget-thread")
@@ -0,0 +1,67 @@
+import asyncio
+
+from langchain_core.tools import tool
+
+from open_deep_research.prefetch import get_prefetched, start_prefetch
+from open_deep_research.section_store import SECTION_TEMPLATES
+
+calls = []
+
+
+@tool
+async def tavily_search(queries: list[str]) -> str:
+    """Search with Tavily."""
+    calls.append(("tavily", queries))
+    return f"tavily: {queries[0]}"
+
+
+@tool
+async def duckduckgo_search(search_queries: list[str]) -> str:
+    """Search with DuckDuckGo."""
+    calls.append(("duckduckgo", search_queries))
+    return f"duckduckgo: {search_queries[0]}"
+
+
+def test_prefetches_are_shared_per_backend():
+    calls.clear()
+
+    async def run():
+        assert start_prefetch("Cardiologia", "São Paulo", tavily_search, skip={"panorama"}) == 4
+        # The same searches are already in flight
+        assert start_prefetch("cardiologia", "Sao Paulo", tavily_search) == 1
+        prefetched = await get_prefetched("Cardiologia", "São Paulo", "mercado_de_trabalho", tavily_search)
+        # Another backend's results are never served
+        other = await get_prefetched("Cardiologia", "São Paulo", "mercado_de_trabalho", duckduckgo_search)
+        return prefetched, other
+
+    (query, result), other = asyncio.run(run())
+    assert "mercado de trabalho" in query
+    assert result == f"tavily: {query}"
+    assert other is None
+    assert len(calls) == len(SECTION_TEMPLATES)
+
+
+def test_backends_prefetch_separately():
+    calls.clear()
+
+    async def run():
+        start_prefetch("Pediatria", "Paraná", tavily_search)
+        assert start_prefetch("Pediatria", "Paraná", duckduckgo_search) == len(SECTION_TEMPLATES)
+        return await get_prefetched("Pediatria", "Paraná", "panorama", duckduckgo_search)
+
+    _, result = asyncio.run(run())
+    assert result.startswith("duckduckgo: ")
+    assert {backend for backend, _ in calls} == {"tavily", "duckduckgo"}
+
+
+def test_failed_prefetches_are_skipped():
+    @tool
+    async def failing_search(queries: list[str]) -> str:
+        """Fail."""
+        raise RuntimeError("fora do ar")
+
+    async def run():
+        start_prefetch("Cardiologia", "Bahia", failing_search)
+        return await get_prefetched("Cardiologia", "Bahia", "panorama", failing_search)
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,31 @@
+import pytest
+
+from open_deep_research.residency_data import get_residency_data
+
+
+@pytest.fixture
+def data():
+    data = get_residency_data()
+    if not data.names:
+        pytest.skip("residency CSV files not available")
+    return data
+
+
+def test_resolves_exact_names_ignoring_accents_and_case(data):
+    assert data.resolve("Cardiologia") == "cardiologia"
+    assert data.resolve("  CIRURGIA  da Mão ") == "cirurgia da mao"
+
+
+@pytest.mark.parametrize("specialty", ["Cirurgia", "Cardiologia Pediátrica"])
+def test_does_not_substitute_another_specialty(data, specialty):
+    assert data.resolve(specialty) is None
+    description = data.describe(specialty)
+    assert description.startswith(f"Especialidade '{specialty}' não encontrada")
+    # No figures from the specialty the name resembles
+    assert "Residentes R1" not in description
+
+
+def test_unknown_names_list_candidates(data):
+    assert "Neurocirurgia" in data.candidates("Cirurgia")
+    assert "Cirurgia Geral" in data.candidates("Cirurgia")
+    assert "Cardiologia" in data.describe("Cardiologia Pediátrica")
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from open_deep_research.section_scheduler import SectionScheduler, get_section_scheduler
+
+
+async def run_sections(scheduler, sections, hold=0.01):
+    """Run ``(report_id, priority, name)`` sections; return start order and peak concurrency."""
+    started, active, peaks = [], {}, {"total": 0}
+
+    async def section(report_id, priority, name):
+        async with scheduler.slot(report_id, priority):
+            started.append(name)
+            active[report_id] = active.get(report_id, 0) + 1
+            peaks[report_id] = max(peaks.get(report_id, 0), active[report_id])
+            peaks["total"] = max(peaks["total"], sum(active.values()))
+            await asyncio.sleep(hold)
+            active[report_id] -= 1
+
+    await asyncio.gather(*(section(*s) for s in sections))
+    return started, peaks
+
+
+def test_per_report_cap():
+    scheduler = SectionScheduler(per_report_concurrency=2, max_concurrency=10)
+    sections = [("r1", i, f"s{i}") for i in range(6)]
+    _, peaks = asyncio.run(run_sections(scheduler, sections))
+    assert peaks["r1"] == 2
+    assert scheduler.stats()["completed"] == 6
+
+
+def test_global_cap_across_reports():
+    scheduler = SectionScheduler(per_report_concurrency=3, max_concurrency=4)
+    sections = [(f"r{r}", i, f"r{r}s{i}") for r in range(3) for i in range(3)]
+    _, peaks = asyncio.run(run_sections(scheduler, sections))
+    assert peaks["total"] == 4
+    assert all(peaks[f"r{r}"] <= 3 for r in range(3))
+
+
+def test_report_at_cap_does_not_block_others():
+    scheduler = SectionScheduler(per_report_concurrency=1, max_concurrency=2)
+    # r1's sections have the best priority but r1 may only run one at a time
+    sections = [("r1", 0, "a1"), ("r1", 0, "a2"), ("r1", 0, "a3"), ("r2", 5, "b1")]
+    started, _ = asyncio.run(run_sections(scheduler, sections))
+    assert started.index("b1") < started.index("a2")
+
+
+def test_priority_order():
+    scheduler = SectionScheduler(per_report_concurrency=1, max_concurrency=1)
+    sections = [("r1", 3, "third"), ("r1", 1, "first"), ("r1", 2, "second"), ("r1", 1, "first-tie")]
+
+    async def run():
+        # Hold the only slot so every section is queued before dispatch starts
+        async with scheduler.slot("r1", -1):
+            task = asyncio.ensure_future(run_sections(scheduler, sections))
+            await asyncio.sleep(0.01)
+        return await task
+
+    started, _ = asyncio.run(run())
+    assert started == ["first", "first-tie", "second", "third"]
+
+
+def test_cancelled_waiter_releases_its_place():
+    scheduler = SectionScheduler(per_report_concurrency=1, max_concurrency=1)
+
+    async def run():
+        async with scheduler.slot("r1"):
+            waiter = asyncio.ensure_future(scheduler.slot("r1").__aenter__())
+            await asyncio.sleep(0)
+            assert scheduler.stats()["queued"] == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert scheduler.stats()["queued"] == 0
+        stats = scheduler.stats()
+        assert stats["active"] == 0
+        assert stats["reports"] == {}
+        # The slot is free again
+        await asyncio.wait_for(run_sections(scheduler, [("r1", 0, "next")]), 1)
+
+    asyncio.run(run())
+
+
+def test_one_scheduler_per_event_loop():
+    async def get():
+        return get_section_scheduler(), get_section_scheduler()
+
+    first, again = asyncio.run(get())
+    assert first is again
+    other, _ = asyncio.run(get())
+    assert other is not first
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+
+from open_deep_research import tool_outputs
+from open_deep_research.blobstore import BlobStore
+from open_deep_research.tool_outputs import (
+    TOOL_OUTPUT_INLINE_CHARS,
+    TOOL_OUTPUT_PREVIEW_CHARS,
+    load_tool_output,
+    materialize_messages,
+    reference_digest,
+    store_tool_output,
+)
+
+LARGE = "conteúdo da página " * (TOOL_OUTPUT_INLINE_CHARS // 10)
+
+
+@pytest.fixture
+def blob_store(monkeypatch, tmp_path):
+    store = BlobStore(str(tmp_path))
+    monkeypatch.setattr(tool_outputs, "get_blob_store", lambda: store)
+    return store
+
+
+def test_small_and_non_string_outputs_stay_inline(blob_store):
+    assert store_tool_output("curto") == "curto"
+    observation = {"sections": ["a"]}
+    assert store_tool_output(observation) is observation
+    assert blob_store.counters["puts"] == 0
+
+
+def test_large_outputs_become_references(blob_store):
+    reference = store_tool_output(LARGE)
+    digest = reference_digest(reference)
+    assert digest is not None
+    assert len(reference) < TOOL_OUTPUT_PREVIEW_CHARS + 200
+    assert LARGE[:TOOL_OUTPUT_PREVIEW_CHARS] in reference
+    assert blob_store.get_text(digest) == LARGE
+    assert load_tool_output(reference) == LARGE
+    assert load_tool_output("texto") == "texto"
+
+
+def test_materialize_restores_references_without_changing_state(blob_store):
+    reference = store_tool_output(LARGE)
+    ai = AIMessage(content="", tool_calls=[{"name": "search", "args": {}, "id": "c1"}])
+    messages = [
+        ai,
+        ToolMessage(content=reference, name="search", tool_call_id="c1", id="t1"),
+        {"role": "tool", "content": reference, "tool_call_id": "c2"},
+    ]
+    materialized = materialize_messages(messages)
+    assert materialized[0] is ai
+    assert materialized[1].content == LARGE
+    assert materialized[1].id == "t1"
+    assert materialized[2]["content"] == LARGE
+    # The state keeps holding the references
+    assert messages[1].content == reference
+    assert messages[2]["content"] == reference
+
+
+def test_evicted_outputs_fall_back_to_the_preview(blob_store):
+    reference = store_tool_output(LARGE)
+    os.remove(blob_store._find(reference_digest(reference)))
+    assert load_tool_output(reference) == reference
+    materialized = materialize_messages([ToolMessage(content=reference, tool_call_id="c1")])
+    assert materialized[0].content == reference